@@ -22,8 +22,24 @@ import ctypes
 import re
 import random
 import math
+import mmap
+import hashlib
+import tempfile
+import signal
+import queue
+import atexit
+import base64
+import keyword
+import difflib
+import email.utils
+import concurrent.futures
+import codecs
+import posixpath
+import urllib.parse
+import textwrap
+from array import array
+from collections import OrderedDict, deque
 from colorama import init, Fore, Style
-from playsound import playsound
 from enum import Enum
 from typing import List, Tuple
 
@@ -51,205 +67,252 @@ else:  # Unix-like
     import termios
     import select
     import curses
+    import fcntl
 
-# Optional web browser dependencies
+# Optional audio dependency; without it sounds go to the null backend
+try:
+    from playsound import playsound
+except ImportError:
+    playsound = None
+
+# Optional web browser dependencies; local HTML files only need html2text
+try:
+    import html2text
+except ImportError:
+    html2text = None
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     from bs4 import BeautifulSoup
-    import html2text
 except ImportError:
+    requests = None
+    HTTPAdapter = None
+    Retry = None
+    BeautifulSoup = None
+if not requests or not html2text:
     print("=" * 60)
     print("WARNING: Web browser dependencies not installed.")
     print("To enable the 'browser' command, install:")
     print("  pip install requests beautifulsoup4 html2text")
     print("=" * 60)
-    requests = None
-    BeautifulSoup = None
-    html2text = None
 
 class SplashScreen:
+    """
+    Boot splash. The scene is drawn into preallocated per-row character and
+    color arrays; each frame is diffed against what is already on screen and
+    only the changed span of each row is written, as one escape sequence.
+    """
+    FRAME_TIME = 0.05  # 20 fps
+    CHARS = "0123456789ABCDEF"
+
+    # Cell colors, indexed by the per-row color arrays
+    PLAIN, SIDE_HEAD, SIDE_BODY, SIDE_TAIL, RAIN_HEAD, RAIN_NEAR, RAIN_MID, RAIN_TAIL, TITLE = range(9)
+    PALETTE = [
+        "",
+        Fore.LIGHTMAGENTA_EX + Style.BRIGHT,
+        Fore.MAGENTA,
+        Fore.MAGENTA + Style.DIM,
+        Fore.LIGHTCYAN_EX + Style.BRIGHT,
+        Fore.CYAN,
+        Fore.LIGHTBLUE_EX,
+        Fore.BLUE + Style.DIM,
+        Fore.MAGENTA + Style.BRIGHT,
+    ]
+
     @staticmethod
-    def _fade_out(frame_cells, term_width, term_height, delay=0.001):
+    def _emit_changes(cells, colors, screen_cells, screen_colors, out):
         """
-        Column-by-column fade from sides to center with 5-column wide magenta highlighting.
-        Highlights 5 columns on each side, but only clears the outermost left and right columns.
+        Append the escape sequences that turn screen_* into cells/colors, one
+        cursor move per changed row covering its first to last changed cell.
+        screen_* are updated to match.
+        """
+        palette = SplashScreen.PALETTE
+        for y, row in enumerate(cells):
+            row_colors = colors[y]
+            old_row = screen_cells[y]
+            old_colors = screen_colors[y]
+            if row == old_row and row_colors == old_colors:
+                continue
+
+            first = 0
+            while row[first] == old_row[first] and row_colors[first] == old_colors[first]:
+                first += 1
+            last = len(row) - 1
+            while row[last] == old_row[last] and row_colors[last] == old_colors[last]:
+                last -= 1
+
+            out.append(f"\033[{y+1};{first+1}H")
+            current = -1
+            skipped = 0
+            for x in range(first, last + 1):
+                if row[x] == old_row[x] and row_colors[x] == old_colors[x]:
+                    skipped += 1
+                    continue
+                if skipped > 4:
+                    out.append(f"\033[{skipped}C")  # Cursor forward over an unchanged stretch
+                    skipped = 0
+                for cx in range(x - skipped, x + 1):
+                    color = row_colors[cx]
+                    if color != current:
+                        out.append(Style.RESET_ALL + palette[color])
+                        current = color
+                    out.append(row[cx])
+                skipped = 0
+            out.append(Style.RESET_ALL)
+
+            old_row[first:last + 1] = row[first:last + 1]
+            old_colors[first:last + 1] = row_colors[first:last + 1]
+
+    @staticmethod
+    def _fade_out(cells, term_width, term_height, delay=0.001):
+        """
+        Column-by-column fade from sides to center with magenta highlighting
+        a tenth of the width wide on each side, clearing only the outermost
+        left and right columns per step.
         """
         delay = delay * (144 / term_width)
         left_col = 0
         right_col = term_width - 1
-        
+        highlight = Fore.MAGENTA
+        highlight_width = int(term_width / 10)
+
         while left_col <= right_col:
-            out = ["\033[H"]
-            
-            highlight_color = Fore.MAGENTA
-            highlight_width = int(term_width / 10)
-            
-            # Calculate highlight ranges
-            left_highlight_start = left_col
-            left_highlight_end = min(left_col + highlight_width - 1, right_col)
-            
-            right_highlight_start = max(right_col - highlight_width + 1, left_col)
-            right_highlight_end = right_col
-            
-            # Highlight left side columns (5 columns wide)
-            for x in range(left_highlight_start, left_highlight_end + 1):
-                for y in range(term_height):
-                    if (y, x) in frame_cells:
-                        cell_content = frame_cells[(y, x)]
-                        # Strip existing color codes and apply magenta
-                        ansi_re = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
-                        clean_char = ansi_re.sub('', cell_content)
-                        out.append(f"\033[{y+1};{x+1}H{highlight_color}{clean_char}{Style.RESET_ALL}")
-            
-            # Highlight right side columns (5 columns wide) - only if not overlapping with left
-            if right_highlight_start > left_highlight_end:
-                for x in range(right_highlight_start, right_highlight_end + 1):
-                    for y in range(term_height):
-                        if (y, x) in frame_cells:
-                            cell_content = frame_cells[(y, x)]
-                            ansi_re = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
-                            clean_char = ansi_re.sub('', cell_content)
-                            out.append(f"\033[{y+1};{x+1}H{highlight_color}{clean_char}{Style.RESET_ALL}")
-            
+            left_end = min(left_col + highlight_width - 1, right_col)
+            right_start = max(right_col - highlight_width + 1, left_col)
+
+            # One run per side per row; the right run only if it doesn't overlap the left
+            out = []
+            for y in range(term_height):
+                row = cells[y]
+                if left_end >= left_col:
+                    out.append(f"\033[{y+1};{left_col+1}H{highlight}{''.join(row[left_col:left_end + 1])}")
+                if right_start > left_end:
+                    out.append(f"\033[{y+1};{right_start+1}H{highlight}{''.join(row[right_start:right_col + 1])}")
+            out.append(Style.RESET_ALL)
+
             sys.stdout.write("".join(out))
             sys.stdout.flush()
             time.sleep(delay)
-            
+
             # Then clear ONLY the outermost left and right columns
-            out = ["\033[H"]
+            out = []
             for y in range(term_height):
                 out.append(f"\033[{y+1};{left_col+1}H ")
                 if left_col != right_col:
                     out.append(f"\033[{y+1};{right_col+1}H ")
-            
+
             sys.stdout.write("".join(out))
             sys.stdout.flush()
-            
+
             # Move to next columns (only the outermost ones move inward)
             left_col += 1
             right_col -= 1
-            
+
             # Small delay before next iteration
             if left_col <= right_col:
                 time.sleep(delay * 0.3)
-                      
+
     @staticmethod
-    def show(glow_speed: float = 1.0, side_density: float = 0.4, rain_density: float = 0.125):
+    def show(glow_speed: float = 1.0, side_density: float = 0.4, rain_density: float = 0.125, show_fps: bool = False):
         """
         Cyberpunk splash screen with vertical rain, glowing title (KAIRO always bright),
         breathing version glow for "v 0.1", and a closed magenta container with caved corners.
         Streams scale dynamically with window size and share a smooth, uniform gradient.
+        With show_fps, the measured frame rate and render time are shown bottom-left.
         """
 
         # PRELOAD SOUNDS IMMEDIATELY at startup
         Sound.preload_sounds()
 
         try:
-            term_width = shutil.get_terminal_size().columns
-            term_height = shutil.get_terminal_size().lines
+            term_width, term_height = shutil.get_terminal_size()
         except:
             term_width, term_height = 120, 30
 
-        # --- Scaling factors ---
-        width_scale = term_width / 144
-        height_scale = term_height / 38
-
-        System.clear_screen()
-        chars = "0123456789ABCDEF"
-        ansi_re = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
-        def visible_len(s): return len(ansi_re.sub('', s))
-
+        chars = SplashScreen.CHARS
         title_lines = ["KAIRO", "", "v 0.1"]
-        center_y = (term_height // 2) - (len(title_lines) // 2)
-
-        # --- Column setup (rain) with HEIGHT-PROPORTIONAL lengths ---
-        num_columns = int(term_width * rain_density)
-        
-        # Calculate rain stream lengths proportional to terminal height
-        height_scale_factor = 1.0
-        base_min_length = int(6 * height_scale * height_scale_factor)
-        base_max_length = 3 * base_min_length
-        
-        columns = []
-        used_positions = set()
-
-        for _ in range(num_columns):
-            # Randomize X positions to avoid even spacing
-            while True:
-                x = random.randint(0, term_width - 1)
-                if x not in used_positions:
-                    used_positions.add(x)
-                    break
-            base_speed = random.choice([1, 2, 3])
-            stream_length = random.randint(base_min_length, base_max_length)
-            columns.append({
-                "x": x,
-                "y": random.randint(-term_height, 0),
-                "speed": base_speed,
-                "chars": [random.choice(chars) for _ in range(term_height)],
-                "length": stream_length,
-            })
+        box_width = max(len(l) for l in title_lines) + 12
+        box_height = len(title_lines) + 4
+
+        def build_scene(rain_min_scale, rain_max_mult):
+            """Streams, gradients and frame buffers for the current terminal size"""
+            width_scale = term_width / 144
+            height_scale = term_height / 38
+
+            # --- Column setup (rain) with HEIGHT-PROPORTIONAL lengths ---
+            base_min_length = int(rain_min_scale * height_scale)
+            base_max_length = rain_max_mult * base_min_length
+            columns = []
+            for x in random.sample(range(term_width), min(term_width, int(term_width * rain_density))):
+                columns.append({
+                    "x": x,
+                    "y": random.randint(-term_height, 0),
+                    "speed": random.choice([1, 2, 3]),
+                    "chars": [random.choice(chars) for _ in range(term_height)],
+                    "length": random.randint(base_min_length, base_max_length),
+                })
 
-        # --- Side streams setup (randomized vertical positions) ---
-        left_streams, right_streams = [], []
-        num_side_streams = max(1, int(term_height * side_density))
-
-        # Randomized but non-uniform Y positions
-        y_positions = sorted(random.sample(range(term_height), num_side_streams))
-        while len(y_positions) < num_side_streams:
-            y_positions.append(random.randint(0, term_height - 1))
-
-        width_scale_factor = 1.0
-        min_len = int(10 * width_scale * width_scale_factor)
-        max_len = 4 * min_len
-
-        for y in y_positions:
-            length = random.randint(min_len, max_len)
-            left_streams.append({
-                "y": y,
-                "length": length,
-                "chars": [random.choice(chars) for _ in range(length)],
-                "progress": 0,
-                "speed": random.choice([1, 2]),
-                "direction": "right",
-                "vertical_speed": 1,
-            })
-            length = random.randint(min_len, max_len)
-            right_streams.append({
-                "y": y,
-                "length": length,
-                "chars": [random.choice(chars) for _ in range(length)],
-                "progress": 0,
-                "speed": random.choice([1, 2]),
-                "direction": "left",
-                "vertical_speed": 1,
-            })
+            # --- Side streams (randomized vertical positions) ---
+            side_streams = []
+            min_len = int(10 * width_scale)
+            max_len = 4 * min_len
+            for y in sorted(random.sample(range(term_height), max(1, int(term_height * side_density)))):
+                for direction in ("right", "left"):
+                    length = random.randint(min_len, max_len)
+                    side_streams.append({
+                        "y": y,
+                        "length": length,
+                        # Shifted by appendleft; maxlen drops the tail char
+                        "chars": deque((random.choice(chars) for _ in range(length)), maxlen=length),
+                        "progress": 0,
+                        "speed": random.choice([1, 2]),
+                        "direction": direction,
+                        "vertical_speed": 1,
+                    })
+
+            # --- Shared gradient for side streams, by distance from the edge ---
+            side_colors = bytearray()
+            for i in range(max_len + 1):
+                pos = i / max(1, max_len)
+                if pos < 0.15:
+                    side_colors.append(SplashScreen.SIDE_HEAD)
+                elif pos < 0.55:
+                    side_colors.append(SplashScreen.SIDE_BODY)
+                else:
+                    side_colors.append(SplashScreen.SIDE_TAIL)
 
-        # --- Shared gradient for side streams ---
-        longest_stream_len = max_len
-        def get_color_for_position(i):
-            pos = i / longest_stream_len
-            if pos < 0.15:
-                return Fore.LIGHTMAGENTA_EX + Style.BRIGHT
-            elif pos < 0.30:
-                return Fore.MAGENTA
-            elif pos < 0.55:
-                return Fore.MAGENTA
-            else:
-                return Fore.MAGENTA + Style.DIM
+            # Screen contents (what the terminal shows) and the frame being drawn
+            screen_cells = [[" "] * term_width for _ in range(term_height)]
+            screen_colors = [bytearray(term_width) for _ in range(term_height)]
+            cells = [[" "] * term_width for _ in range(term_height)]
+            colors = [bytearray(term_width) for _ in range(term_height)]
+            return (columns, side_streams, side_colors, base_min_length, base_max_length,
+                    screen_cells, screen_colors, cells, colors)
 
         # --- Shared gradient for vertical rain (HEIGHT-PROPORTIONAL) ---
         def get_rain_color_for_offset(offset, stream_length):
             """Get color based on position in stream, proportional to stream length"""
             pos = offset / stream_length
             if pos < 0.05:  # Head (brightest)
-                return Fore.LIGHTCYAN_EX + Style.BRIGHT
+                return SplashScreen.RAIN_HEAD
             elif pos < 0.30:  # Near head
-                return Fore.CYAN
+                return SplashScreen.RAIN_NEAR
             elif pos < 0.65:  # Middle
-                return Fore.LIGHTBLUE_EX
+                return SplashScreen.RAIN_MID
             else:  # Tail (dimmest)
-                return Fore.BLUE + Style.DIM
+                return SplashScreen.RAIN_TAIL
+
+        def put(y, x, text, color):
+            """Write text into the frame, clipped to the terminal"""
+            if 0 <= y < term_height and 0 <= x < term_width:
+                text = text[:term_width - x]
+                cells[y][x:x + len(text)] = text
+                colors[y][x:x + len(text)] = bytes((color,)) * len(text)
+
+        (columns, side_streams, side_colors, base_min_length, base_max_length,
+         screen_cells, screen_colors, cells, colors) = build_scene(6, 3)
+        System.clear_screen()
 
         # --- Hide cursor ---
         sys.stdout.write("\033[?25l")
@@ -261,146 +324,68 @@ class SplashScreen:
         user_pressed_key = False
         start_time = time.time()
         prev_side_stream_rows = set()
+        next_frame = time.perf_counter()
+        fps_text = ""
+        fps_frames = 0
+        fps_since = next_frame
 
         try:
             while not user_pressed_key:
+                frame_start = time.perf_counter()
                 try:
-                    new_width = shutil.get_terminal_size().columns
-                    new_height = shutil.get_terminal_size().lines
+                    new_width, new_height = shutil.get_terminal_size()
                 except:
                     new_width, new_height = term_width, term_height
 
                 if (new_width, new_height) != (term_width, term_height):
                     term_width, term_height = new_width, new_height
-                    width_scale = term_width / 144
-                    height_scale = term_height / 38
+                    (columns, side_streams, side_colors, base_min_length, base_max_length,
+                     screen_cells, screen_colors, cells, colors) = build_scene(8, 2)
                     System.clear_screen()
                     prev_side_stream_rows.clear()
-                    
-                    # --- Regenerate vertical rain columns with HEIGHT-PROPORTIONAL lengths ---
-                    num_columns = int(term_width * rain_density)
-                    base_min_length = int(8 * height_scale * height_scale_factor)
-                    base_max_length = 2 * base_min_length
-                    
-                    columns = []
-                    used_positions = set()
-                    for _ in range(num_columns):
-                        while True:
-                            x = random.randint(0, term_width - 1)
-                            if x not in used_positions:
-                                used_positions.add(x)
-                                break
-                        base_speed = random.choice([1, 2, 3])
-                        stream_length = random.randint(base_min_length, base_max_length)
-                        columns.append({
-                            "x": x,
-                            "y": random.randint(-term_height, 0),
-                            "speed": base_speed,
-                            "chars": [random.choice(chars) for _ in range(term_height)],
-                            "length": stream_length,
-                        })
-                    
-                    # --- Regenerate side streams ---
-                    left_streams, right_streams = [], []
-                    num_side_streams = max(1, int(term_height * side_density))
-                    y_positions = sorted(random.sample(range(term_height), num_side_streams))
-                    while len(y_positions) < num_side_streams:
-                        y_positions.append(random.randint(0, term_height - 1))
-                    
-                    min_len = int(10 * width_scale * width_scale_factor)
-                    max_len = 4 * min_len
-                    
-                    for y in y_positions:
-                        length = random.randint(min_len, max_len)
-                        left_streams.append({
-                            "y": y,
-                            "length": length,
-                            "chars": [random.choice(chars) for _ in range(length)],
-                            "progress": 0,
-                            "speed": random.choice([1, 2]),
-                            "direction": "right",
-                            "vertical_speed": 1,
-                        })
-                        length = random.randint(min_len, max_len)
-                        right_streams.append({
-                            "y": y,
-                            "length": length,
-                            "chars": [random.choice(chars) for _ in range(length)],
-                            "progress": 0,
-                            "speed": random.choice([1, 2]),
-                            "direction": "left",
-                            "vertical_speed": 1,
-                        })
-                    
-                    # --- Update longest stream length for gradient ---
-                    longest_stream_len = max_len
 
                 center_y = (term_height // 2) - (len(title_lines) // 2)
-                longest_line_len = max(visible_len(l) for l in title_lines)
-                box_width = longest_line_len + 12
-                box_height = len(title_lines) + 4
                 top_y = max(0, center_y - 2)
                 left_x = max(0, (term_width - box_width) // 2)
-
                 t = time.time() - start_time
-                frame_cells = {}
 
                 # --- Clear previous side stream rows ---
+                blank_row = [" "] * term_width
+                plain_row = bytes(term_width)
                 for y in prev_side_stream_rows:
                     if 0 <= y < term_height:
-                        for x in range(term_width):
-                            if not (top_y <= y < top_y + box_height and left_x <= x < left_x + box_width):
-                                frame_cells[(y, x)] = " "
+                        cells[y][:] = blank_row
+                        colors[y][:] = plain_row
                 prev_side_stream_rows.clear()
 
                 # --- Update and scroll side streams down ---
-                for stream_list in (left_streams, right_streams):
-                    for stream in stream_list:
-                        # Shift characters once per frame
-                        stream["chars"].pop()
-                        stream["chars"].insert(0, random.choice(chars))
-
-                        # Increment progress smoothly (controls how far into the stream is visible)
-                        stream["progress"] += stream["speed"] * 0.5
-                        if stream["progress"] > stream["length"]:
-                            stream["progress"] = stream["length"]
-
-                        # Move vertically
-                        stream["y"] += stream["vertical_speed"]
-                        if stream["y"] >= term_height:
-                            stream["y"] = -1  # wrap around
-
-                # --- Build protection map (safe zones) ---
-                protected_ranges = {y: [] for y in range(term_height)}
-                for stream_list in (left_streams, right_streams):
-                    for stream in stream_list:
-                        y = stream["y"]
-                        if y < 0 or y >= term_height:
-                            continue
-                        direction = stream["direction"]
-                        length = stream["length"]
-                        progress = min(stream["progress"], length)
-                        if direction == "right":
-                            start_x = 0
-                            end_x = min(int(progress), term_width - 1)
+                for stream in side_streams:
+                    stream["chars"].appendleft(random.choice(chars))
+                    stream["progress"] = min(stream["progress"] + stream["speed"] * 0.5, stream["length"])
+                    stream["y"] += stream["vertical_speed"]
+                    if stream["y"] >= term_height:
+                        stream["y"] = -1  # wrap around
+
+                # --- Protected spans: side streams always touch an edge, so one reach per side and row ---
+                left_reach = [-1] * term_height
+                right_reach = [term_width] * term_height
+                for stream in side_streams:
+                    y = stream["y"]
+                    if 0 <= y < term_height:
+                        progress = int(stream["progress"])
+                        if stream["direction"] == "right":
+                            left_reach[y] = max(left_reach[y], min(progress, term_width - 1))
                         else:
-                            start_x = max(term_width - int(progress), 0)
-                            end_x = term_width - 1
-                        protected_ranges[y].append((start_x, end_x))
+                            right_reach[y] = min(right_reach[y], max(term_width - progress, 0))
 
                 # --- Vertical rain with HEIGHT-PROPORTIONAL gradient ---
                 # First, clear ALL non-protected positions where rain columns exist
                 for col in columns:
                     x = col["x"]
-                    for clear_y in range(term_height):
-                        # Skip if protected by side stream
-                        if any(r[0] <= x <= r[1] for r in protected_ranges.get(clear_y, [])):
-                            continue
-                        # Skip if inside title box
-                        if top_y <= clear_y < top_y + box_height and left_x <= x < left_x + box_width:
-                            continue
-                        # Clear this position
-                        frame_cells[(clear_y, x)] = " "
+                    for y in range(term_height):
+                        if left_reach[y] < x < right_reach[y]:
+                            cells[y][x] = " "
+                            colors[y][x] = SplashScreen.PLAIN
 
                 # Now draw the rain
                 for col in columns:
@@ -413,93 +398,83 @@ class SplashScreen:
 
                     for offset in range(col["length"]):
                         y = col["y"] - offset
-                        if not (0 <= y < term_height):
-                            continue
-                        if top_y <= y < top_y + box_height and left_x <= x < left_x + box_width:
-                            continue
-                        # Check if this position is protected by a side stream
-                        if any(r[0] <= x <= r[1] for r in protected_ranges.get(y, [])):
-                            continue
-                        
-                        # Use proportional gradient based on stream length
-                        color = get_rain_color_for_offset(offset, col["length"])
-                        ch = col["chars"][y % len(col["chars"])]
-                        frame_cells[(y, x)] = f"{color}{ch}{Style.RESET_ALL}"
+                        if 0 <= y < term_height and left_reach[y] < x < right_reach[y]:
+                            cells[y][x] = col["chars"][y]
+                            colors[y][x] = get_rain_color_for_offset(offset, col["length"])
 
                 # --- Side streams (shared gradient, progressive reveal) ---
-                for stream_list in (left_streams, right_streams):
-                    for stream in stream_list:
-                        y = stream["y"]
-                        if y < 0 or y >= term_height:
-                            continue
-
-                        direction = stream["direction"]
-                        visible_chars = int(stream["progress"])
-                        visible_chars = max(1, min(visible_chars, stream["length"]))
-
-                        for i, ch in enumerate(stream["chars"][:visible_chars]):
-                            if direction == "right":
-                                x = i
-                            else:
-                                x = term_width - 1 - i
-                            if not (0 <= x < term_width):
-                                continue
-                            if top_y <= y < top_y + box_height and left_x <= x < left_x + box_width:
-                                continue
-
-                            color = get_color_for_position(i)
-                            frame_cells[(y, x)] = f"{color}{ch}{Style.RESET_ALL}"
-
-                        prev_side_stream_rows.add(y)
-
-                # --- Box frame ---
-                box_color = Fore.MAGENTA + Style.DIM
-                if 0 <= top_y < term_height:
-                    frame_cells[(top_y, left_x)] = f"{box_color}╭{'─'*(box_width-2)}╮{Style.RESET_ALL}"
-                if 0 <= top_y + box_height - 1 < term_height:
-                    frame_cells[(top_y + box_height - 1, left_x)] = f"{box_color}╰{'─'*(box_width-2)}╯{Style.RESET_ALL}"
+                for stream in side_streams:
+                    y = stream["y"]
+                    if not (0 <= y < term_height):
+                        continue
+                    visible_chars = max(1, min(int(stream["progress"]), stream["length"], term_width))
+                    row = cells[y]
+                    row_colors = colors[y]
+                    if stream["direction"] == "right":
+                        for i, ch in zip(range(visible_chars), stream["chars"]):
+                            row[i] = ch
+                            row_colors[i] = side_colors[i]
+                    else:
+                        for i, ch in zip(range(visible_chars), stream["chars"]):
+                            row[term_width - 1 - i] = ch
+                            row_colors[term_width - 1 - i] = side_colors[i]
+                    prev_side_stream_rows.add(y)
+
+                # --- Box frame, drawn over whatever the streams put there ---
+                put(top_y, left_x, f"╭{'─'*(box_width-2)}╮", SplashScreen.SIDE_TAIL)
+                put(top_y + box_height - 1, left_x, f"╰{'─'*(box_width-2)}╯", SplashScreen.SIDE_TAIL)
                 for i in range(1, box_height - 1):
-                    y = top_y + i
-                    if 0 <= y < term_height:
-                        frame_cells[(y, left_x)] = f"{box_color}│{Style.RESET_ALL}"
-                        frame_cells[(y, left_x + box_width - 1)] = f"{box_color}│{Style.RESET_ALL}"
-                        for j in range(1, box_width - 1):
-                            frame_cells[(y, left_x + j)] = " "
+                    put(top_y + i, left_x, "│", SplashScreen.SIDE_TAIL)
+                    put(top_y + i, left_x + 1, " " * (box_width - 2), SplashScreen.PLAIN)
+                    put(top_y + i, left_x + box_width - 1, "│", SplashScreen.SIDE_TAIL)
 
-                # --- Draw text properly, character by character ---
+                # --- Title and breathing version ---
                 for i, line in enumerate(title_lines):
-                    y = center_y + i
-                    x_start = (term_width - visible_len(line)) // 2
+                    x_start = (term_width - len(line)) // 2
                     if "KAIRO" in line:
-                        for j, ch in enumerate(line):
-                            frame_cells[(y, x_start + j)] = f"{Fore.MAGENTA}{Style.BRIGHT}{ch}{Style.RESET_ALL}"
+                        put(center_y + i, x_start, line, SplashScreen.TITLE)
                     elif "v" in line:
                         phase = (math.sin(t * math.pi * glow_speed) + 1) / 2
-                        color = Fore.LIGHTBLUE_EX if phase >= 0.5 else (Fore.BLUE + Style.DIM)
-                        for j, ch in enumerate(line):
-                            frame_cells[(y, x_start + j)] = f"{color}{ch}{Style.RESET_ALL}"
-
-                # --- Emit frame ---
-                out = ["\033[H"]
-                for (y, x), cell in frame_cells.items():
-                    out.append(f"\033[{y+1};{x+1}H{cell}")
-                sys.stdout.write("".join(out))
-                sys.stdout.flush()
+                        put(center_y + i, x_start, line, SplashScreen.RAIN_MID if phase >= 0.5 else SplashScreen.RAIN_TAIL)
+
+                if show_fps:
+                    put(term_height - 1, 0, fps_text, SplashScreen.PLAIN)
+
+                # --- Emit only what changed ---
+                out = []
+                SplashScreen._emit_changes(cells, colors, screen_cells, screen_colors, out)
+                if out:
+                    sys.stdout.write("".join(out))
+                    sys.stdout.flush()
+
+                now = time.perf_counter()
+                if show_fps:
+                    fps_frames += 1
+                    if now - fps_since >= 1.0:
+                        fps_text = f" {fps_frames / (now - fps_since):5.1f} fps  {(now - frame_start) * 1000:5.1f} ms/frame "
+                        fps_frames = 0
+                        fps_since = now
+
+                # --- Wait for the next frame slot, waking early on a keypress ---
+                next_frame += SplashScreen.FRAME_TIME
+                if next_frame < now:
+                    next_frame = now  # Fell behind; don't try to catch up with a burst
+                timeout = next_frame - now
 
-                # --- Exit ---  
                 if os.name == "nt":
-                    import msvcrt
-                    if msvcrt.kbhit():
+                    time.sleep(timeout)
+                    key_pressed = msvcrt.kbhit()
+                    if key_pressed:
                         msvcrt.getch()
-                        SplashScreen._fade_out(frame_cells, term_width, term_height)
-                        user_pressed_key = True
                 else:
-                    if select.select([sys.stdin], [], [], 0)[0]:
+                    key_pressed = bool(select.select([sys.stdin], [], [], timeout)[0])
+                    if key_pressed:
                         sys.stdin.read(1)
-                        SplashScreen._fade_out(frame_cells, term_width, term_height)
-                        user_pressed_key = True
 
-                time.sleep(0.05)
+                # --- Exit ---
+                if key_pressed:
+                    SplashScreen._fade_out(screen_cells, term_width, term_height)
+                    user_pressed_key = True
 
         finally:
             if os.name != "nt":
@@ -509,13 +484,28 @@ class SplashScreen:
             System.clear_screen()
 
 class AsciiArt:
-    _stdout_lock = threading.Lock()
-    _running = True
+    """
+    Animated clock border in the top-right corner of the command screen.
+    One long-lived scheduler thread owns the drawing: it wakes for the next
+    frame, for start/stop requests and for SIGWINCH (through a wakeup pipe),
+    so nothing polls the terminal size and stopping never waits on a thread.
+    """
+    FRAME_INTERVAL = 0.625
+    BOX_WIDTH = 28
+    
+    # Corner glyphs and trailing shade per frame
+    FRAME_STYLES = [("▶◀", "▓▒░"), ("◀▶", "░▓▒"), ("◥◤", "▒░▓"), ("◢◣", "░▒▓")]
+    
+    _stdout_lock = threading.RLock()  # Shared with TerminalState; clear_screen flushes while held
     _terminal_width = None
     _terminal_height = None
-    _current_thread = None
-    _stop_event = threading.Event()
-    _thread_lock = threading.Lock()
+    _active = False           # Border is drawn only while the command prompt owns the screen
+    _resize_pending = False   # Set by the SIGWINCH handler
+    _scheduler = None
+    _wake = threading.Event() # Wakeup for platforms without a signal wakeup pipe
+    _wake_fds = None          # (read, write) pipe used with signal.set_wakeup_fd
+    _frames_key = None        # (clock text, column) the cached frames were built for
+    _frames = []
 
     @staticmethod
     def initialize_terminal_dimensions():
@@ -530,97 +520,144 @@ class AsciiArt:
 
     @staticmethod
     def stop_animation():
-        """Stop the current animation thread safely."""
-        with AsciiArt._thread_lock:
-            AsciiArt._stop_event.set()
-            
-            if AsciiArt._current_thread and AsciiArt._current_thread.is_alive():
-                AsciiArt._current_thread.join(timeout=0.5)
-            
-            AsciiArt._current_thread = None
-            AsciiArt._stop_event.clear()
+        """Stop drawing the border. Returns at once; no frame is written after this."""
+        with AsciiArt._stdout_lock:
+            AsciiArt._active = False
     
     @staticmethod
     def start_animation():
-        """Start the animation thread safely."""
-        with AsciiArt._thread_lock:
-            if AsciiArt._current_thread and AsciiArt._current_thread.is_alive():
-                AsciiArt._stop_event.set()
-                AsciiArt._current_thread.join(timeout=0.5)
-                AsciiArt._stop_event.clear()
-            
-            AsciiArt.initialize_terminal_dimensions()
-            
-            AsciiArt._current_thread = threading.Thread(target=AsciiArt.draw_animated_border, daemon=True)
-            AsciiArt._current_thread.start()
+        """Start drawing the border, starting the scheduler on first use."""
+        AsciiArt._ensure_scheduler()
+        with AsciiArt._stdout_lock:
+            AsciiArt._active = True
+        AsciiArt._notify()
+    
+    @staticmethod
+    def _ensure_scheduler():
+        """Start the render thread and hook SIGWINCH once per process"""
+        if AsciiArt._scheduler is not None:
+            return
+        
+        AsciiArt.initialize_terminal_dimensions()
+        if hasattr(signal, 'SIGWINCH') and threading.current_thread() is threading.main_thread():
+            read_fd, write_fd = os.pipe()
+            os.set_blocking(write_fd, False)
+            signal.signal(signal.SIGWINCH, AsciiArt._on_sigwinch)
+            signal.set_wakeup_fd(write_fd, warn_on_full_buffer=False)
+            AsciiArt._wake_fds = (read_fd, write_fd)
+        
+        AsciiArt._scheduler = threading.Thread(target=AsciiArt._render_loop, daemon=True)
+        AsciiArt._scheduler.start()
+    
+    @staticmethod
+    def _on_sigwinch(signum, frame):
+        """SIGWINCH handler: only flags the resize; the wakeup fd wakes the scheduler"""
+        AsciiArt._resize_pending = True
+        # This handler replaces the one ncurses installs, so resize an open curses screen here
+        try:
+            if not curses.isendwin():
+                size = os.get_terminal_size(sys.__stdout__.fileno())
+                curses.resizeterm(size.lines, size.columns)
+        except (curses.error, OSError, ValueError):
+            pass
+    
+    @staticmethod
+    def _notify():
+        """Wake the scheduler early"""
+        if AsciiArt._wake_fds is not None:
+            try:
+                os.write(AsciiArt._wake_fds[1], b'\0')
+            except OSError:
+                pass  # Pipe full - a wakeup is already pending
+        else:
+            AsciiArt._wake.set()
+    
+    @staticmethod
+    def _wait(timeout):
+        """Sleep until the next frame is due or something wakes the scheduler"""
+        if AsciiArt._wake_fds is not None:
+            readable, _, _ = select.select([AsciiArt._wake_fds[0]], [], [], timeout)
+            if readable:
+                os.read(AsciiArt._wake_fds[0], 512)
+        else:
+            AsciiArt._wake.wait(timeout)
+            AsciiArt._wake.clear()
+            # No SIGWINCH here, so compare sizes once per frame instead
+            try:
+                size = shutil.get_terminal_size()
+                if (size.columns, size.lines) != (AsciiArt._terminal_width, AsciiArt._terminal_height):
+                    AsciiArt._resize_pending = True
+            except OSError:
+                pass
     
     @staticmethod
     def handle_terminal_resize():
         """Handle terminal resize by clearing screen and redrawing from buffer"""
-        AsciiArt.stop_animation()
         AsciiArt.initialize_terminal_dimensions()
-        System.clear_screen()
-        
-        with TerminalState._stdout_lock:
-            for output in TerminalState._output_buffer:
-                sys.stdout.write(output)
-                sys.stdout.flush()
-        
-        AsciiArt.start_animation()
+        with AsciiArt._stdout_lock:
+            if not AsciiArt._active:
+                return  # A curses screen owns the terminal; restore() redraws after it
+            TerminalState.drop_recorded_pending()
+            System.clear_screen()
+            TerminalState.replay()
 
     @staticmethod
-    def draw_animated_border():
-        """Draw an animated cyberpunk-style ASCII art border on the right side with MAGENTA color."""
-        box_width = 28
-        
-        while not AsciiArt._stop_event.is_set():
-            try:
-                current_width = shutil.get_terminal_size().columns
-            except:
-                current_width = AsciiArt._terminal_width or 120
-            
-            start_col = max(0, current_width - box_width - 1)
-            start_line = 1
-            
-            current_time = datetime.datetime.now().strftime('%I:%M %p')
-            
-            frames = [
-                [
-                    f"{Fore.MAGENTA}╔══════════════════════════╗{Style.RESET_ALL}",
-                    f"{Fore.MAGENTA}║ ▶◀ KAIRO ▶◀ {current_time} ▓▒░ ║{Style.RESET_ALL}",
-                    f"{Fore.MAGENTA}╚══════════════════════════╝{Style.RESET_ALL}"
-                ],
-                [
-                    f"{Fore.MAGENTA}╔══════════════════════════╗{Style.RESET_ALL}",
-                    f"{Fore.MAGENTA}║ ◀▶ KAIRO ◀▶ {current_time} ░▓▒ ║{Style.RESET_ALL}",
-                    f"{Fore.MAGENTA}╚══════════════════════════╝{Style.RESET_ALL}"
-                ],
-                [
-                    f"{Fore.MAGENTA}╔══════════════════════════╗{Style.RESET_ALL}",
-                    f"{Fore.MAGENTA}║ ◥◤ KAIRO ◥◤ {current_time} ▒░▓ ║{Style.RESET_ALL}",
-                    f"{Fore.MAGENTA}╚══════════════════════════╝{Style.RESET_ALL}"
-                ],
-                [
-                    f"{Fore.MAGENTA}╔══════════════════════════╗{Style.RESET_ALL}",
-                    f"{Fore.MAGENTA}║ ◢◣ KAIRO ◢◣ {current_time} ░▒▓ ║{Style.RESET_ALL}",
-                    f"{Fore.MAGENTA}╚══════════════════════════╝{Style.RESET_ALL}"
-                ]
-            ]
-            
-            for frame in frames:
-                if AsciiArt._stop_event.is_set():
-                    return
-                    
-                with AsciiArt._stdout_lock:
-                    sys.stdout.write("\033[?25l\0337")
-                    
-                    for line_num, line in enumerate(frame):
-                        sys.stdout.write(f"\033[{start_line + line_num};{start_col}H")
-                        sys.stdout.write(line)
-                    
-                    sys.stdout.write("\0338\033[?25h")
-                    sys.stdout.flush()
-                time.sleep(0.625)
+    def _get_frames():
+        """Escape sequences for the four frames, rebuilt only when the clock minute or width changes"""
+        current_time = datetime.datetime.now().strftime('%I:%M %p')
+        start_col = max(0, (AsciiArt._terminal_width or 120) - AsciiArt.BOX_WIDTH - 1)
+        key = (current_time, start_col)
+        if key != AsciiArt._frames_key:
+            top = f"{Fore.MAGENTA}╔══════════════════════════╗{Style.RESET_ALL}"
+            bottom = f"{Fore.MAGENTA}╚══════════════════════════╝{Style.RESET_ALL}"
+            AsciiArt._frames = []
+            for glyphs, shade in AsciiArt.FRAME_STYLES:
+                middle = f"{Fore.MAGENTA}║ {glyphs} KAIRO {glyphs} {current_time} {shade} ║{Style.RESET_ALL}"
+                AsciiArt._frames.append(
+                    "\033[?25l\0337"
+                    + "".join(f"\033[{1 + line_num};{start_col}H{line}" for line_num, line in enumerate((top, middle, bottom)))
+                    + "\0338\033[?25h"
+                )
+            AsciiArt._frames_key = key
+        return AsciiArt._frames
+
+    @staticmethod
+    def _render_loop():
+        """
+        Scheduler thread: draw a frame per interval while active, write buffered
+        shell output once per output frame, handle resizes as they arrive
+        """
+        frame_index = 0
+        next_frame = 0.0
+        while True:
+            deadlines = []
+            if AsciiArt._active:
+                deadlines.append(next_frame)
+            if TerminalState._pending_since is not None:
+                deadlines.append(TerminalState._pending_since + TerminalState.FLUSH_INTERVAL)
+            AsciiArt._wait(max(0.0, min(deadlines) - time.monotonic()) if deadlines else None)
+            
+            if AsciiArt._resize_pending:
+                AsciiArt._resize_pending = False
+                AsciiArt.handle_terminal_resize()
+            
+            now = time.monotonic()
+            with AsciiArt._stdout_lock:
+                draw = AsciiArt._active and now >= next_frame
+                pending_since = TerminalState._pending_since
+                if not draw and (pending_since is None or now < pending_since + TerminalState.FLUSH_INTERVAL):
+                    continue
+                
+                # Buffered output goes first so the frame saves the cursor where the text ends
+                output = TerminalState.take_pending()
+                if draw:
+                    output += AsciiArt._get_frames()[frame_index]
+                sys.stdout.write(output)
+                sys.stdout.flush()
+            
+            if draw:
+                frame_index = (frame_index + 1) % len(AsciiArt.FRAME_STYLES)
+                next_frame = now + AsciiArt.FRAME_INTERVAL
 
 class Curses:
     @staticmethod
@@ -631,6 +668,8 @@ class Curses:
         sys.stdout.write('\033[0m')  # Additional ANSI reset
         sys.stdout.flush()
 
+        TerminalState.flush()
+
         # Call curses.wrapper and return its result
         return curses.wrapper(func)
 
@@ -858,7 +897,7 @@ class CursesLoginScreen:
                             return ("login", user.username)
                     
                     elif self.mode == "create":
-                        if any(u.username.lower() == self.username.lower() for u in self.users):
+                        if UserManager.match_user(self.users, self.username):
                             self.message = "Username already exists"
                             self.message_color = curses.COLOR_RED
                         elif len(self.username) == 0:
@@ -897,9 +936,613 @@ class CursesLoginScreen:
                             self.password += chr(ch)
                     self.message = ""
 
+class MappedFileSource:
+    """Read-only memory map of a file with a lazily built line-offset index"""
+    CHUNK_SIZE = 16 * 1024 * 1024  # Bytes counted per slice when sizing the file
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self._file = open(filepath, 'rb')
+        try:
+            self.map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self.size = len(self.map)
+        self.line_starts = array('q', [0])  # Byte offset where each indexed line starts
+        self._scan_pos = 0                  # Offsets are known up to this byte
+        self.line_count = self._count_lines()
+        self.closed = False
+
+    def _count_lines(self) -> int:
+        """Count lines the same way str.split('\\n') would, without decoding"""
+        count = 1
+        pos = 0
+        while pos < self.size:
+            end = min(pos + self.CHUNK_SIZE, self.size)
+            count += self.map[pos:end].count(b'\n')
+            pos = end
+        return count
+
+    def _index_to(self, line: int):
+        """Extend the offset index far enough to know where `line` ends"""
+        starts = self.line_starts
+        find = self.map.find
+        pos = self._scan_pos
+        while len(starts) <= line + 1 and pos < self.size:
+            newline = find(b'\n', pos)
+            if newline == -1:
+                pos = self.size
+                break
+            pos = newline + 1
+            starts.append(pos)
+        self._scan_pos = pos
+
+    def span(self, line: int) -> Tuple[int, int]:
+        """Get the (start, end) byte range of an original line, excluding its newline"""
+        if self.closed:
+            raise IndexError("mapped file was closed")
+        self._index_to(line)
+        start = self.line_starts[line]
+        if line + 1 < len(self.line_starts):
+            return start, self.line_starts[line + 1] - 1
+        return start, self.size
+
+    def line(self, line: int) -> str:
+        """Decode a single original line"""
+        start, end = self.span(line)
+        return self.map[start:end].decode('utf-8', errors='replace')
+
+    def close(self):
+        """Release the mapping and file handle"""
+        if not self.closed:
+            self.closed = True
+            self.map.close()
+            self._file.close()
+
+class MappedLineBuffer:
+    """
+    List-like line storage for the editor's large-file mode.
+    Unedited lines are decoded from a MappedFileSource only when read (the viewport
+    window is cached), while edited and inserted lines live in an overlay that is
+    merged with the original bytes on save.
+    """
+
+    def __init__(self, source: MappedFileSource, rows=None, overlay=None, next_key=-1):
+        self.source = source
+        # Row -> line reference. None means rows map 1:1 onto original lines.
+        # References >= 0 are original line numbers, negative ones are overlay-only lines.
+        self._rows = rows
+        self._overlay = overlay if overlay is not None else {}
+        self._next_key = next_key
+        self._window = {}  # Decoded original lines around the viewport
+
+    def __len__(self):
+        return len(self._rows) if self._rows is not None else self.source.line_count
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def _ref(self, index: int) -> int:
+        """Translate a row number into a line reference"""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("line index out of range")
+        return self._rows[index] if self._rows is not None else index
+
+    def _materialize_rows(self):
+        """Switch from the identity mapping to an explicit row table (first insert/delete)"""
+        if self._rows is None:
+            self._rows = array('q', range(self.source.line_count))
+
+    def _new_ref(self, text: str) -> int:
+        """Store a line that has no original counterpart and return its reference"""
+        ref = self._next_key
+        self._next_key -= 1
+        self._overlay[ref] = text
+        return ref
+
+    def _read(self, ref: int) -> str:
+        if ref in self._overlay:
+            return self._overlay[ref]
+        if ref in self._window:
+            return self._window[ref]
+        return self.source.line(ref)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._read(self._ref(i)) for i in range(*index.indices(len(self)))]
+        return self._read(self._ref(index))
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("extended slice assignment is not supported")
+            self._materialize_rows()
+            for ref in self._rows[start:stop]:
+                self._overlay.pop(ref, None)
+            self._rows[start:stop] = array('q', [self._new_ref(text) for text in value])
+        else:
+            self._overlay[self._ref(index)] = value
+
+    def __delitem__(self, index):
+        self._materialize_rows()
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            for ref in self._rows[start:stop:step]:
+                self._overlay.pop(ref, None)
+            del self._rows[start:stop:step]
+        else:
+            self._overlay.pop(self._ref(index), None)
+            del self._rows[index]
+
+    def insert(self, index: int, text: str):
+        self._materialize_rows()
+        self._rows.insert(index, self._new_ref(text))
+
+    def copy(self):
+        """Snapshot for a background save: shares the mapping, copies only the row table and overlay"""
+        rows = array('q', self._rows) if self._rows is not None else None
+        return MappedLineBuffer(self.source, rows, dict(self._overlay), self._next_key)
+
+    def prefetch(self, start: int, stop: int):
+        """Decode the lines in [start, stop) and drop everything outside that window"""
+        start = max(0, start)
+        stop = min(len(self), stop)
+        window = {}
+        for i in range(start, stop):
+            ref = self._ref(i)
+            if ref >= 0 and ref not in self._overlay:
+                window[ref] = self._window.get(ref) or self.source.line(ref)
+        self._window = window
+
+    def write_to(self, f):
+        """Write the merged buffer to a binary file, copying unedited runs straight from the mapping"""
+        source = self.source
+        overlay = self._overlay
+        first = True
+
+        def write_piece(data):
+            nonlocal first
+            if not first:
+                f.write(b'\n')
+            f.write(data)
+            first = False
+
+        def write_run(run_start, run_end):
+            start = source.span(run_start)[0]
+            end = source.span(run_end)[1]
+            write_piece(source.map[start:end])
+
+        if self._rows is None:
+            # Identity mapping: only in-place edits, so copy the gaps between them
+            run_start = 0
+            for ref in sorted(overlay):
+                if ref > run_start:
+                    write_run(run_start, ref - 1)
+                write_piece(overlay[ref].encode('utf-8'))
+                run_start = ref + 1
+            if run_start < source.line_count:
+                write_run(run_start, source.line_count - 1)
+            return
+
+        run_start = run_end = None
+        for ref in self._rows:
+            if ref >= 0 and ref not in overlay:
+                if run_start is not None and ref == run_end + 1:
+                    run_end = ref
+                    continue
+                if run_start is not None:
+                    write_run(run_start, run_end)
+                run_start = run_end = ref
+            else:
+                if run_start is not None:
+                    write_run(run_start, run_end)
+                    run_start = None
+                write_piece(overlay[ref].encode('utf-8'))
+        if run_start is not None:
+            write_run(run_start, run_end)
+
+class EditorSwapFile:
+    """
+    Append-only crash-recovery journal for an editor session.
+    Each record replaces a range of lines relative to the previous checkpoint,
+    so a leftover journal can be replayed onto the file it was started from.
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = os.path.abspath(filepath)
+        digest = hashlib.sha1(self.filepath.encode('utf-8')).hexdigest()[:16]
+        swap_dir = os.path.join(get_user_data_path(), "swap")
+        os.makedirs(swap_dir, exist_ok=True)
+        self.path = os.path.join(swap_dir, f"{digest}.swp")
+        self.base = None     # Lines as of the last checkpoint; None until reset() (nothing to diff against)
+        self._file = None    # Opened lazily on the first record
+        self._started = False  # Header written; later records append
+        self.failed = False
+
+    @staticmethod
+    def _file_stamp(path: str):
+        """Size and mtime of the file the journal is relative to (None if missing)"""
+        try:
+            stat = os.stat(path)
+            return [stat.st_size, stat.st_mtime_ns]
+        except OSError:
+            return None
+
+    def load_recovery(self, lines):
+        """Replay a leftover journal onto `lines`. Returns the recovered lines, or None."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                header = json.loads(f.readline())
+                if (header.get('path') != self.filepath or
+                        header.get('stamp') != EditorSwapFile._file_stamp(self.filepath)):
+                    return None
+                recovered = list(lines)
+                for raw in f:
+                    try:
+                        record = json.loads(raw)
+                    except json.JSONDecodeError:
+                        break  # Torn final record from the crash
+                    recovered[record['start']:record['end']] = record['lines']
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return recovered if recovered != list(lines) else None
+
+    def reset(self, base_lines):
+        """Start a new journal relative to `base_lines` (the file as just loaded or saved)"""
+        self.close()
+        self._started = False
+        self.base = list(base_lines)
+
+    def checkpoint(self, lines):
+        """Journal the lines that changed since the last checkpoint"""
+        if self.failed or self.base is None:
+            return
+        current = list(lines)
+        base = self.base
+        
+        # Edits are local, so trim the unchanged head and tail
+        start = 0
+        limit = min(len(base), len(current))
+        while start < limit and base[start] == current[start]:
+            start += 1
+        base_end, current_end = len(base), len(current)
+        while base_end > start and current_end > start and base[base_end - 1] == current[current_end - 1]:
+            base_end -= 1
+            current_end -= 1
+        if start == base_end == current_end:
+            return
+        
+        try:
+            if self._file is None and self._started:
+                self._file = open(self.path, 'a', encoding='utf-8')
+            elif self._file is None:
+                self._file = open(self.path, 'w', encoding='utf-8')
+                header = {'path': self.filepath, 'stamp': EditorSwapFile._file_stamp(self.filepath)}
+                self._file.write(json.dumps(header) + '\n')
+                self._started = True
+            record = {'start': start, 'end': base_end, 'lines': current[start:current_end]}
+            self._file.write(json.dumps(record) + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.base = current
+        except OSError:
+            self.failed = True
+            self.close()
+
+    def close(self):
+        """Close the journal, leaving it on disk"""
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def discard(self):
+        """Close and delete the journal (clean exit or explicit save); checkpoints stop until reset()"""
+        self.close()
+        self._started = False
+        self.base = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+class SyntaxHighlighter:
+    """
+    Base class for the editor's line-at-a-time lexers.
+    tokenize() gets one line plus the state carried over from the previous line
+    and returns the token spans and the state to carry into the next line.
+    States must be comparable with == so the cache can tell when they converge.
+    """
+    registry = {}  # extension -> highlighter class
+    initial_state = None
+    
+    @staticmethod
+    def register(*extensions):
+        def decorator(cls):
+            for extension in extensions:
+                SyntaxHighlighter.registry[extension] = cls
+            return cls
+        return decorator
+    
+    @staticmethod
+    def for_path(path: str):
+        """Highlighter for a file based on its extension, or None for plain text"""
+        highlighter = SyntaxHighlighter.registry.get(os.path.splitext(path)[1].lower())
+        return highlighter() if highlighter else None
+    
+    def tokenize(self, line: str, lex_state):
+        """Return ([(start, end, kind), ...], end_state) for a single line (by default one plain token)"""
+        return [(0, len(line), 'text')] if line else [], lex_state
+
+@SyntaxHighlighter.register('.py', '.pyw')
+class PythonHighlighter(SyntaxHighlighter):
+    """Python: keywords, strings (including multi-line triple quotes), comments, numbers"""
+    KEYWORDS = frozenset(keyword.kwlist) | {'self', 'cls', 'match', 'case'}
+    TOKEN_RE = re.compile(r'''
+        (?P<comment>\#.*)
+      | (?P<triple>(?:(?<!\w)[rRbBuUfF]{1,2})?(?:"""|\'\'\'))
+      | (?P<string>(?:(?<!\w)[rRbBuUfF]{1,2})?(?:"(?:\\.|[^"\\])*"?|'(?:\\.|[^'\\])*'?))
+      | (?P<number>(?<![\w.])(?:0[xXoObB][\da-fA-F_]+|\d[\d_]*(?:\.[\d_]*)?(?:[eE][+-]?\d+)?[jJ]?))
+      | (?P<decorator>^\s*@[\w.]+)
+      | (?P<word>[A-Za-z_]\w*)
+    ''', re.VERBOSE)
+    
+    def tokenize(self, line: str, lex_state):
+        spans = []
+        pos = 0
+        
+        # Continue a triple-quoted string from the previous line
+        if lex_state is not None:
+            end = line.find(lex_state)
+            if end < 0:
+                return [(0, len(line), 'string')] if line else [], lex_state
+            pos = end + 3
+            spans.append((0, pos, 'string'))
+            lex_state = None
+        
+        while True:
+            match = self.TOKEN_RE.search(line, pos)
+            if not match:
+                break
+            kind = match.lastgroup
+            start, pos = match.span()
+            if kind == 'triple':
+                quote = match.group()[-3:]
+                end = line.find(quote, pos)
+                if end < 0:
+                    spans.append((start, len(line), 'string'))
+                    return spans, quote
+                pos = end + 3
+                spans.append((start, pos, 'string'))
+            elif kind == 'word':
+                if match.group() in self.KEYWORDS:
+                    spans.append((start, pos, 'keyword'))
+            else:
+                spans.append((start, pos, kind))
+        return spans, lex_state
+
+@SyntaxHighlighter.register('.json')
+class JsonHighlighter(SyntaxHighlighter):
+    """JSON: object keys, strings, numbers and literals (no multi-line state)"""
+    TOKEN_RE = re.compile(r'''
+        (?P<key>"(?:\\.|[^"\\])*"(?=\s*:))
+      | (?P<string>"(?:\\.|[^"\\])*"?)
+      | (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+      | (?P<keyword>\b(?:true|false|null)\b)
+    ''', re.VERBOSE)
+    
+    def tokenize(self, line: str, lex_state):
+        return [match.span() + (match.lastgroup,) for match in self.TOKEN_RE.finditer(line)], lex_state
+
+@SyntaxHighlighter.register('.md', '.markdown')
+class MarkdownHighlighter(SyntaxHighlighter):
+    """Markdown: headings, fenced code blocks, quotes, list markers, inline code, emphasis and links"""
+    FENCE_RE = re.compile(r'^\s*(```|~~~)')
+    BLOCK_RE = re.compile(r'''
+        (?P<heading>^\s{0,3}\#{1,6}(?:\s.*)?$)
+      | (?P<comment>^\s*>.*)
+      | (?P<keyword>^\s*(?:[-*+]|\d+[.)])(?=\s))
+    ''', re.VERBOSE)
+    INLINE_RE = re.compile(r'''
+        (?P<string>`[^`]+`)
+      | (?P<emphasis>\*\*[^*]+\*\*|__[^_]+__|\*[^*\s][^*]*\*|(?<!\w)_[^_\s][^_]*_(?!\w))
+      | (?P<link>!?\[[^\]]*\]\([^)]*\))
+    ''', re.VERBOSE)
+    
+    def tokenize(self, line: str, lex_state):
+        fence = self.FENCE_RE.match(line)
+        if lex_state is not None:
+            # Inside a fenced code block until the matching fence
+            if fence and fence.group(1) == lex_state:
+                return [(0, len(line), 'comment')], None
+            return [(0, len(line), 'string')] if line else [], lex_state
+        if fence:
+            return [(0, len(line), 'comment')], fence.group(1)
+        
+        block = self.BLOCK_RE.match(line)
+        if block and block.lastgroup in ('heading', 'comment'):
+            return [block.span() + (block.lastgroup,)], lex_state
+        spans = [block.span() + (block.lastgroup,)] if block else []
+        spans.extend(match.span() + (match.lastgroup,) for match in self.INLINE_RE.finditer(line, block.end() if block else 0))
+        return spans, lex_state
+
+@SyntaxHighlighter.register('.kairo')
+class KairoHighlighter(SyntaxHighlighter):
+    """Kairo scripts: one command per line with $/# variables, -> assignments and nested (commands)"""
+    TOKEN_RE = re.compile(r'''
+        (?P<string>"(?:\\.|[^"\\])*"?|'(?:\\.|[^'\\])*'?)
+      | (?P<variable>[$\#]\w+|\?)
+      | (?P<keyword>->)
+      | (?P<number>(?<![\w.])-?\d+(?:\.\d+)?)
+      | (?P<word>[A-Za-z_]\w*)
+      | (?P<open>\()
+    ''', re.VERBOSE)
+    
+    def tokenize(self, line: str, lex_state):
+        spans = []
+        expect_command = True  # At the start of the line or just inside "("
+        for match in self.TOKEN_RE.finditer(line):
+            kind = match.lastgroup
+            if kind == 'open':
+                expect_command = True
+                continue
+            if kind == 'word':
+                if expect_command and match.group().lower() in CommandRegistry.commands:
+                    spans.append(match.span() + ('command',))
+            else:
+                spans.append(match.span() + (kind,))
+            expect_command = False
+        return spans, lex_state
+
+class HighlightCache:
+    """
+    Token spans per line plus the lexer state carried into each line.
+    sync() diffs the buffer against the text each entry was built from and only
+    throws away the edited range; lines are then re-tokenized from the edit
+    until the carried state matches the cached one again.
+    """
+    
+    # Memory-mapped buffers are never diffed; they re-lex this many lines above the viewport
+    SYNC_LINES = 200
+    
+    _UNKNOWN = object()  # Placeholder state for lines not lexed yet
+    
+    def __init__(self, highlighter: SyntaxHighlighter):
+        self.highlighter = highlighter
+        self.texts = []                           # Line text each entry was built from
+        self.spans = []                           # Token spans per line (None until lexed)
+        self.states = [highlighter.initial_state] # State carried into line i (len(texts) + 1 entries)
+        self.valid = 0       # Entries [0, valid) are correct
+        self.known = 0       # Entries [valid, known) were correct before the last edit
+        self.dirty_end = 0   # Past this line a converged state means the rest is reusable
+    
+    @staticmethod
+    def _common_prefix(old, new, limit: int) -> int:
+        """Length of the common prefix, compared in chunks so unchanged runs stay in C"""
+        step = 4096
+        start = 0
+        while start < limit:
+            end = min(start + step, limit)
+            if old[start:end] != new[start:end]:
+                while old[start] == new[start]:
+                    start += 1
+                return start
+            start = end
+        return limit
+    
+    @staticmethod
+    def _common_suffix(old, new, limit: int) -> int:
+        """Length of the common suffix, at most `limit` lines"""
+        step = 4096
+        count = 0
+        old_len, new_len = len(old), len(new)
+        while count < limit:
+            size = min(step, limit - count)
+            if old[old_len - count - size:old_len - count] != new[new_len - count - size:new_len - count]:
+                while old[old_len - count - 1] == new[new_len - count - 1]:
+                    count += 1
+                return count
+            count += size
+        return limit
+    
+    def sync(self, lines):
+        """Bring the cache in line with the buffer, dropping only the edited range"""
+        old = self.texts
+        old_len, new_len = len(old), len(lines)
+        start = HighlightCache._common_prefix(old, lines, min(old_len, new_len))
+        if start == old_len == new_len:
+            return
+        suffix = HighlightCache._common_suffix(old, lines, min(old_len, new_len) - start)
+        
+        # A pure deletion still needs one line re-lexed to carry the state across the gap
+        if new_len - suffix == start:
+            if start > 0:
+                start -= 1
+            else:
+                suffix -= 1
+        old_end, new_end = old_len - suffix, new_len - suffix
+        delta = new_end - old_end
+        
+        self.texts[start:old_end] = lines[start:new_end]
+        self.spans[start:old_end] = [None] * (new_end - start)
+        # Keep the state into line `start` (its predecessor is unchanged) and the
+        # old state into the first unchanged line after the edit for the convergence check
+        placeholders = [HighlightCache._UNKNOWN] * (new_end - start - 1)
+        if old_end > start:
+            self.states[start + 1:old_end] = placeholders
+        else:
+            self.states[start + 1:start + 1] = placeholders + [self.states[start]]
+        
+        known = max(self.known, self.valid)
+        pending = self.dirty_end if self.dirty_end > self.valid else 0
+        self.known = known + delta if known > old_end else min(known, start)
+        self.dirty_end = max(pending + delta if pending > old_end else pending, new_end)
+        self.valid = min(self.valid, start)
+    
+    def line_spans(self, lines, y: int):
+        """Token spans for line y, lexing forward from the last correct line if needed"""
+        tokenize = self.highlighter.tokenize
+        while self.valid <= y:
+            i = self.valid
+            spans, lex_state = tokenize(lines[i], self.states[i])
+            self.spans[i] = spans
+            self.valid = i + 1
+            if self.states[i + 1] != lex_state:
+                # Line i + 1 now starts in a different state than its cached spans assumed
+                self.states[i + 1] = lex_state
+                self.dirty_end = max(self.dirty_end, i + 2)
+            elif self.dirty_end <= i + 1 < self.known:
+                # Same state as before the edit: everything up to `known` still holds
+                self.valid = self.known
+        return self.spans[y]
+    
+    def window_spans(self, lines, top: int, bottom: int) -> dict:
+        """Spans for lines [top, bottom) of a mapped buffer, syncing from SYNC_LINES above"""
+        tokenize = self.highlighter.tokenize
+        lex_state = self.highlighter.initial_state
+        spans = {}
+        for y in range(max(0, top - self.SYNC_LINES), min(bottom, len(lines))):
+            line_spans, lex_state = tokenize(lines[y], lex_state)
+            if y >= top:
+                spans[y] = line_spans
+        return spans
+
 class CursesEditor:
     """A full-featured terminal text editor using curses (nano-like interface)"""
+
+    # Files at least this large are memory-mapped instead of read into a list
+    LARGE_FILE_THRESHOLD = 8 * 1024 * 1024
+    # Lines decoded above and below the viewport in large-file mode
+    LARGE_FILE_MARGIN = 200
+    # Seconds between swap-file checkpoints while there are unsaved edits
+    SWAP_INTERVAL = 2.0
     
+    # Navigation keys: (action, key names, key codes) as sent by different terminals
+    # and numpads. Shift combinations come first so they win over plain arrows.
+    KEY_ALIASES = (
+        ('shift_up', frozenset({'KEY_SUP', 'KEY_SR', 'kUP5', 'kUP6'}), frozenset({547, 337, 563})),
+        ('shift_down', frozenset({'KEY_SDOWN', 'KEY_SF', 'kDN5', 'kDN6'}), frozenset({548, 336, 522})),
+        ('shift_left', frozenset({'KEY_SLEFT', 'kLFT5', 'kLFT6'}), frozenset({391, 393, 545})),
+        ('shift_right', frozenset({'KEY_SRIGHT', 'kRIT5', 'kRIT6'}), frozenset({400, 402, 546})),
+        ('up', frozenset({'KEY_UP', 'KEY_A2'}), frozenset({curses.KEY_UP, 259, 450})),
+        ('down', frozenset({'KEY_DOWN', 'KEY_C2'}), frozenset({curses.KEY_DOWN, 258, 456})),
+        ('left', frozenset({'KEY_LEFT', 'KEY_B1'}), frozenset({curses.KEY_LEFT, 260, 452})),
+        ('right', frozenset({'KEY_RIGHT', 'KEY_B3'}), frozenset({curses.KEY_RIGHT, 261, 454})),
+        ('home', frozenset({'KEY_HOME', 'KEY_A1'}), frozenset({curses.KEY_HOME, 262, 449})),
+        ('end', frozenset({'KEY_END', 'KEY_C1'}), frozenset({curses.KEY_END, 358, 455})),
+        ('page_up', frozenset({'KEY_PPAGE', 'KEY_A3'}), frozenset({curses.KEY_PPAGE, 339, 451})),
+        ('page_down', frozenset({'KEY_NPAGE', 'KEY_C3'}), frozenset({curses.KEY_NPAGE, 338, 457})),
+    )
+
     def __init__(self, filepath: str):
         self.filepath = filepath
         self.original_filepath = filepath  # Track original path
@@ -922,18 +1565,57 @@ class CursesEditor:
         self.selection_end = None    # (y, x) tuple
         self.selecting = False       # True while shift is held
         
+        # Search state
+        self.search_regex_mode = False  # Toggled with Ctrl+R in the search prompt
+        self._search_regex = None       # Compiled pattern for the active search
+        self._search_lower = None       # Lowercased plain-text term (None in regex mode)
+        self._highlight_matches = False # Highlight visible matches while searching
+        self._lower_cache = {}          # y -> (line, line.lower()) for the search in progress
+        
         # Track file state
         self.file_existed = os.path.exists(filepath)
         self.was_renamed = False
         self.was_deleted = False
         self.was_saved = False
+        self.large_file = False  # True when lines are a MappedLineBuffer
+        self.switch_to = None    # Buffer picked with Ctrl+B when run() returns
+        
+        # Background save state
+        self._save_thread = None
+        self._save_result = None
         
         # Load file content
         self._load_file()
+        self.disk_stamp = EditorSwapFile._file_stamp(filepath)  # Detects outside changes while cached
+        
+        # Syntax highlighting (None for plain text)
+        self._highlight = None
+        self._set_highlighter()
+        
+        # Crash-recovery journal (large files rely on the atomic save alone)
+        self._swap = None
+        self._pending_recovery = None
+        self._last_checkpoint = time.time()
+        self._swap_dirty = False  # Keys handled since the last checkpoint
+        if not self.large_file:
+            try:
+                self._swap = EditorSwapFile(filepath)
+                self._pending_recovery = self._swap.load_recovery(self.lines)
+                self._swap.reset(self.lines)
+            except OSError:
+                self._swap = None
 
     def _load_file(self):
         """Load file content into lines array"""
         if os.path.exists(self.filepath):
+            try:
+                if os.path.getsize(self.filepath) >= self.LARGE_FILE_THRESHOLD:
+                    self.lines = MappedLineBuffer(MappedFileSource(self.filepath))
+                    self.large_file = True
+                    return
+            except (OSError, ValueError):
+                pass  # Fall back to reading the whole file
+            
             try:
                 with open(self.filepath, 'r', encoding='utf-8') as f:
                     content = f.read()
@@ -947,21 +1629,204 @@ class CursesEditor:
         else:
             self.lines = ['']
     
-    def _save_file(self) -> bool:
-        """Save current content to file"""
+    def _write_snapshot(self, path: str, snapshot):
+        """Write a snapshot to a temp file beside `path` and atomically swap it in (save thread)"""
+        directory = os.path.dirname(path) or '.'
+        temp_path = None
         try:
-            with open(self.filepath, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(self.lines))
-            self.modified = False
-            self.was_saved = True
-            self.status_message = f"[ Wrote {len(self.lines)} lines to {os.path.basename(self.filepath)} ]"
-            self.status_timeout = 20
-            return True
+            fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+            if isinstance(snapshot, MappedLineBuffer):
+                with os.fdopen(fd, 'wb') as f:
+                    snapshot.write_to(f)
+                    f.flush()
+                    os.fsync(f.fileno())
+            else:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write('\n'.join(snapshot))
+                    f.flush()
+                    os.fsync(f.fileno())
+            
+            if os.path.exists(path):
+                shutil.copymode(path, temp_path)
+            try:
+                os.replace(temp_path, path)
+            except PermissionError:
+                if not isinstance(snapshot, MappedLineBuffer):
+                    raise
+                # Windows refuses to replace a file that is still mapped; the UI
+                # thread is blocked in _wait_for_save, so the mapping can go
+                snapshot.source.close()
+                os.replace(temp_path, path)
+            
+            message = f"[ Wrote {len(snapshot)} lines to {os.path.basename(path)} ]"
+            self._save_result = (True, snapshot, message)
         except Exception as e:
-            self.status_message = f"Error saving: {str(e)}"
-            self.status_timeout = 20
+            if temp_path is not None:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+            self._save_result = (False, snapshot, str(e))
+
+    def _save_file(self, wait: bool = False) -> bool:
+        """Save current content to file on a background thread (wait=True blocks until done)"""
+        if self._save_thread is not None:
+            self._wait_for_save()
+        
+        snapshot = self.lines.copy() if self.large_file else list(self.lines)
+        self.modified = False  # Any edit made while the save runs marks the buffer dirty again
+        self._save_result = None
+        self._set_status(f"[ Writing {os.path.basename(self.filepath)}... ]", timeout=20)
+        
+        self._save_thread = threading.Thread(target=self._write_snapshot, args=(self.filepath, snapshot))
+        self._save_thread.start()
+        
+        # Windows can only replace a mapped file once nothing else touches the mapping
+        if wait or (self.large_file and os.name == 'nt'):
+            return self._wait_for_save()
+        return True
+
+    def _wait_for_save(self) -> bool:
+        """Block until an in-flight save finishes. Returns True if it succeeded."""
+        if self._save_thread is None:
+            return True
+        self._save_thread.join()
+        return self._finish_save()
+
+    def _poll_save(self):
+        """Pick up the result of a background save once its thread has finished"""
+        if self._save_thread is not None and not self._save_thread.is_alive():
+            self._finish_save()
+
+    def _finish_save(self) -> bool:
+        """Apply a completed save's result on the UI thread"""
+        success, snapshot, message = self._save_result
+        self._save_thread = None
+        self._save_result = None
+        
+        if not success:
+            self.modified = True
+            self._set_status(f"Error saving: {message}", timeout=20)
             return False
-    
+        
+        self.was_saved = True
+        self.disk_stamp = EditorSwapFile._file_stamp(self.filepath)
+        self._set_status(message, timeout=20)
+        
+        if self.large_file and (not self.modified or self.lines.source.closed):
+            # Remap so the buffer reads the file that is now on disk
+            self.lines = MappedLineBuffer(MappedFileSource(self.filepath))
+        
+        if self._swap is not None:
+            self._swap.discard()
+            self._swap.reset(snapshot)
+            if self.modified:
+                self._swap.checkpoint(self.lines)
+        return True
+
+    def _checkpoint_swap(self, force: bool = False):
+        """Journal unsaved edits to the swap file at most every SWAP_INTERVAL seconds"""
+        if self._swap is None or not self.modified or not (force or self._swap_dirty):
+            return
+        now = time.time()
+        if force or now - self._last_checkpoint >= self.SWAP_INTERVAL:
+            self._last_checkpoint = now
+            self._swap_dirty = False
+            self._swap.checkpoint(self.lines)
+
+    def _close_session(self, keep_swap: bool = False):
+        """Finish any in-flight save and clean up the swap file when the editor closes"""
+        self._wait_for_save()
+        if self._swap is not None:
+            if keep_swap:
+                self._checkpoint_swap(force=True)  # Journal the latest edits before letting go
+                self._swap.close()
+            else:
+                self._swap.discard()
+
+    def begin_session(self):
+        """Reset the per-invocation results before the buffer is shown again"""
+        self.was_saved = False
+        self.was_deleted = False
+        self.switch_to = None
+        self.session_path = self.filepath  # Path when this invocation started
+        self.file_existed = os.path.exists(self.filepath)
+
+    def close(self, keep_swap=None):
+        """Release a buffer leaving the buffer cache (by default unsaved edits stay in the swap file)"""
+        self._wait_for_save()  # Before reading modified, which a failed save sets again
+        self._close_session(keep_swap=self.modified if keep_swap is None else keep_swap)
+        if self.large_file:
+            self.lines.source.close()
+
+    def _pick_buffer(self, stdscr):
+        """Prompt for another open buffer to switch to. Returns the editor or None."""
+        others = EditorBuffers.recent(exclude=self)[:9]
+        if not others:
+            self._set_status("No other open buffers")
+            return None
+        
+        height, width = stdscr.getmaxyx()
+        status_y = height - 2
+        self._force_clear_help_bar(stdscr)
+        
+        entries = [f"{i}:{os.path.basename(editor.filepath)}{'*' if editor.modified else ''}"
+                   for i, editor in enumerate(others, start=1)]
+        prompt = f" Switch to: {'  '.join(entries)}  (1-{len(others)}, Esc) "
+        try:
+            stdscr.attron(curses.color_pair(3))
+            stdscr.addstr(status_y, 0, prompt.ljust(width)[:width])
+            stdscr.attroff(curses.color_pair(3))
+            stdscr.refresh()
+        except curses.error:
+            pass
+        
+        stdscr.timeout(-1)
+        while True:
+            ch = stdscr.getch()
+            if ch == 2:  # Ctrl+B again - most recently used buffer
+                return others[0]
+            if ord('1') <= ch < ord('1') + len(others):
+                return others[ch - ord('1')]
+            if ch == 27:
+                self._set_status("Switch cancelled")
+                return None
+
+    def _offer_recovery(self, stdscr):
+        """Ask whether to restore edits journaled by a session that did not exit cleanly"""
+        recovered = self._pending_recovery
+        self._pending_recovery = None
+        
+        height, width = stdscr.getmaxyx()
+        status_y = height - 1
+        prompt = " Unsaved changes from a previous session found. Recover them? (Y/N) "
+        
+        self._draw_screen(stdscr)
+        try:
+            stdscr.attron(curses.A_REVERSE)
+            stdscr.addstr(status_y, 0, prompt.ljust(width)[:width])
+            stdscr.attroff(curses.A_REVERSE)
+            stdscr.refresh()
+        except curses.error:
+            pass
+        
+        stdscr.timeout(-1)
+        while True:
+            ch = stdscr.getch()
+            if ch in (ord('y'), ord('Y')):
+                self.lines = recovered
+                self.modified = True
+                self._ensure_valid_cursor()
+                self._checkpoint_swap(force=True)
+                self._set_status("Recovered unsaved changes from swap file", timeout=30)
+                break
+            elif ch in (ord('n'), ord('N'), 27):  # N or Escape
+                self._swap.discard()
+                self._swap.reset(self.lines)  # Journal this session's edits against the file as loaded
+                self._set_status("Swap file discarded")
+                break
+        stdscr.timeout(100)
+
     def _get_file_info(self) -> str:
         """Get file metadata information"""
         try:
@@ -977,7 +1842,8 @@ class CursesEditor:
             else:
                 size_str = f"{size / (1024 * 1024):.1f}MB"
             
-            return f"[ {os.path.basename(self.filepath)} | {size_str} | Modified: {modified_time} | Lines: {len(self.lines)} ]"
+            mode_str = " | Mapped" if self.large_file else ""
+            return f"[ {os.path.basename(self.filepath)} | {size_str} | Modified: {modified_time} | Lines: {len(self.lines)}{mode_str} ]"
         except Exception as e:
             return f"[ Error getting file info: {str(e)} ]"
         
@@ -1152,6 +2018,12 @@ class CursesEditor:
         # Clear redo stack when new action is performed
         self.redo_stack.clear()
 
+    def _swap_lines(self, changes: dict):
+        """Exchange {row: text} with the buffer's rows in place, so the same dict undoes and redoes"""
+        for y, text in changes.items():
+            changes[y] = self.lines[y]
+            self.lines[y] = text
+
     def _undo(self):
         """Undo last action"""
         if not self.undo_stack:
@@ -1246,17 +2118,9 @@ class CursesEditor:
                 self.cursor_x = data['x']
 
             elif action_type == 'paste_multiline':
-                redo_data = {
-                    'old_lines': self.lines.copy(),
-                    'old_cursor_y': self.cursor_y,
-                    'old_cursor_x': self.cursor_x,
-                    'new_cursor_y': data['new_cursor_y'],
-                    'new_cursor_x': data['new_cursor_x'],
-                    'paste_text': data['paste_text']
-                }
-                self.redo_stack.append(('paste_multiline', redo_data))
+                self.redo_stack.append(('paste_multiline', data))
                 
-                self.lines = data['old_lines'].copy()
+                self.lines[data['y']:data['y'] + len(data['after'])] = data['before']
                 self.cursor_y = data['old_cursor_y']
                 self.cursor_x = data['old_cursor_x']
             
@@ -1293,16 +2157,9 @@ class CursesEditor:
                 self.cursor_x = data['x']
             
             elif action_type == 'replace_all':
-                # Undo replace all
-                redo_data = {
-                    'old_lines': self.lines.copy(),
-                    'search_term': data['search_term'],
-                    'replace_text': data['replace_text'],
-                    'count': data['count']
-                }
-                self.redo_stack.append(('replace_all', redo_data))
-                
-                self.lines = data['old_lines'].copy()
+                # Undo replace all; afterwards data holds the replaced lines for redo
+                self._swap_lines(data['changes'])
+                self.redo_stack.append(('replace_all', data))
             
             self._clear_selection()
             self._set_status("Undo")
@@ -1406,22 +2263,11 @@ class CursesEditor:
                 }))
 
             elif action_type == 'paste_multiline':
-                old_lines_state = self.lines.copy()
-                old_cursor_y_state = self.cursor_y
-                old_cursor_x_state = self.cursor_x
-                
-                self.lines = data['old_lines'].copy()
+                self.lines[data['y']:data['y'] + len(data['before'])] = data['after']
                 self.cursor_y = data['new_cursor_y']
                 self.cursor_x = data['new_cursor_x']
                 
-                self.undo_stack.append(('paste_multiline', {
-                    'old_lines': old_lines_state,
-                    'old_cursor_y': old_cursor_y_state,
-                    'old_cursor_x': old_cursor_x_state,
-                    'new_cursor_y': data['new_cursor_y'],
-                    'new_cursor_x': data['new_cursor_x'],
-                    'paste_text': data['paste_text']
-                }))
+                self.undo_stack.append(('paste_multiline', data))
             
             elif action_type == 'delete_selection':
                 start_y, start_x = data['start']
@@ -1464,17 +2310,9 @@ class CursesEditor:
                 self.cursor_x = data['x']
             
             elif action_type == 'replace_all':
-                # Redo replace all
-                old_lines_state = self.lines.copy()
-                
-                self.lines = data['old_lines'].copy()
-                
-                self.undo_stack.append(('replace_all', {
-                    'old_lines': old_lines_state,
-                    'search_term': data['search_term'],
-                    'replace_text': data['replace_text'],
-                    'count': data['count']
-                }))
+                # Redo replace all; afterwards data holds the original lines again
+                self._swap_lines(data['changes'])
+                self.undo_stack.append(('replace_all', data))
             
             self._clear_selection()
             self._set_status("Redo")
@@ -1717,6 +2555,19 @@ class CursesEditor:
         # PADDING: Reserve 3 lines at bottom
         text_height = height - 4
         
+        # Large files only decode the viewport plus a margin
+        if self.large_file:
+            self.lines.prefetch(self.offset_y - self.LARGE_FILE_MARGIN,
+                                self.offset_y + text_height + self.LARGE_FILE_MARGIN)
+        
+        # Syntax spans for the visible lines
+        window_spans = None
+        if self._highlight is not None:
+            if self.large_file:
+                window_spans = self._highlight.window_spans(self.lines, self.offset_y, self.offset_y + text_height)
+            else:
+                self._highlight.sync(self.lines)
+        
         for i in range(text_height):
             line_num = i + self.offset_y
             if line_num < len(self.lines):
@@ -1771,6 +2622,16 @@ class CursesEditor:
                     else:
                         # No selection at all
                         stdscr.addstr(content_start_y + i, gutter_width, line[:text_width], 0)
+                    
+                    if self._highlight is not None:
+                        if window_spans is not None:
+                            spans = window_spans.get(line_num, [])
+                        else:
+                            spans = self._highlight.line_spans(self.lines, line_num)
+                        self._draw_line_syntax(stdscr, content_start_y + i, gutter_width, line_num, text_width, spans, sel_start, sel_end)
+                    
+                    if self._highlight_matches:
+                        self._draw_line_matches(stdscr, content_start_y + i, gutter_width, line_num, text_width)
                 except curses.error:
                     pass
         
@@ -1800,6 +2661,8 @@ class CursesEditor:
 
     def _confirm_exit(self, stdscr) -> bool:
         """Ask user to confirm exit if modified"""
+        # A save still in flight decides whether the buffer is clean; a failed one leaves it modified
+        saved = self._wait_for_save()
         if not self.modified:
             return True
         
@@ -1807,6 +2670,8 @@ class CursesEditor:
         status_y = height - 1
         
         prompt = " Save modified file? (Y/N/C to cancel) "
+        if not saved:
+            prompt = f" {self.status_message} - save modified file? (Y/N/C to cancel) "
         
         # Clear any buffered input first
         stdscr.nodelay(True)
@@ -1826,7 +2691,7 @@ class CursesEditor:
             ch = stdscr.getch()
             
             if ch in (ord('y'), ord('Y')):
-                if self._save_file():
+                if self._save_file(wait=True):
                     return True
                 else:
                     continue
@@ -1895,6 +2760,7 @@ class CursesEditor:
             return
         
         self.filepath = new_path
+        self._set_highlighter()
         self.was_renamed = True
         self.modified = True  # Force save to apply rename
         self._set_status(f"Will rename to '{new_name}' on save", timeout=20)
@@ -1930,7 +2796,8 @@ class CursesEditor:
             ch = stdscr.getch()
             if ch in (ord('y'), ord('Y')):
                 if self.file_existed:
-                    # File exists - delete it
+                    # File exists - delete it (after any in-flight save lands)
+                    self._wait_for_save()
                     try:
                         os.remove(self.filepath)
                         self.was_deleted = True
@@ -1953,47 +2820,173 @@ class CursesEditor:
                 stdscr.timeout(100)
                 return False
         
+    def _lower_line(self, y: int) -> str:
+        """Lowercased copy of a line, cached until that line is edited or the search ends"""
+        line = self.lines[y]
+        if self.large_file:
+            return line.lower()  # Decoded lines are transient; caching would pin the whole file
+        cached = self._lower_cache.get(y)
+        # Edits always store a new string, so an identity check invalidates per line
+        if cached is not None and cached[0] is line:
+            return cached[1]
+        lower = line.lower()
+        self._lower_cache[y] = (line, lower)
+        return lower
+
+    def _compile_search(self, search_term: str) -> bool:
+        """Prepare the active search. Returns False if the regex is invalid."""
+        try:
+            if self.search_regex_mode:
+                self._search_regex = re.compile(search_term, re.IGNORECASE)
+                self._search_lower = None
+            else:
+                self._search_regex = re.compile(re.escape(search_term), re.IGNORECASE)
+                self._search_lower = search_term.lower()
+        except re.error:
+            self._search_regex = None
+            self._search_lower = None
+            return False
+        return True
+
+    def _find_in_line(self, y: int, start: int = 0):
+        """First non-empty match in line y at or after `start`, as (x, end), or None"""
+        line = self.lines[y]
+        if self._search_lower is not None:
+            lower = self._lower_line(y)
+            # Some characters change length when lowercased; let the regex handle those lines
+            if len(lower) == len(line):
+                pos = lower.find(self._search_lower, start)
+                return (pos, pos + len(self._search_lower)) if pos >= 0 else None
+        for match in self._search_regex.finditer(line, start):
+            if match.end() > match.start():
+                return match.start(), match.end()
+        return None
+
+    def _find_next(self, start_y: int, start_x: int):
+        """Find the next match from (start_y, start_x), wrapping to the top. Returns (y, x, end) or None."""
+        total = len(self.lines)
+        for y in range(start_y, total):
+            found = self._find_in_line(y, start_x if y == start_y else 0)
+            if found:
+                return (y,) + found
+        for y in range(0, min(start_y + 1, total)):
+            found = self._find_in_line(y)
+            if found:
+                return (y,) + found
+        return None
+
+    # Token kind -> (color pair, extra attributes)
+    SYNTAX_COLORS = {
+        'keyword': (5, curses.A_BOLD),
+        'command': (5, curses.A_BOLD),
+        'heading': (5, curses.A_BOLD),
+        'string': (6, 0),
+        'number': (7, 0),
+        'key': (7, 0),
+        'variable': (7, curses.A_BOLD),
+        'decorator': (8, 0),
+        'link': (8, curses.A_UNDERLINE),
+        'emphasis': (0, curses.A_BOLD),
+        'comment': (4, 0),
+        'text': (0, 0),
+    }
+
+    def _set_highlighter(self):
+        """Pick a highlighter from the file extension (also called after a rename)"""
+        highlighter = SyntaxHighlighter.for_path(self.filepath)
+        if highlighter is None:
+            self._highlight = None
+        elif self._highlight is None or type(self._highlight.highlighter) is not type(highlighter):
+            self._highlight = HighlightCache(highlighter)
+
+    def _draw_line_syntax(self, stdscr, screen_y: int, gutter_width: int, line_num: int, text_width: int,
+                          spans, sel_start, sel_end):
+        """Color the token spans of a drawn line, leaving the selection in reverse video"""
+        # Columns of this line covered by the selection
+        sel_from = sel_to = 0
+        if sel_start and sel_end and sel_start[0] <= line_num <= sel_end[0]:
+            sel_from = sel_start[1] if line_num == sel_start[0] else 0
+            sel_to = sel_end[1] if line_num == sel_end[0] else len(self.lines[line_num])
+        
+        for start, end, kind in spans:
+            pair, attr = self.SYNTAX_COLORS.get(kind, (0, 0))
+            attr |= curses.color_pair(pair)
+            # Split around the selection
+            for piece_start, piece_end in ((start, min(end, sel_from)), (max(start, sel_to), end)):
+                vis_start = max(piece_start, self.offset_x)
+                vis_end = min(piece_end, self.offset_x + text_width)
+                if vis_end > vis_start:
+                    stdscr.chgat(screen_y, gutter_width + vis_start - self.offset_x, vis_end - vis_start, attr)
+
+    def _draw_line_matches(self, stdscr, screen_y: int, gutter_width: int, line_num: int, text_width: int):
+        """Highlight every match on a visible line (the selected match keeps its reverse video)"""
+        if self._search_regex is None:
+            return
+        sel_start, _ = self._get_selection_bounds()
+        line = self.lines[line_num]
+        for match in self._search_regex.finditer(line):
+            x, end = match.start(), match.end()
+            if end == x or (sel_start and sel_start == (line_num, x)):
+                continue
+            vis_start = max(x, self.offset_x)
+            vis_end = min(end, self.offset_x + text_width)
+            if vis_end > vis_start:
+                stdscr.chgat(screen_y, gutter_width + vis_start - self.offset_x,
+                             vis_end - vis_start, curses.color_pair(3))
+
     def _search(self, stdscr):
-        """Search for text in the file with proper magenta background and replace option"""
+        """Incremental search (plain or regex) with match highlighting and replace option"""
+        self._highlight_matches = True
+        try:
+            self._search_and_replace(stdscr)
+        finally:
+            self._highlight_matches = False
+            self._search_regex = None
+            self._search_lower = None
+            self._lower_cache = {}  # Only worth keeping while the term is being typed
+
+    def _search_and_replace(self, stdscr):
+        """Prompt for a search term, jumping to matches as it is typed, then offer to replace"""
         height, width = stdscr.getmaxyx()
         status_y = height - 2
 
         # FORCE OVERWRITE bottom bar with help text BEFORE prompting
         self._force_clear_help_bar(stdscr)
-
-        prompt = " Search: "
         
         # CRITICAL: Reset colors explicitly before drawing search bar
         stdscr.bkgdset(' ', 0)
         stdscr.attrset(0)
         
-        # Draw prompt with magenta background
-        try:
-            stdscr.attron(curses.color_pair(3))
-            stdscr.addstr(status_y, 0, prompt.ljust(width)[:width])
-            stdscr.attroff(curses.color_pair(3))
-            stdscr.move(status_y, len(prompt))
-            stdscr.refresh()
-        except curses.error:
-            pass
-
+        # Remember where the search started so Escape can put everything back
+        origin = (self.cursor_y, self.cursor_x, self.offset_y, self.offset_x,
+                  self.selection_start, self.selection_end)
+        
+        def restore_origin():
+            (self.cursor_y, self.cursor_x, self.offset_y, self.offset_x,
+             self.selection_start, self.selection_end) = origin
+        
         # Manual input handling to preserve color
         search_term = ""
-        cursor_pos = len(prompt)
+        found = None
+        valid = True
         
         stdscr.timeout(-1)  # Blocking mode for input
         
         while True:
             try:
+                prompt = " Regex: " if self.search_regex_mode else " Search: "
+                suffix = "  (invalid pattern)" if not valid else ("  (not found)" if search_term and not found else "")
+                
                 # Redraw the line with current input
-                display_line = prompt + search_term
+                display_line = prompt + search_term + suffix
                 stdscr.attron(curses.color_pair(3))
                 stdscr.addstr(status_y, 0, display_line.ljust(width)[:width])
                 stdscr.attroff(curses.color_pair(3))
-                stdscr.move(status_y, cursor_pos)
+                stdscr.move(status_y, min(len(prompt) + len(search_term), width - 1))
                 stdscr.refresh()
                 
                 ch = stdscr.getch()
+                search_from = (origin[0], origin[1])
                 
                 if ch in (ord('\n'), ord('\r'), curses.KEY_ENTER, 10, 13):  # Enter
                     break
@@ -2001,50 +2994,57 @@ class CursesEditor:
                     search_term = ""
                     break
                 elif ch in (curses.KEY_BACKSPACE, 127, 8):  # Backspace
-                    if search_term:
-                        search_term = search_term[:-1]
-                        cursor_pos -= 1
+                    if not search_term:
+                        continue
+                    search_term = search_term[:-1]
+                elif ch == 18:  # Ctrl+R - toggle regex mode
+                    self.search_regex_mode = not self.search_regex_mode
+                elif ch == 6:  # Ctrl+F - jump to the next match
+                    if not found:
+                        continue
+                    search_from = (found[0], found[1] + 1)
                 elif 32 <= ch <= 126:  # Printable characters
                     search_term += chr(ch)
-                    cursor_pos += 1
+                else:
+                    continue
+                
+                # Jump to the first match for the term as typed so far
+                found = None
+                valid = self._compile_search(search_term) if search_term else True
+                if search_term and valid:
+                    found = self._find_next(*search_from)
+                
+                if found:
+                    found_y, found_x, found_end = found
+                    self.cursor_y, self.cursor_x = found_y, found_end
+                    self.selection_start = (found_y, found_x)
+                    self.selection_end = (found_y, found_end)
+                    self.selecting = False
+                else:
+                    restore_origin()
+                
+                self._adjust_scroll(height, width)
+                self._draw_screen(stdscr)
             except Exception:
                 break
         
         stdscr.timeout(100)  # Restore non-blocking mode
 
         if not search_term:
+            restore_origin()
             self._set_status("Search cancelled")
             return
-
-        # Perform search
-        found = False
-        found_y, found_x = -1, -1
-        start_y, start_x = self.cursor_y, self.cursor_x + 1
         
-        for y in range(start_y, len(self.lines)):
-            pos = self.lines[y].lower().find(search_term.lower(), start_x if y == start_y else 0)
-            if pos >= 0:
-                found_y, found_x = y, pos
-                found = True
-                break
-
-        if not found:
-            for y in range(0, start_y + 1):
-                pos = self.lines[y].lower().find(search_term.lower())
-                if pos >= 0:
-                    found_y, found_x = y, pos
-                    found = True
-                    break
+        if not valid:
+            restore_origin()
+            self._set_status(f"Invalid pattern: {search_term}")
+            return
 
         if not found:
             self._set_status(f"Not found: {search_term}")
             return
         
-        # Found the search term - move cursor to END of selection and select it
-        self.cursor_y, self.cursor_x = found_y, found_x + len(search_term)
-        self.selection_start = (found_y, found_x)
-        self.selection_end = (found_y, found_x + len(search_term))
-        self.selecting = False
+        found_y, found_x, found_end = found
         self._set_status(f"Found: {search_term}")
         
         # Redraw to show the found position
@@ -2133,32 +3133,41 @@ class CursesEditor:
         while True:
             replace_all_choice = stdscr.getch()
             if replace_all_choice in (ord('y'), ord('Y')):
-                # Replace all occurrences
+                # Replace all occurrences in one pass over the buffer
                 count = 0
                 
-                # Save undo state BEFORE replacing all
-                old_lines = self.lines.copy()
+                # Undo keeps only the lines that change: {row: original text}
+                changes = {}
                 
-                for y in range(len(self.lines)):
-                    line = self.lines[y]
-                    new_line = ""
-                    search_lower = search_term.lower()
-                    i = 0
-                    
-                    while i < len(line):
-                        if i + len(search_term) <= len(line) and line[i:i+len(search_term)].lower() == search_lower:
-                            new_line += replace_text
-                            i += len(search_term)
-                            count += 1
-                        else:
-                            new_line += line[i]
-                            i += 1
-                    
-                    self.lines[y] = new_line
+                # Plain text is inserted literally; regex mode allows \1-style group references
+                replacement = replace_text if self.search_regex_mode else (lambda m: replace_text)
+                
+                try:
+                    for y in range(len(self.lines)):
+                        # The cached lowercase line rules out most lines without touching the regex
+                        if self._search_lower is not None:
+                            lower = self._lower_line(y)
+                            if len(lower) == len(self.lines[y]) and self._search_lower not in lower:
+                                continue
+                        new_line, replaced = self._search_regex.subn(replacement, self.lines[y])
+                        if replaced:
+                            changes[y] = self.lines[y]
+                            self.lines[y] = new_line
+                            count += replaced
+                except re.error as e:
+                    self._swap_lines(changes)
+                    self._set_status(f"Invalid replacement: {e}")
+                    stdscr.timeout(100)
+                    break
+                
+                if count == 0:
+                    self._set_status("Replaced 0 occurrence(s)")
+                    stdscr.timeout(100)
+                    break
                 
                 # Save undo state for replace all
                 self._save_undo_state('replace_all', {
-                    'old_lines': old_lines,
+                    'changes': changes,
                     'search_term': search_term,
                     'replace_text': replace_text,
                     'count': count
@@ -2174,6 +3183,16 @@ class CursesEditor:
                 line = self.lines[found_y]
                 old_line = line
                 
+                if self.search_regex_mode:
+                    try:
+                        new_text = self._search_regex.match(line, found_x).expand(replace_text)
+                    except re.error as e:
+                        self._set_status(f"Invalid replacement: {e}")
+                        stdscr.timeout(100)
+                        break
+                else:
+                    new_text = replace_text
+                
                 # Save undo state BEFORE replacing single
                 self._save_undo_state('replace_single', {
                     'y': found_y,
@@ -2183,13 +3202,13 @@ class CursesEditor:
                     'replace_text': replace_text
                 })
                 
-                self.lines[found_y] = line[:found_x] + replace_text + line[found_x + len(search_term):]
+                self.lines[found_y] = line[:found_x] + new_text + line[found_end:]
                 self.modified = True
                 
                 # Select the replacement text
                 self.cursor_x = found_x
                 self.selection_start = (found_y, found_x)
-                self.selection_end = (found_y, found_x + len(replace_text))
+                self.selection_end = (found_y, found_x + len(new_text))
                 self.selecting = False
                 self._set_status("Replaced 1 occurrence")
                 stdscr.timeout(100)
@@ -2206,7 +3225,7 @@ class CursesEditor:
         # Setup curses
         curses.curs_set(1)  # Show cursor
         stdscr.keypad(True)  # Enable keypad for arrow keys
-        stdscr.timeout(100)  # Non-blocking getch with 100ms timeout
+        stdscr.timeout(-1)  # Block on input; _run_loop only sets a timeout for timed redraws
         
         # Initialize colors AFTER reset
         curses.start_color()
@@ -2219,325 +3238,373 @@ class CursesEditor:
 
         curses.init_pair(4, curses.COLOR_BLUE, -1)  # BLUE for line numbers
         
+        # Syntax highlighting colors
+        curses.init_pair(5, curses.COLOR_YELLOW, -1)
+        curses.init_pair(6, curses.COLOR_GREEN, -1)
+        curses.init_pair(7, curses.COLOR_CYAN, -1)
+        curses.init_pair(8, curses.COLOR_MAGENTA, -1)
+        
+        if self._pending_recovery is not None:
+            self._offer_recovery(stdscr)
+        
+        try:
+            self._run_loop(stdscr)
+        except BaseException:
+            # Leave the swap file behind so the edits can be recovered next time
+            self._close_session(keep_swap=True)
+            raise
+        # A buffer switched away from stays open, so its journal stays too
+        self._close_session(keep_swap=self.switch_to is not None)
+
+    def _paste_text(self, paste_text: str):
+        """Insert text at the cursor as a single undoable edit (clipboard paste or typed-ahead input)"""
+        if self.selection_start is not None:
+            self._delete_selection()
+        
+        if not self.lines:
+            self.lines = ['']
+        
+        if self.cursor_y >= len(self.lines):
+            self.cursor_y = len(self.lines) - 1
+        if self.cursor_x > len(self.lines[self.cursor_y]):
+            self.cursor_x = len(self.lines[self.cursor_y])
+        
+        # Multi-line paste with proper undo support
+        if '\n' in paste_text:
+            paste_lines = paste_text.split('\n')
+            current_line = self.lines[self.cursor_y]
+            
+            old_cursor_y = self.cursor_y
+            old_cursor_x = self.cursor_x
+            
+            line_before = current_line[:self.cursor_x]
+            line_after = current_line[self.cursor_x:]
+            
+            # Splice all pasted lines in with one slice assignment
+            new_rows = [line_before + paste_lines[0]] + paste_lines[1:-1] + [paste_lines[-1] + line_after]
+            self.lines[self.cursor_y:self.cursor_y + 1] = new_rows
+            self.cursor_y += len(paste_lines) - 1
+            self.cursor_x = len(paste_lines[-1])
+            
+            # Undo keeps just the replaced row range, never a copy of the whole buffer
+            self._save_undo_state('paste_multiline', {
+                'y': old_cursor_y,
+                'before': [current_line],
+                'after': new_rows,
+                'old_cursor_y': old_cursor_y,
+                'old_cursor_x': old_cursor_x,
+                'new_cursor_y': self.cursor_y,
+                'new_cursor_x': self.cursor_x,
+                'paste_text': paste_text
+            })
+        else:
+            # Single-line paste
+            line = self.lines[self.cursor_y]
+            old_line = line
+            
+            self._save_undo_state('paste', {
+                'y': self.cursor_y,
+                'x': self.cursor_x,
+                'text': paste_text,
+                'old_line': old_line
+            })
+            
+            new_line = line[:self.cursor_x] + paste_text + line[self.cursor_x:]
+            self.lines[self.cursor_y] = new_line
+            self.cursor_x += len(paste_text)
+        
+        self.modified = True
+        self._ensure_valid_cursor()
+
+    def _run_loop(self, stdscr):
+        """Process input until the editor is closed"""
+        self._status_tick = time.monotonic()
+        
         while True:
             height, width = stdscr.getmaxyx()
             
+            # Pick up a finished background save and journal unsaved edits
+            self._poll_save()
+            self._checkpoint_swap()
+            
             # Adjust scroll to keep cursor visible
             self._adjust_scroll(height, width)
             
             # Draw screen
             self._draw_screen(stdscr)
             
-            # Decrement status timeout
-            if self.status_timeout > 0:
-                self.status_timeout -= 1
-                if self.status_timeout == 0:
-                    self.status_message = ""
-            
-            # Get input
+            # Block until a key arrives or a timed redraw (clock, status expiry) is due
+            stdscr.timeout(self._next_wakeup_ms())
             ch = stdscr.getch()
+            self._expire_status()
             
-            if ch == -1:  # Timeout, no input
+            if ch == -1:  # Timer fired, no input
                 continue
             
-            # Get the key name for more reliable shift detection
-            try:
-                keyname = curses.keyname(ch).decode()
-            except Exception:
-                keyname = ''
+            # Text typed ahead of the redraw (such as a terminal paste) becomes one edit
+            if ch == 10 or 32 <= ch <= 126:
+                text = self._read_typed_text(stdscr, ch)
+                if len(text) > 1:
+                    self._paste_text(text)
+                    self._swap_dirty = True
+                    continue
             
-            # Helper functions for shift key detection
-            def is_shift_up():
-                return keyname in ('KEY_SUP', 'KEY_SR', 'kUP5', 'kUP6') or ch in (547, 337, 563)
+            if not self._handle_key(stdscr, ch):
+                break
+            self._swap_dirty = True
 
-            def is_shift_down():
-                return keyname in ('KEY_SDOWN', 'KEY_SF', 'kDN5', 'kDN6') or ch in (548, 336, 522)
+    def _next_wakeup_ms(self) -> int:
+        """Milliseconds until the next redraw that is not triggered by a key (-1 to block)"""
+        now = time.time()
+        
+        # The title bar clock changes on the minute
+        delays = [60 - now % 60]
+        if self.status_message and self.status_timeout > 0:
+            delays.append(self.status_timeout * 0.1 - (time.monotonic() - self._status_tick))
+        if self._swap is not None and self._swap_dirty and self.modified:
+            delays.append(self._last_checkpoint + self.SWAP_INTERVAL - now)
+        if self._save_thread is not None:
+            delays.append(0.05)
+        return max(10, int(min(delays) * 1000))
+
+    def _expire_status(self):
+        """Count down status_timeout (in 100 ms ticks) by the wall-clock time that has passed"""
+        now = time.monotonic()
+        ticks = int((now - self._status_tick) * 10)
+        if ticks <= 0:
+            return
+        self._status_tick += ticks * 0.1
+        if self.status_timeout > 0:
+            self.status_timeout = max(0, self.status_timeout - ticks)
+            if self.status_timeout == 0:
+                self.status_message = ""
+
+    def _read_typed_text(self, stdscr, ch: int) -> str:
+        """Collect printable keys and newlines already waiting in the input buffer"""
+        chars = ['\n' if ch == 10 else chr(ch)]
+        stdscr.timeout(0)
+        while True:
+            next_ch = stdscr.getch()
+            if next_ch == -1:
+                break
+            if not (next_ch == 10 or 32 <= next_ch <= 126):
+                curses.ungetch(next_ch)  # Leave other keys for the main loop
+                break
+            chars.append('\n' if next_ch == 10 else chr(next_ch))
+        return ''.join(chars)
 
-            def is_shift_left():
-                return keyname in ('KEY_SLEFT', 'kLFT5', 'kLFT6') or ch in (391, 393, 545)
+    def _key_action(self, ch: int):
+        """Map a key code to a navigation action name using KEY_ALIASES (None for other keys)"""
+        try:
+            keyname = curses.keyname(ch).decode()
+        except Exception:
+            keyname = ''
+        for action, names, codes in self.KEY_ALIASES:
+            if keyname in names or ch in codes:
+                return action
+        return None
 
-            def is_shift_right():
-                return keyname in ('KEY_SRIGHT', 'kRIT5', 'kRIT6') or ch in (400, 402, 546)
-            
-            # Helper functions for numpad keys (standard + numpad codes)
-            def is_up_arrow():
-                return keyname in ('KEY_UP', 'KEY_A2') or ch in (curses.KEY_UP, 259, 450)
-            
-            def is_down_arrow():
-                return keyname in ('KEY_DOWN', 'KEY_C2') or ch in (curses.KEY_DOWN, 258, 456)
-            
-            def is_left_arrow():
-                return keyname in ('KEY_LEFT', 'KEY_B1') or ch in (curses.KEY_LEFT, 260, 452)
-            
-            def is_right_arrow():
-                return keyname in ('KEY_RIGHT', 'KEY_B3') or ch in (curses.KEY_RIGHT, 261, 454)
+    def _handle_key(self, stdscr, ch: int) -> bool:
+        """Apply a single key. Returns False when the editor should close."""
+        action = self._key_action(ch)
+        
+        # Check shift+arrow keys FIRST
+        if action == 'shift_up':
+            if not self.selecting:
+                self.selection_start = (self.cursor_y, self.cursor_x)
+                self.selecting = True
             
-            def is_home():
-                return keyname in ('KEY_HOME', 'KEY_A1') or ch in (curses.KEY_HOME, 262, 449)
+            if self.cursor_y > 0:
+                self.cursor_y -= 1
+                self.cursor_x = min(self.cursor_x, len(self.lines[self.cursor_y]))
+            else:
+                # No line above - extend selection to beginning of current line
+                self.cursor_x = 0
             
-            def is_end():
-                return keyname in ('KEY_END', 'KEY_C1') or ch in (curses.KEY_END, 358, 455)
+            self.selection_end = (self.cursor_y, self.cursor_x)
+        
+        elif action == 'shift_down':
+            if not self.selecting:
+                self.selection_start = (self.cursor_y, self.cursor_x)
+                self.selecting = True
             
-            def is_pgup():
-                return keyname in ('KEY_PPAGE', 'KEY_A3') or ch in (curses.KEY_PPAGE, 339, 451)
+            if self.cursor_y < len(self.lines) - 1:
+                self.cursor_y += 1
+                self.cursor_x = min(self.cursor_x, len(self.lines[self.cursor_y]))
+            else:
+                # No line below - extend selection to end of current line
+                self.cursor_x = len(self.lines[self.cursor_y])
             
-            def is_pgdn():
-                return keyname in ('KEY_NPAGE', 'KEY_C3') or ch in (curses.KEY_NPAGE, 338, 457)
+            self.selection_end = (self.cursor_y, self.cursor_x)
+        
+        elif action == 'shift_left':
+            if not self.selecting:
+                self.selection_start = (self.cursor_y, self.cursor_x)
+                self.selecting = True
             
-            # Check shift+arrow keys FIRST
-            if is_shift_up():
-                if not self.selecting:
-                    self.selection_start = (self.cursor_y, self.cursor_x)
-                    self.selecting = True
-                
-                if self.cursor_y > 0:
-                    self.cursor_y -= 1
-                    self.cursor_x = min(self.cursor_x, len(self.lines[self.cursor_y]))
-                else:
-                    # No line above - extend selection to beginning of current line
-                    self.cursor_x = 0
-                
-                self.selection_end = (self.cursor_y, self.cursor_x)
+            if self.cursor_x > 0:
+                self.cursor_x -= 1
+            elif self.cursor_y > 0:
+                self.cursor_y -= 1
+                self.cursor_x = len(self.lines[self.cursor_y])
             
-            elif is_shift_down():
-                if not self.selecting:
-                    self.selection_start = (self.cursor_y, self.cursor_x)
-                    self.selecting = True
-                
-                if self.cursor_y < len(self.lines) - 1:
-                    self.cursor_y += 1
-                    self.cursor_x = min(self.cursor_x, len(self.lines[self.cursor_y]))
-                else:
-                    # No line below - extend selection to end of current line
-                    self.cursor_x = len(self.lines[self.cursor_y])
-                
-                self.selection_end = (self.cursor_y, self.cursor_x)
-            
-            elif is_shift_left():
-                if not self.selecting:
-                    self.selection_start = (self.cursor_y, self.cursor_x)
-                    self.selecting = True
-                
-                if self.cursor_x > 0:
-                    self.cursor_x -= 1
-                elif self.cursor_y > 0:
-                    self.cursor_y -= 1
-                    self.cursor_x = len(self.lines[self.cursor_y])
-                
-                self.selection_end = (self.cursor_y, self.cursor_x)
-            
-            elif is_shift_right():
-                if not self.selecting:
-                    self.selection_start = (self.cursor_y, self.cursor_x)
-                    self.selecting = True
-                
-                if self.cursor_x < len(self.lines[self.cursor_y]):
-                    self.cursor_x += 1
-                elif self.cursor_y < len(self.lines) - 1:
-                    self.cursor_y += 1
-                    self.cursor_x = 0
-                
-                self.selection_end = (self.cursor_y, self.cursor_x)
-            
-            # Regular arrow keys (without shift) - use helper functions with selection handling
-            elif is_up_arrow():
-                if self.selection_start is not None:
-                    self._handle_arrow_with_selection('up')
-                elif self.cursor_y > 0:
-                    self.cursor_y -= 1
-                    self.cursor_x = min(self.cursor_x, len(self.lines[self.cursor_y]))
-            
-            elif is_down_arrow():
-                if self.selection_start is not None:
-                    self._handle_arrow_with_selection('down')
-                elif self.cursor_y < len(self.lines) - 1:
-                    self.cursor_y += 1
-                    self.cursor_x = min(self.cursor_x, len(self.lines[self.cursor_y]))
-            
-            elif is_left_arrow():
-                if self.selection_start is not None:
-                    self._handle_arrow_with_selection('left')
-                elif self.cursor_x > 0:
-                    self.cursor_x -= 1
-                elif self.cursor_y > 0:
-                    self.cursor_y -= 1
-                    self.cursor_x = len(self.lines[self.cursor_y])
-            
-            elif is_right_arrow():
-                if self.selection_start is not None:
-                    self._handle_arrow_with_selection('right')
-                elif self.cursor_x < len(self.lines[self.cursor_y]):
-                    self.cursor_x += 1
-                elif self.cursor_y < len(self.lines) - 1:
-                    self.cursor_y += 1
-                    self.cursor_x = 0
+            self.selection_end = (self.cursor_y, self.cursor_x)
+        
+        elif action == 'shift_right':
+            if not self.selecting:
+                self.selection_start = (self.cursor_y, self.cursor_x)
+                self.selecting = True
             
-            elif ch == 27:  # Escape
-                if self._confirm_exit(stdscr):
-                    break
+            if self.cursor_x < len(self.lines[self.cursor_y]):
+                self.cursor_x += 1
+            elif self.cursor_y < len(self.lines) - 1:
+                self.cursor_y += 1
+                self.cursor_x = 0
             
-            elif ch == 24:  # Ctrl+X - Cut
-                if self.selection_start is not None:
-                    selected_text = self._get_selected_text()
-                    self.clipboard = [selected_text]
-                    self._delete_selection()
-                    self._set_status("Selection cut to clipboard")
-                else:
-                    self._set_status("No selection to cut")
-                self._ensure_valid_cursor()
+            self.selection_end = (self.cursor_y, self.cursor_x)
+        
+        # Regular arrow keys (without shift) with selection handling
+        elif action == 'up':
+            if self.selection_start is not None:
+                self._handle_arrow_with_selection('up')
+            elif self.cursor_y > 0:
+                self.cursor_y -= 1
+                self.cursor_x = min(self.cursor_x, len(self.lines[self.cursor_y]))
+        
+        elif action == 'down':
+            if self.selection_start is not None:
+                self._handle_arrow_with_selection('down')
+            elif self.cursor_y < len(self.lines) - 1:
+                self.cursor_y += 1
+                self.cursor_x = min(self.cursor_x, len(self.lines[self.cursor_y]))
+        
+        elif action == 'left':
+            if self.selection_start is not None:
+                self._handle_arrow_with_selection('left')
+            elif self.cursor_x > 0:
+                self.cursor_x -= 1
+            elif self.cursor_y > 0:
+                self.cursor_y -= 1
+                self.cursor_x = len(self.lines[self.cursor_y])
+        
+        elif action == 'right':
+            if self.selection_start is not None:
+                self._handle_arrow_with_selection('right')
+            elif self.cursor_x < len(self.lines[self.cursor_y]):
+                self.cursor_x += 1
+            elif self.cursor_y < len(self.lines) - 1:
+                self.cursor_y += 1
+                self.cursor_x = 0
+        
+        elif ch == 27:  # Escape
+            if self._confirm_exit(stdscr):
+                return False
+        
+        elif ch == 24:  # Ctrl+X - Cut
+            if self.selection_start is not None:
+                selected_text = self._get_selected_text()
+                self.clipboard = [selected_text]
+                self._delete_selection()
+                self._set_status("Selection cut to clipboard")
+            else:
+                self._set_status("No selection to cut")
+            self._ensure_valid_cursor()
 
-            elif ch == 3:  # Ctrl+C
-                continue
-            
-            elif ch == 1:  # Ctrl+A - Select All (NO STATUS MESSAGES)
-                if self.lines:
-                    # Check if we just used Ctrl+A (simple toggle)
-                    if (self.selection_start == (0, 0) and 
-                        self.selection_end == (len(self.lines) - 1, len(self.lines[-1]))):
-                        # Already selected all - deselect
-                        self._clear_selection()
-                        # NO STATUS MESSAGE
-                    else:
-                        # Select all text
-                        self.selection_start = (0, 0)
-                        last_line_idx = len(self.lines) - 1
-                        self.selection_end = (last_line_idx, len(self.lines[last_line_idx]))
-                        self.selecting = False
-                        # Jump cursor to end of selection
-                        self.cursor_y = last_line_idx
-                        self.cursor_x = len(self.lines[last_line_idx])
-                        # NO STATUS MESSAGE
-
-            elif ch == 26:  # Ctrl+Z - Undo
-                self._undo()
-            
-            elif ch == 25:  # Ctrl+Y - Redo
-                self._redo()
-            
-            elif ch == 15:  # Ctrl+O - Copy
-                if self.selection_start is not None:
-                    selected_text = self._get_selected_text()
-                    if selected_text:
-                        self.clipboard = [selected_text]
-                        self._set_status("Selection copied to clipboard")
+        elif ch == 3:  # Ctrl+C
+            pass
+        
+        elif ch == 1:  # Ctrl+A - Select All (NO STATUS MESSAGES)
+            if self.lines:
+                # Check if we just used Ctrl+A (simple toggle)
+                if (self.selection_start == (0, 0) and 
+                    self.selection_end == (len(self.lines) - 1, len(self.lines[-1]))):
+                    # Already selected all - deselect
                     self._clear_selection()
+                    # NO STATUS MESSAGE
                 else:
-                    self._set_status("No selection to copy")
-                self._ensure_valid_cursor()
-
-            elif ch == 16:  # Ctrl+P - Paste
-                if self.clipboard:
-                    if self.selection_start is not None:
-                        self._delete_selection()
-                    
-                    if not self.lines:
-                        self.lines = ['']
-                    
-                    if self.cursor_y >= len(self.lines):
-                        self.cursor_y = len(self.lines) - 1
-                    if self.cursor_x > len(self.lines[self.cursor_y]):
-                        self.cursor_x = len(self.lines[self.cursor_y])
-                    
-                    paste_text = self.clipboard[0]
-                    
-                    # Multi-line paste with proper undo support
-                    if '\n' in paste_text:
-                        paste_lines = paste_text.split('\n')
-                        current_line = self.lines[self.cursor_y]
-                        
-                        # Save COMPLETE state for undo
-                        old_lines = self.lines.copy()
-                        old_cursor_y = self.cursor_y
-                        old_cursor_x = self.cursor_x
-                        
-                        line_before = current_line[:self.cursor_x]
-                        line_after = current_line[self.cursor_x:]
-                        
-                        self.lines[self.cursor_y] = line_before + paste_lines[0]
-                        
-                        for i, paste_line in enumerate(paste_lines[1:-1], start=1):
-                            self.lines.insert(self.cursor_y + i, paste_line)
-                        
-                        if len(paste_lines) > 1:
-                            self.lines.insert(self.cursor_y + len(paste_lines) - 1, 
-                                            paste_lines[-1] + line_after)
-                            self.cursor_y += len(paste_lines) - 1
-                            self.cursor_x = len(paste_lines[-1])
-                        else:
-                            self.cursor_x += len(paste_lines[0])
-                        
-                        # Save complete undo state for multi-line paste
-                        self._save_undo_state('paste_multiline', {
-                            'old_lines': old_lines,
-                            'old_cursor_y': old_cursor_y,
-                            'old_cursor_x': old_cursor_x,
-                            'new_cursor_y': self.cursor_y,
-                            'new_cursor_x': self.cursor_x,
-                            'paste_text': paste_text
-                        })
-                    else:
-                        # Single-line paste
-                        line = self.lines[self.cursor_y]
-                        old_line = line
-                        
-                        self._save_undo_state('paste', {
-                            'y': self.cursor_y,
-                            'x': self.cursor_x,
-                            'text': paste_text,
-                            'old_line': old_line
-                        })
-                        
-                        new_line = line[:self.cursor_x] + paste_text + line[self.cursor_x:]
-                        self.lines[self.cursor_y] = new_line
-                        self.cursor_x += len(paste_text)
-                    
-                    self._set_status("Pasted from clipboard")
-                    self.modified = True
-                    self._ensure_valid_cursor()
-            
-            elif ch == 19:  # Ctrl+S - Save
-                self._save_file()
-            
-            elif ch == 6:  # Ctrl+F - Search
-                self._search(stdscr)
-            
-            elif ch == 9:  # Ctrl+I - Info
-                info = self._get_file_info()
-                self._set_status(info, timeout=30)
-            
-            elif ch == 18:  # Ctrl+R - Rename
-                self._rename_file(stdscr)
-            
-            elif ch == 4:  # Ctrl+D - Delete
-                if self._delete_file(stdscr):
-                    break  # Exit editor after deleting file
-            
-            elif is_home():
-                self.cursor_x = 0
-                self._clear_selection()
-            
-            elif is_end():
-                self.cursor_x = len(self.lines[self.cursor_y])
-                self._clear_selection()
-            
-            elif is_pgup():  # Page Up
-                self._move_cursor(-10, 0)
-                self._clear_selection()
-            
-            elif is_pgdn():  # Page Down
-                self._move_cursor(10, 0)
+                    # Select all text
+                    self.selection_start = (0, 0)
+                    last_line_idx = len(self.lines) - 1
+                    self.selection_end = (last_line_idx, len(self.lines[last_line_idx]))
+                    self.selecting = False
+                    # Jump cursor to end of selection
+                    self.cursor_y = last_line_idx
+                    self.cursor_x = len(self.lines[last_line_idx])
+                    # NO STATUS MESSAGE
+
+        elif ch == 26:  # Ctrl+Z - Undo
+            self._undo()
+        
+        elif ch == 25:  # Ctrl+Y - Redo
+            self._redo()
+        
+        elif ch == 15:  # Ctrl+O - Copy
+            if self.selection_start is not None:
+                selected_text = self._get_selected_text()
+                if selected_text:
+                    self.clipboard = [selected_text]
+                    self._set_status("Selection copied to clipboard")
                 self._clear_selection()
-            
-            elif ch == curses.KEY_BACKSPACE or ch == 127 or ch == 8:
-                self._delete_char()
-            
-            elif ch == curses.KEY_DC:  # Delete key
-                self._delete_char_forward()
-            
-            # Handle printable characters
             else:
-                self._insert_char(ch)
-                            
+                self._set_status("No selection to copy")
+            self._ensure_valid_cursor()
+
+        elif ch == 16:  # Ctrl+P - Paste
+            if self.clipboard:
+                self._paste_text(self.clipboard[0])
+                self._set_status("Pasted from clipboard")
+        
+        elif ch == 19:  # Ctrl+S - Save
+            self._save_file()
+        
+        elif ch == 6:  # Ctrl+F - Search
+            self._search(stdscr)
+        
+        elif ch == 9:  # Ctrl+I - Info
+            info = self._get_file_info()
+            self._set_status(info, timeout=30)
+        
+        elif ch == 18:  # Ctrl+R - Rename
+            self._rename_file(stdscr)
+        
+        elif ch == 2:  # Ctrl+B - Switch buffer
+            target = self._pick_buffer(stdscr)
+            if target is not None:
+                self.switch_to = target
+                return False
+        
+        elif ch == 4:  # Ctrl+D - Delete
+            if self._delete_file(stdscr):
+                return False  # Exit editor after deleting file
+        
+        elif action == 'home':
+            self.cursor_x = 0
+            self._clear_selection()
+        
+        elif action == 'end':
+            self.cursor_x = len(self.lines[self.cursor_y])
+            self._clear_selection()
+        
+        elif action == 'page_up':
+            self._move_cursor(-10, 0)
+            self._clear_selection()
+        
+        elif action == 'page_down':
+            self._move_cursor(10, 0)
+            self._clear_selection()
+        
+        elif ch == curses.KEY_BACKSPACE or ch == 127 or ch == 8:
+            self._delete_char()
+        
+        elif ch == curses.KEY_DC:  # Delete key
+            self._delete_char_forward()
+        
+        # Handle printable characters
+        else:
+            self._insert_char(ch)
+        
+        return True
+
 class InteractiveNavigator:
     """Interactive file/directory navigator using curses"""
     
@@ -2869,14 +3936,111 @@ class InteractiveNavigator:
             elif key == 27:  # Escape
                 return ('exit', None)
             
+class EditorBuffers:
+    """
+    Session-wide LRU of open editor buffers.
+    Reopening a file that is still cached reuses its CursesEditor, so cursor,
+    scroll position and undo history survive between `edit`/`nav` calls, and
+    Ctrl+B switches between cached buffers without leaving curses.
+    """
+    MAX_BUFFERS = 8
+    buffers = OrderedDict()  # abspath -> CursesEditor, least recently used first
+    
+    @staticmethod
+    def open(filepath: str) -> CursesEditor:
+        """Get the cached buffer for a file, or load it"""
+        key = os.path.abspath(filepath)
+        editor = EditorBuffers.buffers.get(key)
+        
+        # An unmodified buffer whose file changed on disk is reloaded
+        if editor is not None and not editor.modified and editor.disk_stamp != EditorSwapFile._file_stamp(key):
+            EditorBuffers.drop(editor)
+            editor = None
+        
+        if editor is None:
+            editor = CursesEditor(filepath)
+            EditorBuffers.buffers[key] = editor
+            EditorBuffers._evict()
+        
+        EditorBuffers.buffers.move_to_end(key)
+        editor.begin_session()
+        return editor
+    
+    @staticmethod
+    def recent(exclude=None) -> list:
+        """Cached buffers, most recently used first"""
+        return [editor for editor in reversed(EditorBuffers.buffers.values()) if editor is not exclude]
+    
+    @staticmethod
+    def drop(editor: CursesEditor, keep_swap=None):
+        """Remove a buffer from the cache and release it (keep_swap as in CursesEditor.close)"""
+        for key, cached in list(EditorBuffers.buffers.items()):
+            if cached is editor:
+                del EditorBuffers.buffers[key]
+        editor.close(keep_swap)
+    
+    @staticmethod
+    def clear():
+        """Close every cached buffer (logout)"""
+        for editor in list(EditorBuffers.buffers.values()):
+            editor.close()
+        EditorBuffers.buffers.clear()
+    
+    @staticmethod
+    def _evict():
+        """Drop least recently used buffers over MAX_BUFFERS, preferring ones without unsaved edits"""
+        while len(EditorBuffers.buffers) > EditorBuffers.MAX_BUFFERS:
+            candidates = list(EditorBuffers.buffers.values())[:-1]
+            clean = [editor for editor in candidates if not editor.modified]
+            EditorBuffers.drop(clean[0] if clean else candidates[0])
+    
+    @staticmethod
+    def _rekey(editor: CursesEditor):
+        """Re-file a buffer under its current path (it may have been renamed)"""
+        key = os.path.abspath(editor.filepath)
+        if EditorBuffers.buffers.get(key) is editor:
+            return
+        for old_key, cached in list(EditorBuffers.buffers.items()):
+            if cached is editor:
+                del EditorBuffers.buffers[old_key]
+        displaced = EditorBuffers.buffers.pop(key, None)
+        if displaced is not None:
+            displaced.close()
+        EditorBuffers.buffers[key] = editor
+    
+    @staticmethod
+    def run(stdscr, editor: CursesEditor) -> CursesEditor:
+        """Run the editor inside curses, following buffer switches. Returns the buffer that was closed."""
+        while True:
+            try:
+                editor.run(stdscr)
+            except BaseException:
+                EditorBuffers.drop(editor)
+                raise
+            
+            if editor.switch_to is None:
+                break
+            EditorBuffers._rekey(editor)
+            target = editor.switch_to
+            EditorBuffers.buffers.move_to_end(os.path.abspath(target.filepath))
+            target.begin_session()
+            editor = target
+        
+        # Closing without saving discards the edits, so the buffer and its swap file go too
+        if editor.was_deleted or editor.modified:
+            EditorBuffers.drop(editor, keep_swap=False)
+        else:
+            EditorBuffers._rekey(editor)
+        return editor
+
 def open_curses_editor(filepath: str) -> bool:
     """
     Open a file in the curses editor.
     Returns True if file was saved, False otherwise.
     """
-    editor = CursesEditor(filepath)
+    editor = EditorBuffers.open(filepath)
     try:
-        Curses.wrapper(editor.run)
+        Curses.wrapper(lambda stdscr: EditorBuffers.run(stdscr, editor))
         return True
     except KeyboardInterrupt:
         return False
@@ -2894,16 +4058,37 @@ clipboard_file = None  # For copy/paste/cut functionality - format: (path, type,
 current_user = None
 
 class NumberFormatter:
+    MAX_LIST_ITEMS = 10  # Longer lists show their first and last items only
+
     @staticmethod
     def format_number(value):
         """Consistently format numbers to always show decimal point"""
         if isinstance(value, (int, float)):
+            if value != value or value in (math.inf, -math.inf):
+                return str(value)
             if value == int(value):
                 return f"{int(value)}.0"
             else:
                 return str(float(value))
         return str(value)
 
+    @staticmethod
+    def format_list(values):
+        """Bracketed list of numbers, eliding the middle of long lists"""
+        if len(values) <= NumberFormatter.MAX_LIST_ITEMS:
+            return f"[{', '.join(NumberFormatter.format_number(v) for v in values)}]"
+        half = NumberFormatter.MAX_LIST_ITEMS // 2
+        shown = [NumberFormatter.format_number(v) for v in values[:half]] + ["..."]
+        shown += [NumberFormatter.format_number(v) for v in values[-half:]]
+        return f"[{', '.join(shown)}] ({len(values)} items)"
+
+    @staticmethod
+    def format_value(value):
+        """Display form of any variable value"""
+        if isinstance(value, array):
+            return NumberFormatter.format_list(value)
+        return str(value)
+
 class Input:
     @staticmethod
     def get_key():
@@ -2922,6 +4107,61 @@ class Input:
             finally:
                 termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
 
+    @staticmethod
+    def enter_cbreak():
+        """Deliver keys without Enter; returns the settings for leave_cbreak (None if not a terminal)"""
+        if os.name == 'nt' or not sys.stdin.isatty() or threading.current_thread() is not threading.main_thread():
+            return None
+        fd = sys.stdin.fileno()
+        old_settings = termios.tcgetattr(fd)
+        tty.setcbreak(fd)
+        return old_settings
+
+    @staticmethod
+    def leave_cbreak(old_settings):
+        """Restore the terminal settings saved by enter_cbreak"""
+        if old_settings is not None:
+            termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, old_settings)
+
+    @staticmethod
+    def poll_key(timeout, cbreak_settings=None):
+        """Wait up to timeout seconds for a keypress and consume just that key; True if one came"""
+        if os.name == 'nt':
+            time.sleep(timeout)
+            if msvcrt.kbhit():
+                if msvcrt.getch() in (b'\x00', b'\xe0'):  # Arrow and function keys send a second code
+                    msvcrt.getch()
+                return True
+            return False
+        if cbreak_settings is None:
+            time.sleep(timeout)  # Keys only arrive per line outside cbreak mode
+            return False
+        if not select.select([sys.stdin], [], [], timeout)[0]:
+            return False
+        
+        # Anything typed after the key stays queued for the next prompt
+        fd = sys.stdin.fileno()
+        first = os.read(fd, 1)
+        if first == b'\x1b':
+            Input._read_escape_sequence(fd)
+        elif first and first[0] >= 0xC0:
+            # Rest of a UTF-8 character: one more byte per extra leading 1 bit
+            os.read(fd, 3 if first[0] >= 0xF0 else 2 if first[0] >= 0xE0 else 1)
+        return True
+
+    @staticmethod
+    def _read_escape_sequence(fd):
+        """Consume the rest of an escape sequence (arrow, function key) already waiting after ESC"""
+        if not select.select([fd], [], [], 0)[0]:
+            return  # A lone Escape
+        introducer = os.read(fd, 1)
+        if introducer not in (b'[', b'O'):
+            return  # Alt+key: ESC and one key
+        while select.select([fd], [], [], 0)[0]:
+            byte = os.read(fd, 1)
+            if not byte or 0x40 <= byte[0] <= 0x7E:
+                break  # Final byte of the sequence
+
     @staticmethod
     def get_hidden_input():
         """Get password input with asterisk masking"""
@@ -2967,7 +4207,312 @@ class Input:
         except KeyboardInterrupt:
             System.handle_shutdown()
 
+class FileLock:
+    """
+    Advisory inter-process lock on a <path>.lock sidecar (flock on Unix,
+    msvcrt.locking on Windows). Re-entrant within a process, so code holding
+    it can call other code that takes it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path + ".lock"
+        self._thread_lock = threading.RLock()
+        self._file = None
+        self._depth = 0
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self._file = open(self.path, 'a+b')
+                if os.name == 'nt':
+                    self._file.seek(0)
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)  # Retries for ~10 s, then raises
+                else:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            except BaseException:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if self._depth == 0:
+            try:
+                if os.name == 'nt':
+                    self._file.seek(0)
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            finally:
+                self._file.close()
+                self._file = None
+        self._thread_lock.release()
+        return False
+
+class JournalFile:
+    """
+    File helpers for the snapshot + journal stores (VariableJournal, UserStore):
+    a JSON snapshot and a <snapshot>.journal of one JSON record per line.
+    Writers hold the store's FileLock, so a record without its newline can
+    only be left behind by a crash.
+    """
+
+    @staticmethod
+    def version(snapshot_path, journal_path):
+        """Cheap on-disk version: snapshot identity plus journal length"""
+        try:
+            st = os.stat(snapshot_path)
+            snapshot = (st.st_ino, st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            snapshot = None
+        try:
+            journal_size = os.path.getsize(journal_path)
+        except FileNotFoundError:
+            journal_size = 0
+        return snapshot, journal_size
+
+    @staticmethod
+    def read(journal_path, offset=0):
+        """Records after offset, and the offset just past the last complete one"""
+        records = []
+        try:
+            with open(journal_path, 'rb') as f:
+                f.seek(offset)
+                for raw in f:
+                    if not raw.endswith(b'\n'):
+                        break
+                    try:
+                        records.append(json.loads(raw))
+                    except ValueError:
+                        break
+                    offset += len(raw)
+        except FileNotFoundError:
+            pass
+        return records, offset
+
+    @staticmethod
+    def truncate(journal_path, size):
+        """Cut a torn tail off the journal (caller holds the lock)"""
+        if os.path.exists(journal_path) and os.path.getsize(journal_path) > size:
+            with open(journal_path, 'r+b') as f:
+                f.truncate(size)
+
+    @staticmethod
+    def append(journal_path, lines):
+        """Durably append encoded records; returns the bytes written"""
+        data = ''.join(lines).encode('utf-8')
+        with open(journal_path, 'ab') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(data)
+
+    @staticmethod
+    def write_snapshot(snapshot_path, data):
+        """Atomically replace the snapshot with data as JSON"""
+        directory = os.path.dirname(snapshot_path)
+        fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(snapshot_path)}.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, snapshot_path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+class VariableJournal:
+    """
+    Write-behind store for one user's $ variables: the .var snapshot plus an
+    append-only .var.journal of set/forget records. Records are group-committed
+    by a background thread and folded into the snapshot once the journal grows.
+    Replaying a record is idempotent, so a crash at any point loses at most
+    the records of the last COMMIT_DELAY.
+    
+    Sessions of the same user share both files. Each commit takes the
+    FileLock, merges the records other sessions appended since its last look
+    (per variable, in journal order) and only then appends its own, so
+    concurrent sessions never drop each other's assignments.
+    """
+    COMMIT_DELAY = 0.05      # Assignments within this window share one write+fsync
+    COMPACT_RECORDS = 500    # Journal length that triggers a snapshot rewrite
+
+    def __init__(self, snapshot_path: str, variables_source):
+        self.snapshot_path = snapshot_path
+        self.journal_path = snapshot_path + ".journal"
+        self._variables_source = variables_source  # Returns the live {name: Variable}
+        self._lock = threading.Lock()
+        self._file_lock = FileLock(snapshot_path)
+        self._pending = []          # Encoded records not yet in the journal
+        self._pending_names = set() # Variables those records touch; ours win over merged ones
+        self._records = 0           # Records in the journal file
+        self._offset = 0            # Journal bytes already applied
+        self._version = None        # JournalFile.version at the last look
+        self.snapshot_lost = False  # Last read found the snapshot unreadable and moved it to .corrupt
+        self.compact_enabled = True # Off when the session couldn't load the variables it would write
+        self.error = None           # Why the last background commit failed, until one succeeds
+        self._wake = threading.Event()
+        self._thread = None
+        self._closed = False
+
+    def load(self):
+        """Snapshot plus replayed journal, as {name: (value, type value)}"""
+        with self._lock, self._file_lock:
+            return {name: entry for name, entry in self._read_all().items() if entry is not None}
+
+    def _read_all(self):
+        """Read the snapshot and the whole journal (both locks held)"""
+        entries = {}
+        self.snapshot_lost = False
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                for name, var_data in json.load(f).items():
+                    entries[name] = (var_data['value'], var_data['type'])
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError, AttributeError):
+            # Torn or hand-edited snapshot: keep it for inspection and rebuild from the journal
+            entries = {}
+            self.snapshot_lost = True
+            try:
+                os.replace(self.snapshot_path, self.snapshot_path + ".corrupt")
+            except OSError:
+                pass
+        
+        records, self._offset = JournalFile.read(self.journal_path)
+        JournalFile.truncate(self.journal_path, self._offset)
+        entries.update(VariableJournal._fold(records))
+        self._records = len(records)
+        self._version = JournalFile.version(self.snapshot_path, self.journal_path)
+        return entries
+
+    @staticmethod
+    def _fold(records):
+        """Net effect of records: {name: (value, type value)}, None for forgotten"""
+        entries = {}
+        for record in records:
+            if record.get('op') == 'set':
+                entries[record['name']] = (record['value'], record['type'])
+            elif record.get('op') == 'forget':
+                entries[record['name']] = None
+        return entries
+
+    def record_set(self, variable):
+        """Assign in memory and queue the record"""
+        self._append({'op': 'set', 'name': variable.name, 'type': variable.type.value,
+                      'value': VariableManager.encode_value(variable.value, variable.type)},
+                     lambda variables: variables.__setitem__(variable.name, variable))
+
+    def record_forget(self, name):
+        """Delete from memory and queue the record"""
+        self._append({'op': 'forget', 'name': name}, lambda variables: variables.pop(name, None))
+
+    def _append(self, record, apply):
+        # The in-memory change happens under the same lock as merges, so a merge can't slip in between
+        with self._lock:
+            apply(self._variables_source())
+            self._pending.append(json.dumps(record) + "\n")
+            self._pending_names.add(record['name'])
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._commit_loop, daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def _commit_loop(self):
+        """Background group commit: wait for a record, let the burst gather, write it"""
+        while not self._closed:
+            self._wake.wait()
+            time.sleep(VariableJournal.COMMIT_DELAY)
+            self._wake.clear()
+            try:
+                self.flush()
+                self.error = None
+            except Exception as e:
+                self.error = e  # Records stay pending; the next commit or close() retries
+
+    def refresh(self):
+        """Merge other sessions' changes; only a stat when the files are unchanged"""
+        if JournalFile.version(self.snapshot_path, self.journal_path) != self._version:
+            self.flush()
+
+    def flush(self, compact=False):
+        """Merge, write pending records durably, and rewrite the snapshot if the journal is long (or compact)"""
+        with self._lock, self._file_lock:
+            self._merge()
+            if self._pending:
+                self._offset += JournalFile.append(self.journal_path, self._pending)
+                self._records += len(self._pending)
+                self._pending = []
+                self._pending_names = set()
+            if self._records and self.compact_enabled and (compact or self._records >= VariableJournal.COMPACT_RECORDS):
+                self._compact()
+            self._version = JournalFile.version(self.snapshot_path, self.journal_path)
+
+    def _merge(self):
+        """Apply what other sessions wrote since our last look (both locks held)"""
+        version = JournalFile.version(self.snapshot_path, self.journal_path)
+        if version == self._version:
+            return
+        variables = self._variables_source()
+        if self._version is None or version[0] != self._version[0]:
+            # Snapshot replaced by another session's compaction: everything is in it plus the journal
+            # (if it was unreadable only the journal is left, so a missing name proves nothing)
+            entries = self._read_all()
+            version = self._version  # A damaged snapshot was just moved aside
+            if not self.snapshot_lost:
+                for name in list(variables):
+                    entries.setdefault(name, None)
+        else:
+            records, self._offset = JournalFile.read(self.journal_path, self._offset)
+            JournalFile.truncate(self.journal_path, self._offset)
+            self._records += len(records)
+            entries = VariableJournal._fold(records)
+        
+        for name, entry in entries.items():
+            if name in self._pending_names:
+                continue  # Our record is appended after theirs, so it wins
+            if entry is None:
+                variables.pop(name, None)
+                continue
+            try:
+                var_type = DataType(entry[1])
+                variables[name] = Variable(name, VariableManager.decode_value(entry[0], var_type), var_type, True)
+            except (ValueError, TypeError):
+                pass  # Unreadable record from a newer or damaged writer
+        self._version = version
+
+    def _compact(self):
+        """Replace the snapshot with the current variables, then empty the journal"""
+        variables = dict(self._variables_source())
+        data = {name: {'value': VariableManager.encode_value(var.value, var.type), 'type': var.type.value}
+                for name, var in variables.items()}
+        JournalFile.write_snapshot(self.snapshot_path, data)
+        
+        # A crash before this truncate only means the journal is replayed onto a snapshot that already has it
+        with open(self.journal_path, 'w', encoding='utf-8'):
+            pass
+        self._records = 0
+        self._offset = 0
+
+    def close(self):
+        """Commit everything into the snapshot and stop the commit thread"""
+        self._closed = True
+        self._wake.set()
+        self.flush(compact=True)
+
 class VariableManager:
+    _journal = None  # VariableJournal of the logged-in user
+    _reported_error = None  # Background commit failure already shown
+
     @staticmethod
     def get_user_root(username):
         """Get the user's root directory path"""
@@ -2983,56 +4528,110 @@ class VariableManager:
     
     @staticmethod
     def load_persistent_variables(username):
-        """Load persistent variables from file"""
+        """Load persistent variables from the snapshot and journal"""
         global persistent_variables
-        variables_file = VariableManager.get_variables_file(username)
+        VariableManager.save_persistent_variables()  # Previous user, if any
+        persistent_variables = {}
+        VariableManager._journal = VariableJournal(
+            VariableManager.get_variables_file(username), lambda: persistent_variables)
+        
+        try:
+            entries = VariableManager._journal.load()
+        except Exception as e:
+            # Files that can't be read or locked can't be written either: keep this session's $ variables in memory
+            VariableManager._journal = None
+            System.print_instant(f"Warning: Could not load variables: {e}\n"
+                                 "Changes to $ variables will not be saved this session", is_error=True)
+            return
         
         try:
-            if os.path.exists(variables_file):
-                with open(variables_file, 'r') as f:
-                    data = json.load(f)
-                    persistent_variables = {}
-                    for name, var_data in data.items():
-                        persistent_variables[name] = Variable(
-                            name, var_data['value'], 
-                            DataType(var_data['type']), 
-                            True
-                        )
+            persistent_variables = {
+                name: Variable(name, VariableManager.decode_value(value, DataType(type_value)), DataType(type_value), True)
+                for name, (value, type_value) in entries.items()
+            }
+            if VariableManager._journal.snapshot_lost:
+                System.print_instant("Warning: Variables file was damaged; kept as .var.corrupt and rebuilt from the journal", is_error=True)
         except Exception as e:
+            # New assignments are still journaled, but the file we couldn't read is never rewritten from this session
+            VariableManager._journal.compact_enabled = False
             System.print_instant(f"Warning: Could not load variables: {e}", is_error=True)
     
     @staticmethod
-    def save_persistent_variables(username):
-        """Save persistent variables to file"""
-        variables_file = VariableManager.get_variables_file(username)
+    def encode_value(value, var_type):
+        """JSON form of a value; LIST arrays are stored as base64 of little-endian doubles"""
+        if var_type != DataType.LIST:
+            return value
+        if sys.byteorder == 'big':
+            value = array('d', value)
+            value.byteswap()
+        return base64.b64encode(value.tobytes()).decode('ascii')
+
+    @staticmethod
+    def decode_value(value, var_type):
+        """Inverse of encode_value"""
+        if var_type != DataType.LIST:
+            return value
+        values = array('d')
+        values.frombytes(base64.b64decode(value))
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values
+
+    @staticmethod
+    def refresh_persistent_variables():
+        """Pick up assignments made by other sessions of the same user"""
+        journal = VariableManager._journal
+        if journal is None:
+            return
+        try:
+            journal.refresh()
+        except Exception as e:
+            System.print_instant(f"Warning: Could not merge variables: {e}", is_error=True)
         
+        error = journal.error
+        if error is not None and error is not VariableManager._reported_error:
+            VariableManager._reported_error = error  # Once per failure; commits keep retrying
+            System.print_instant(f"Warning: Could not save variables: {error}", is_error=True)
+
+    @staticmethod
+    def save_persistent_variables():
+        """Commit journaled changes into the variables file (logout, exit)"""
+        if VariableManager._journal is None:
+            return
         try:
-            data = {}
-            for name, var in persistent_variables.items():
-                data[name] = {
-                    'value': var.value,
-                    'type': var.type.value
-                }
-            
-            with open(variables_file, 'w') as f:
-                json.dump(data, f, indent=4)
+            VariableManager._journal.close()
         except Exception as e:
             System.print_instant(f"Warning: Could not save variables: {e}", is_error=True)
+        VariableManager._journal = None
     
     @staticmethod
     def set_variable(name, value, var_type):
         """Set a variable (session or persistent)"""
-        global current_user
         variable = Variable(name, value, var_type, name.startswith('$'))
         
         if name.startswith('$'):
-            persistent_variables[name] = variable
-            VariableManager.save_persistent_variables(current_user)
+            if VariableManager._journal is not None:
+                VariableManager._journal.record_set(variable)
+            else:
+                persistent_variables[name] = variable
         elif name.startswith('#'):
             session_variables[name] = variable
         else:
             raise ValueError("Variable names must start with $ or #")
     
+    @staticmethod
+    def forget_variable(name):
+        """Delete a variable; returns False if it didn't exist"""
+        if name.startswith('$'):
+            if name not in persistent_variables:
+                return False
+            if VariableManager._journal is not None:
+                VariableManager._journal.record_forget(name)
+            else:
+                del persistent_variables[name]
+            return True
+        return session_variables.pop(name, None) is not None
+    
     @staticmethod
     def get_variable(name):
         """Get a variable value"""
@@ -3067,9 +4666,15 @@ class VariableManager:
         return None
 
 class System:
+    # Typewriter effect limits for print_slow
+    SLOW_BUDGET_MS = 400
+    SLOW_INSTANT_CHARS = 4000
+    SLOW_FRAME = 1 / 60
+
     @staticmethod
     def clear_screen():
         """Clear the terminal screen"""
+        TerminalState.flush()
         os.system('cls' if os.name == 'nt' else 'clear')
 
     @staticmethod
@@ -3081,13 +4686,36 @@ class System:
         TerminalState.write(str(text), color_code, end + reset_code)
 
     @staticmethod
-    def print_slow(text, delay=0.005, end='\n', is_error=False):
-        """Print text character by character"""
+    def print_slow(text, delay=0.005, end='\n', is_error=False, budget_ms=None):
+        """
+        Typewriter print at `delay` per character, written a frame at a time so the
+        whole text takes at most budget_ms (SLOW_BUDGET_MS by default). A keypress
+        prints the rest at once; text over SLOW_INSTANT_CHARS is printed instantly.
+        """
+        text = str(text)
         color_code = Fore.RED if is_error else ""
+        budget = (System.SLOW_BUDGET_MS if budget_ms is None else budget_ms) / 1000
+        duration = min(len(text) * delay, budget)
         
-        for char in str(text):
-            TerminalState.write(char, color_code, '')
-            time.sleep(delay)
+        if len(text) > System.SLOW_INSTANT_CHARS or duration < System.SLOW_FRAME:
+            TerminalState.write(text, color_code, '')
+        else:
+            cbreak_settings = Input.enter_cbreak()
+            try:
+                written = 0
+                start_time = time.monotonic()
+                while written < len(text):
+                    progress = (time.monotonic() - start_time) / duration
+                    target = len(text) if progress >= 1 else int(len(text) * progress)
+                    if target > written:
+                        TerminalState.write(text[written:target], color_code, '')
+                        TerminalState.flush()
+                        written = target
+                    if written < len(text) and Input.poll_key(System.SLOW_FRAME, cbreak_settings):
+                        TerminalState.write(text[written:], color_code, '')
+                        break
+            finally:
+                Input.leave_cbreak(cbreak_settings)
         
         if end:
             reset_code = Style.RESET_ALL if is_error else ""
@@ -3103,14 +4731,14 @@ class System:
             AsciiArt.start_animation()
         
         TerminalState.write('', Fore.YELLOW, '')
+        TerminalState.flush()  # Prompt boundary
         
         try:
             if hidden:
                 user_input = Input.get_hidden_input()
             else:
                 user_input = input()
-                if TerminalState._recording:
-                    TerminalState._output_buffer.append(f"{Fore.YELLOW}{user_input}{Style.RESET_ALL}\n")
+                TerminalState.record(f"{Fore.YELLOW}{user_input}{Style.RESET_ALL}\n")
         except KeyboardInterrupt:
             TerminalState.write('', Style.RESET_ALL, '')
             raise
@@ -3131,8 +4759,7 @@ class System:
     @staticmethod
     def show_loading_bar(sound_name, color=Fore.MAGENTA, filled_char='█', unfilled_char='.'):
         """Display loading bar synchronized with sound playback"""
-        sound_thread = threading.Thread(target=lambda: Sound.play(sound_name))
-        sound_thread.start()
+        sound_done = Sound.play(sound_name, droppable=False)
         
         try:
             duration = Sound.get_sound_duration(sound_name)
@@ -3141,9 +4768,10 @@ class System:
         
         bar_width = 50
         TerminalState.write("\n[", color, '')
+        TerminalState.flush()  # The bar below redraws its line directly
         start_time = time.time()
         
-        while sound_thread.is_alive():
+        while not sound_done.is_set():
             elapsed = time.time() - start_time
             progress = min(elapsed / duration, 1.0)
             filled = int(bar_width * progress)
@@ -3152,7 +4780,7 @@ class System:
             
             sys.stdout.write(f"\r{color}[{bar}] {percentage}%{Style.RESET_ALL}")
             sys.stdout.flush()
-            time.sleep(0.05)
+            sound_done.wait(0.05)
         
         full_bar = f"{filled_char * bar_width}"
         final_output = f"\r{color}[{full_bar}] 100%{Style.RESET_ALL}\n"
@@ -3160,11 +4788,9 @@ class System:
         sys.stdout.write(final_output)
         sys.stdout.flush()
         
-        if TerminalState._recording and len(TerminalState._output_buffer) > 0:
-            TerminalState._output_buffer.pop()
-            TerminalState._output_buffer.append(f"{color}[{full_bar}] 100%{Style.RESET_ALL}\n")
-        
-        sound_thread.join()
+        # Record the finished bar in place of the "[" that started it
+        TerminalState.discard_partial("[")
+        TerminalState.record(f"{color}[{full_bar}] 100%{Style.RESET_ALL}\n")
 
     @staticmethod
     def welcome(username):
@@ -3174,8 +4800,7 @@ class System:
         System.clear_screen()
         System.print_instant(Message.BOOT)
         
-        preload_thread = threading.Thread(target=Sound.preload_sounds, daemon=True)
-        preload_thread.start()
+        Sound.preload_sounds()  # No-op if the splash screen already started it
         
         System.show_loading_bar("boot", Fore.MAGENTA)
         System.clear_screen()
@@ -3213,6 +4838,8 @@ class System:
         if output_type == "sound":
             if isinstance(result, (int, float)):
                 Sound.play_and_print("enter", NumberFormatter.format_number(result))
+            elif isinstance(result, array):
+                Sound.play_and_print("enter", NumberFormatter.format_list(result))
             else:
                 Sound.play_and_print("enter", result)
         elif output_type == "silent":
@@ -3256,35 +4883,195 @@ def get_user_data_path():
     os.makedirs(data_dir, exist_ok=True)
     return data_dir
 
+class AudioBackend:
+    """
+    Plays clips for Sound. prepare() turns a clip file into whatever play() takes
+    and runs once per clip, off the main thread; play() blocks until done.
+    A backend that can play from memory would return decoded audio there.
+    """
+    name = "base"
+    silent = False
+
+    @staticmethod
+    def available():
+        """Whether this backend can make sound in the current session"""
+        return False
+
+    def prepare(self, path):
+        return path
+
+    def play(self, clip):
+        """Play a prepared clip, blocking until it ends (the base plays nothing)"""
+        pass
+
+class PlaysoundBackend(AudioBackend):
+    """
+    playsound only plays files and decodes them on every call, so nothing is
+    held in memory: a prepared clip is its path, read through once so the
+    first play doesn't wait on the disk.
+    """
+    name = "playsound"
+
+    @staticmethod
+    def available():
+        if playsound is None:
+            return False
+        if os.name == 'nt':
+            try:
+                return ctypes.windll.winmm.waveOutGetNumDevs() > 0
+            except Exception:
+                return True
+        if os.environ.get('SSH_CONNECTION') or os.environ.get('SSH_TTY'):
+            return False  # Sound would play on the remote machine, if anywhere
+        if sys.platform == 'darwin' or os.environ.get('PULSE_SERVER'):
+            return True
+        
+        # Linux: a sound server socket or an ALSA playback device
+        runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+        if runtime_dir and any(os.path.exists(os.path.join(runtime_dir, name)) for name in ('pulse/native', 'pipewire-0')):
+            return True
+        try:
+            return any(name.startswith('pcm') and name.endswith('p') for name in os.listdir('/dev/snd'))
+        except OSError:
+            return False
+
+    def prepare(self, path):
+        """Check the clip is readable and warm the OS page cache with it"""
+        with open(path, 'rb') as f:
+            while f.read(1 << 16):
+                pass
+        return path
+
+    def play(self, clip):
+        playsound(clip)
+
+class NullBackend(AudioBackend):
+    """Used when there is no audio device (headless, SSH): every clip is skipped by the base play()"""
+    name = "null"
+    silent = True
+
+    @staticmethod
+    def available():
+        return True
+
 class Sound:
+    """
+    Clip playback through a small pool of long-lived audio workers. play() only
+    queues the clip; up to MAX_VOICES clips overlap, and rapid repeats are dropped.
+    """
+    BACKENDS = [PlaysoundBackend, NullBackend]  # Preference order; the first available is used
+    PRELOAD = ["enter", "help", "error", "boot", "shutdown"]
     base_path = get_app_path()
+    MAX_VOICES = 3    # Clips that can play at the same time
+    MAX_QUEUED = 4    # Droppable clips are skipped once this many are waiting
+    MANIFEST_VERSION = 1
+    DEFAULT_DURATION = 2.0
+    
+    _queue = queue.Queue()
+    _lock = threading.Lock()
+    _workers = []
+    _waiting = {}     # Clip name -> queued but not yet started
+    _backend = None
+    _paths = {}       # Clip name -> resolved path, None if missing
+    _clips = {}       # Clip name -> clip prepared by the backend, None if unplayable
+    _preload_thread = None
+    _manifest = None  # Clip name -> {"size", "mtime_ns", "sha1", "duration"}
+    _manifest_lock = threading.Lock()
+
+    @staticmethod
+    def backend():
+        """The audio backend, picked from BACKENDS on first use"""
+        if Sound._backend is None:
+            Sound._backend = next(backend() for backend in Sound.BACKENDS if backend.available())
+        return Sound._backend
+
+    @staticmethod
+    def set_backend(backend):
+        """Use a specific AudioBackend instance; prepared clips are dropped"""
+        Sound._backend = backend
+        Sound._clips = {}
+
+    @staticmethod
+    def clip_path(sound):
+        """Path of a clip, resolved once; None if there is no such file"""
+        if sound not in Sound._paths:
+            path = os.path.join(Sound.base_path, "sounds", f"{sound}.mp3")
+            Sound._paths[sound] = path if os.path.exists(path) else None
+        return Sound._paths[sound]
+
+    @staticmethod
+    def prepare_clip(sound):
+        """Clip prepared by the backend, preparing it on first use; None if it can't play"""
+        if sound not in Sound._clips:
+            path = Sound.clip_path(sound)
+            Sound._clips[sound] = Sound.backend().prepare(path) if path else None
+        return Sound._clips[sound]
 
     @staticmethod
     def preload_sounds():
-        """Preload commonly used sounds to reduce first-play delay"""
-        sound_files = ["enter", "help", "error", "boot", "shutdown"]
+        """Load the common clips and the manifest on a background thread, once per process"""
+        with Sound._lock:
+            if Sound._preload_thread is not None:
+                return
+            Sound._preload_thread = threading.Thread(target=Sound._preload, daemon=True)
+        Sound._preload_thread.start()
+
+    @staticmethod
+    def _preload():
+        if not Sound.backend().silent:
+            for sound in Sound.PRELOAD:
+                try:
+                    Sound.prepare_clip(sound)
+                except Exception:
+                    Sound._clips[sound] = None  # Silently skip clips that fail to load
+        Sound.manifest()  # Durations for the loading bars
+
+    @staticmethod
+    def play(sound, droppable=True):
+        """
+        Queue a clip and return an Event that is set once it has played (or was
+        skipped). Droppable clips are skipped if the same clip is still waiting
+        or the queue is full, so rapid keystrokes don't pile up.
+        """
+        done = threading.Event()
+        if Sound.backend().silent or Sound.clip_path(sound) is None or (sound in Sound._clips and Sound._clips[sound] is None):
+            done.set()
+            return done
         
-        # Touch each sound file to load into OS cache
-        for sound in sound_files:
-            try:
-                sound_path = f"{Sound.base_path}\\sounds\\{sound}.mp3"
-                if os.path.exists(sound_path):
-                    # Just opening and reading a bit helps cache it
-                    with open(sound_path, 'rb') as f:
-                        f.read(1024)  # Read first 1KB
-            except:
-                pass  # Silently ignore errors during preload
+        with Sound._lock:
+            if droppable and (Sound._waiting.get(sound) or Sound._queue.qsize() >= Sound.MAX_QUEUED):
+                done.set()
+                return done
+            Sound._waiting[sound] = Sound._waiting.get(sound, 0) + 1
+            
+            while len(Sound._workers) < Sound.MAX_VOICES:
+                worker = threading.Thread(target=Sound._worker, daemon=True)
+                worker.start()
+                Sound._workers.append(worker)
+        
+        Sound._queue.put((sound, done))
+        return done
 
     @staticmethod
-    def play(sound):
-        """Play a sound file"""
-        playsound(f"{Sound.base_path}\\sounds\\{sound}.mp3")
+    def _worker():
+        """Audio worker: play queued clips one at a time"""
+        while True:
+            sound, done = Sound._queue.get()
+            with Sound._lock:
+                Sound._waiting[sound] -= 1
+            try:
+                clip = Sound.prepare_clip(sound)
+                if clip is not None:
+                    Sound.backend().play(clip)
+            except Exception:
+                Sound._clips[sound] = None  # Don't keep queueing a clip that can't play
+            finally:
+                done.set()
 
     @staticmethod
     def play_and_print(sound, result="", is_slow=False, is_error=False):
         """Play sound and print result simultaneously"""
-        sound_thread = threading.Thread(target=lambda: Sound.play(sound))
-        sound_thread.start()
+        Sound.play(sound)
         if result != "":
             if is_slow:
                 System.print_slow(f"\n{result}", is_error=is_error)
@@ -3294,25 +5081,114 @@ class Sound:
     @staticmethod
     def get_sound_duration(sound):
         """Get duration of a sound file in seconds"""
+        info = Sound.manifest().get(sound)
+        if info and info.get("duration"):
+            return info["duration"]
+        return Sound.DEFAULT_DURATION  # Unknown clip, or mutagen not available
+
+    @staticmethod
+    def manifest():
+        """
+        Size, mtime, SHA-1 and duration of every clip in sounds/, kept in
+        sound_manifest.json next to the user data. Only clips whose size or
+        mtime changed (or that have no duration yet) are probed, and mutagen
+        is only imported when there are such clips.
+        """
+        with Sound._manifest_lock:
+            if Sound._manifest is None:
+                Sound._manifest = Sound._build_manifest()
+            return Sound._manifest
+
+    @staticmethod
+    def _build_manifest():
+        sounds_dir = os.path.join(Sound.base_path, "sounds")
+        manifest_path = os.path.join(get_user_data_path(), "sound_manifest.json")
+        cached = {}
         try:
-            from mutagen.mp3 import MP3
-            audio = MP3(f"{Sound.base_path}\\sounds\\{sound}.mp3")
-            return audio.info.length
-        except:
-            # Fallback duration if mutagen not available
-            return 2.0  # Default 2 seconds
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == Sound.MANIFEST_VERSION and data.get("sounds_dir") == sounds_dir:
+                cached = data.get("clips", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+        
+        clips = {}
+        stale = []
+        try:
+            entries = [entry for entry in os.scandir(sounds_dir) if entry.name.lower().endswith(".mp3") and entry.is_file()]
+        except OSError:
+            entries = []
+        for entry in entries:
+            stat = entry.stat()
+            name = entry.name[:-4]
+            info = cached.get(name)
+            unchanged = bool(info) and info.get("size") == stat.st_size and info.get("mtime_ns") == stat.st_mtime_ns
+            if unchanged and info.get("duration"):
+                clips[name] = info
+            else:
+                stale.append((name, entry.path, stat, info if unchanged else None))
+        
+        if stale:
+            try:
+                from mutagen.mp3 import MP3
+            except ImportError:
+                MP3 = None
+            for name, path, stat, known in stale:
+                if known:
+                    sha1 = known.get("sha1")
+                else:
+                    digest = hashlib.sha1()
+                    with open(path, 'rb') as f:
+                        for chunk in iter(lambda: f.read(1 << 16), b''):
+                            digest.update(chunk)
+                    sha1 = digest.hexdigest()
+                duration = None
+                if MP3 is not None:
+                    try:
+                        duration = MP3(path).info.length
+                    except Exception:
+                        pass
+                clips[name] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha1": sha1, "duration": duration}
+        
+        if clips != cached:
+            try:
+                fd, temp_path = tempfile.mkstemp(prefix=".sound_manifest.", suffix=".tmp", dir=os.path.dirname(manifest_path))
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({"version": Sound.MANIFEST_VERSION, "sounds_dir": sounds_dir, "clips": clips}, f, indent=4)
+                os.replace(temp_path, manifest_path)
+            except OSError:
+                pass  # Still usable for this session
+        
+        return clips
 
 class TerminalState:
     """Manages terminal state for restoration after curses screens"""
-    _output_buffer = []
+    # Scrollback limits; the oldest lines are dropped first
+    MAX_LINES = 2000
+    MAX_BYTES = 512 * 1024
+    
+    _ANSI_RE = re.compile(r'\x1b\[[0-9;?]*[A-Za-z]')
+    
+    _lines = deque()   # Completed lines, each ending in a newline
+    _partial = []      # Pieces of the line still being written
+    _bytes = 0         # Encoded size of _lines
     _recording = False
-    _stdout_lock = threading.Lock()
+    
+    # Output is buffered and written by the AsciiArt scheduler once per output
+    # frame, or by flush() at prompt boundaries
+    FLUSH_INTERVAL = 1 / 60
+    MAX_PENDING = 64 * 1024     # Bursts past this many characters are written at once
+    
+    _pending = []               # Output not yet written to stdout
+    _pending_size = 0
+    _pending_since = None       # When the oldest pending piece was buffered
+    _stdout_lock = AsciiArt._stdout_lock
     
     @staticmethod
     def start_recording():
         """Start recording terminal output"""
         TerminalState._recording = True
-        TerminalState._output_buffer = []
+        TerminalState.reset()
     
     @staticmethod
     def stop_recording():
@@ -3322,22 +5198,115 @@ class TerminalState:
     @staticmethod
     def reset():
         """Reset the buffer (used on reboot)"""
-        TerminalState._output_buffer = []
+        TerminalState._lines = deque()
+        TerminalState._partial = []
+        TerminalState._bytes = 0
+    
+    @staticmethod
+    def record(output):
+        """Add output to the scrollback without writing it"""
+        if not TerminalState._recording or not output:
+            return
+        
+        # Pieces of an unfinished line are merged once its newline arrives
+        pieces = output.split('\n')
+        TerminalState._partial.append(pieces[0])
+        if len(pieces) == 1:
+            return
+        
+        lines = TerminalState._lines
+        completed = [''.join(TerminalState._partial) + '\n'] + [piece + '\n' for piece in pieces[1:-1]]
+        for line in completed:
+            lines.append(line)
+            TerminalState._bytes += len(line.encode('utf-8', 'replace'))
+        TerminalState._partial = [pieces[-1]] if pieces[-1] else []
+        
+        while lines and (len(lines) > TerminalState.MAX_LINES or TerminalState._bytes > TerminalState.MAX_BYTES):
+            TerminalState._bytes -= len(lines.popleft().encode('utf-8', 'replace'))
+    
+    @staticmethod
+    def discard_partial(segment):
+        """Take back the end of the unfinished line (segment, as it was written) that is about to be redrawn"""
+        partial = ''.join(TerminalState._partial)
+        if segment and partial.endswith(segment):
+            partial = partial[:-len(segment)]
+        TerminalState._partial = [partial] if partial else []
     
     @staticmethod
     def write(text, color_code="", end=''):
-        """Write to stdout and record if active"""
+        """Buffer output for the next output frame and record it if active"""
         with TerminalState._stdout_lock:
             # Build the full output string with colors
             full_output = f"{color_code}{text}{end}"
-            
-            # Always write to stdout
-            sys.stdout.write(full_output)
-            sys.stdout.flush()
+            TerminalState._pending.append(full_output)
+            TerminalState._pending_size += len(full_output)
             
             # Record if recording is active
+            TerminalState.record(full_output)
+            
+            # Before the scheduler runs (splash, login) and for large bursts, write through
+            if AsciiArt._scheduler is None or TerminalState._pending_size > TerminalState.MAX_PENDING:
+                sys.stdout.write(TerminalState.take_pending())
+                sys.stdout.flush()
+                return
+            if TerminalState._pending_since is not None:
+                return  # The scheduler already has a flush due
+            TerminalState._pending_since = time.monotonic()
+        AsciiArt._notify()
+    
+    @staticmethod
+    def flush():
+        """Write buffered output now; call before reading input or handing over the terminal"""
+        with TerminalState._stdout_lock:
+            sys.stdout.write(TerminalState.take_pending())
+            sys.stdout.flush()
+    
+    @staticmethod
+    def take_pending():
+        """Remove and return the buffered output (caller holds the stdout lock)"""
+        output = ''.join(TerminalState._pending)
+        TerminalState._pending = []
+        TerminalState._pending_size = 0
+        TerminalState._pending_since = None
+        return output
+    
+    @staticmethod
+    def drop_recorded_pending():
+        """Discard buffered output that a replay will redraw from the scrollback anyway"""
+        with TerminalState._stdout_lock:
             if TerminalState._recording:
-                TerminalState._output_buffer.append(full_output)
+                TerminalState.take_pending()
+    
+    @staticmethod
+    def last_screen():
+        """The recorded output that fits on the current screen, as one string"""
+        size = shutil.get_terminal_size()
+        width = max(1, size.columns)
+        rows_left = max(1, size.lines - 1)  # Leave the last row for the cursor
+        
+        partial = ''.join(TerminalState._partial)
+        if partial:
+            rows_left -= 1
+        
+        # Walk back from the newest line until the screen is full, counting wrapped rows
+        tail = []
+        for line in reversed(TerminalState._lines):
+            visible = len(TerminalState._ANSI_RE.sub('', line)) - 1
+            rows = max(1, -(-visible // width))
+            if rows > rows_left:
+                break
+            rows_left -= rows
+            tail.append(line)
+        tail.reverse()
+        tail.append(partial)
+        return ''.join(tail)
+    
+    @staticmethod
+    def replay():
+        """Redraw the last screenful of recorded output with a single write"""
+        with TerminalState._stdout_lock:
+            sys.stdout.write(TerminalState.last_screen())
+            sys.stdout.flush()
     
     @staticmethod
     def restore():
@@ -3346,39 +5315,152 @@ class TerminalState:
         # Clear the screen
         System.clear_screen()
         
-        # Replay all recorded output WITHOUT going through TerminalState.write
-        with TerminalState._stdout_lock:
-            for output in TerminalState._output_buffer:
-                sys.stdout.write(output)
-                sys.stdout.flush()
+        # Replay recorded output WITHOUT going through TerminalState.write
+        TerminalState.replay()
+
+class UserStore:
+    """
+    Accounts from users.dat indexed by case-folded username. Creating and
+    removing a user appends one record to users.dat.journal under a FileLock
+    instead of rewriting the file; the journal is folded back into users.dat
+    once it grows past COMPACT_RECORDS. Other processes' records are picked
+    up by refresh(), which costs two stats when nothing changed.
+    """
+    COMPACT_RECORDS = 200
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.journal_path = file_path + ".journal"
+        self.lock = FileLock(file_path)
+        self._users = {}      # username.casefold() -> User, in creation order
+        self._records = 0     # Records in the journal file
+        self._offset = 0      # Journal bytes already applied
+        self._version = None  # JournalFile.version at the last look
+
+    def load(self):
+        """Read the snapshot and replay the journal"""
+        with self.lock:
+            self._read_all()
+        return self
+
+    def _read_all(self):
+        with open(self.file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self._users = {}
+        for entry in data['users']:
+            self._users[entry['username'].casefold()] = User(entry['username'], entry['password'])
+        
+        records, self._offset = JournalFile.read(self.journal_path)
+        JournalFile.truncate(self.journal_path, self._offset)
+        for record in records:
+            self._apply(record)
+        self._records = len(records)
+        self._version = JournalFile.version(self.file_path, self.journal_path)
+
+    def _apply(self, record):
+        key = record['username'].casefold()
+        if record['op'] == 'add':
+            self._users[key] = User(record['username'], record['password'])
+        elif record['op'] == 'remove':
+            self._users.pop(key, None)
+
+    def refresh(self):
+        """Apply accounts other processes created or removed since the last look"""
+        if JournalFile.version(self.file_path, self.journal_path) != self._version:
+            with self.lock:
+                self._sync()
+
+    def _sync(self):
+        """Catch up with the files (lock held)"""
+        version = JournalFile.version(self.file_path, self.journal_path)
+        if version == self._version:
+            return
+        if version[0] != self._version[0]:
+            self._read_all()  # Compacted elsewhere
+            return
+        records, self._offset = JournalFile.read(self.journal_path, self._offset)
+        JournalFile.truncate(self.journal_path, self._offset)
+        for record in records:
+            self._apply(record)
+        self._records += len(records)
+        self._version = version
+
+    def find(self, username):
+        return self._users.get(username.casefold())
+
+    def __contains__(self, username):
+        return username.casefold() in self._users
+
+    def __iter__(self):
+        return iter(list(self._users.values()))
+
+    def __len__(self):
+        return len(self._users)
+
+    def add(self, username, password):
+        """Create an account; None if another process took the name first"""
+        with self.lock:
+            self._sync()
+            if username.casefold() in self._users:
+                return None
+            self._write({'op': 'add', 'username': username, 'password': password})
+        return self._users[username.casefold()]
+
+    def remove(self, username):
+        with self.lock:
+            self._sync()
+            user = self._users.get(username.casefold())
+            if user is not None:
+                self._write({'op': 'remove', 'username': user.username})
+        return user
+
+    def _write(self, record):
+        """Durably append one record and apply it, compacting when the journal is long (lock held)"""
+        self._offset += JournalFile.append(self.journal_path, [json.dumps(record) + "\n"])
+        self._records += 1
+        self._apply(record)
+        if self._records >= UserStore.COMPACT_RECORDS:
+            self.compact()
+        self._version = JournalFile.version(self.file_path, self.journal_path)
+
+    def compact(self):
+        """Rewrite users.dat from the index and empty the journal"""
+        with self.lock:
+            self._sync()
+            data = {'users': [{'username': user.username, 'password': user.password} for user in self._users.values()]}
+            JournalFile.write_snapshot(self.file_path, data)
+            with open(self.journal_path, 'w', encoding='utf-8'):
+                pass
+            self._records = 0
+            self._offset = 0
+            self._version = JournalFile.version(self.file_path, self.journal_path)
 
 class UserManager:
     @staticmethod
     def load_users(file_path):
-        """Load users from JSON file"""
+        """Load the user store (users.dat plus its journal)"""
         try:
-            with open(file_path, 'r') as file:
-                data = json.load(file)
-                return [User(user['username'], user['password']) for user in data['users']]
-        except (FileNotFoundError, json.JSONDecodeError) as e:
+            return UserStore(file_path).load()
+        except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
             error_msg = "USER DATA FILE NOT FOUND" if isinstance(e, FileNotFoundError) else "INVALID USER DATA FILE FORMAT"
             System.throw_error(error_msg)
             sys.exit(1)
 
     @staticmethod
-    def save_users(users, file_path):
-        """Save users to JSON file"""
-        data = {'users': [{'username': user.username, 'password': user.password} for user in users]}
-        with open(file_path, 'w') as file:
-            json.dump(data, file, indent=4)
+    def add_user(users, username, password):
+        """Create an account (one journal append); None if the name is taken"""
+        return users.add(username, password)
+
+    @staticmethod
+    def remove_user(users, username):
+        """Delete an account; one journal append"""
+        return users.remove(username)
 
     @staticmethod
     def match_user(users, username_input):
         """Find user by username"""
-        for user in users:
-            if user.username.lower() == username_input.lower():
-                return user
-        return None
+        users.refresh()
+        return users.find(username_input)
 
 class MenuHandler:
     @staticmethod
@@ -3386,6 +5468,7 @@ class MenuHandler:
         """Display the menu with the currently selected option highlighted"""
         System.clear_screen()
         System.print_instant(Message.MENU + '\n')
+        TerminalState.flush()
         options = ["Login", "Create User", "Remove User"]
         for i, option in enumerate(options):
             if i == selected:
@@ -3429,7 +5512,7 @@ class UserOperations:
         """Add a new user to the system"""
         while True:
             username = System.colored_input("\n\nNew Username: ", start_animation=False)
-            if any(user.username.lower() == username.lower() for user in users):
+            if UserManager.match_user(users, username):
                 System.throw_error("USERNAME ALREADY EXISTS")
                 continue
 
@@ -3440,8 +5523,9 @@ class UserOperations:
                 System.throw_error("PASSWORDS DO NOT MATCH")
                 continue
 
-            users.append(User(username, password))
-            UserManager.save_users(users, file_path)
+            if not UserManager.add_user(users, username, password):
+                System.throw_error("USERNAME ALREADY EXISTS")
+                continue
             System.create_user_directory(username)
             Sound.play_and_print("enter", f"User '{username}' created successfully!")
             break
@@ -3462,8 +5546,7 @@ class UserOperations:
             System.throw_error("INCORRECT PASSWORD")
             return users
 
-        users = [u for u in users if u.username.lower() != username.lower()]
-        UserManager.save_users(users, file_path)
+        UserManager.remove_user(users, username)
         Sound.play_and_print("enter", f"User '{username}' removed successfully!")
         return users
 
@@ -3509,7 +5592,28 @@ class ArgumentParser:
         
         return parsed_args
 
-class ArgumentResolver:
+class ArgumentResolver:
+    @staticmethod
+    def resolve_numeric(arg):
+        """Resolve a MATH argument to a number, or to an array('d') for LIST values"""
+        if arg.lower() == "result" and last_command_result is not None and last_command_result[1] == DataType.LIST:
+            return last_command_result[0]
+        if arg.startswith('$') or arg.startswith('#'):
+            variable = VariableManager.get_variable(arg)
+            if variable is not None and variable.type == DataType.LIST:
+                return variable.value
+        if arg.startswith('[') and arg.endswith(']'):
+            return ArgumentResolver.parse_list(arg)
+        return ArgumentResolver.resolve_argument(arg, DataType.NUMBER)
+
+    @staticmethod
+    def parse_list(text):
+        """Parse a [1, 2, 3] literal into array('d')"""
+        try:
+            return array('d', map(float, text.strip()[1:-1].replace(',', ' ').split()))
+        except ValueError:
+            raise ValueError(f"'{text}' is not a valid list of numbers")
+
     @staticmethod
     def resolve_argument(arg, expected_type):
         """Resolve an argument to its actual value"""
@@ -3560,52 +5664,73 @@ class ArgumentResolver:
                 return arg
         return arg
     
+    # Compiled templates: text -> (segments, slots). Segments are the literal
+    # pieces with None where a variable goes; slots are (index, name) pairs
+    TEMPLATE_TOKEN = re.compile(r'\\([n$#])|([$#]\w+)')
+    MAX_TEMPLATES = 256
+    MAX_TEMPLATE_CHARS = 1024 * 1024  # Source text held by the cache across all entries
+    MAX_CACHED_TEXT = 64 * 1024       # Longer texts (large edit buffers) are compiled on every call
+    _templates = OrderedDict()
+    _template_chars = 0
+
+    @staticmethod
+    def compile_template(text):
+        """Split text into literal segments and variable slots (cached by text)"""
+        template = ArgumentResolver._templates.get(text)
+        if template is not None:
+            ArgumentResolver._templates.move_to_end(text)
+            return template
+        
+        segments = []
+        slots = []
+        literal_start = 0
+        for match in ArgumentResolver.TEMPLATE_TOKEN.finditer(text):
+            if match.start() > literal_start:
+                segments.append(text[literal_start:match.start()])
+            escaped, var_name = match.groups()
+            if escaped:
+                # \n is a newline; \$ and \# are kept literally so they are never resolved
+                segments.append('\n' if escaped == 'n' else escaped)
+            else:
+                slots.append((len(segments), var_name))
+                segments.append(None)
+            literal_start = match.end()
+        if literal_start < len(text):
+            segments.append(text[literal_start:])
+        
+        template = (segments, tuple(slots))
+        if len(text) > ArgumentResolver.MAX_CACHED_TEXT:
+            return template
+        ArgumentResolver._templates[text] = template
+        ArgumentResolver._template_chars += len(text)
+        while (len(ArgumentResolver._templates) > ArgumentResolver.MAX_TEMPLATES or
+               ArgumentResolver._template_chars > ArgumentResolver.MAX_TEMPLATE_CHARS):
+            evicted, _ = ArgumentResolver._templates.popitem(last=False)
+            ArgumentResolver._template_chars -= len(evicted)
+        return template
+
+    @staticmethod
+    def render_template(text):
+        """Fill a compiled template with current variable values; unknown variables stay as written"""
+        segments, slots = ArgumentResolver.compile_template(text)
+        if not slots:
+            return ''.join(segments)
+        
+        parts = list(segments)
+        values = {}
+        for index, var_name in slots:
+            value = values.get(var_name)
+            if value is None:
+                var = VariableManager.get_variable(var_name)
+                value = NumberFormatter.format_value(var.value) if var else var_name
+                values[var_name] = value
+            parts[index] = value
+        return ''.join(parts)
+    
     @staticmethod
     def process_edit_text(text):
         """Process text for edit commands with escape sequences and conditional variable resolution"""
-        result = ""
-        i = 0
-        
-        while i < len(text):
-            if text[i] == '\\' and i + 1 < len(text):
-                next_char = text[i + 1]
-                if next_char == 'n':
-                    result += '\n'
-                    i += 2
-                elif next_char in ['$', '#']:
-                    # Add the escaped character literally - this prevents variable resolution
-                    result += next_char
-                    i += 2
-                else:
-                    # Not a recognized escape, keep the backslash
-                    result += text[i]
-                    i += 1
-            elif text[i] in ['$', '#']:
-                # Check if this is the start of a variable name
-                var_start = i
-                i += 1
-                # Continue reading alphanumeric characters and underscores
-                while i < len(text) and (text[i].isalnum() or text[i] == '_'):
-                    i += 1
-                
-                var_name = text[var_start:i]
-                
-                # Only replace if it's a valid variable name (more than just $ or #)
-                if len(var_name) > 1:
-                    var = VariableManager.get_variable(var_name)
-                    if var:
-                        result += str(var.value)
-                    else:
-                        # Variable not found, keep as literal text
-                        result += var_name
-                else:
-                    # Just a standalone $ or # character
-                    result += var_name
-            else:
-                result += text[i]
-                i += 1
-        
-        return result
+        return ArgumentResolver.render_template(text)
 
 class PathResolver:
     @staticmethod
@@ -3839,10 +5964,310 @@ class EditHelper:
         processed = ArgumentResolver.process_edit_text(content)
         return processed
 
+class PageCache:
+    """
+    Rendered browser pages, kept in a memory LRU and on disk under
+    browser_cache/ in the user data directory (one JSON file per URL).
+    Entries carry the response's validators and expiry, so stale pages are
+    revalidated with a conditional request, and any stored page can still
+    be shown when the network is unreachable.
+    """
+    VERSION = 1
+    MEMORY_PAGES = 64
+    MEMORY_BYTES = 16 * 1024 * 1024   # Approximate; counts characters of rendered text
+    DISK_BYTES = 64 * 1024 * 1024
+    PRUNE_EVERY = 16                  # Stores between disk size checks
+    HEURISTIC_MAX = 24 * 3600         # Cap for freshness guessed from Last-Modified
+    
+    _memory = OrderedDict()  # url -> entry, least recently used first
+    _sizes = {}              # url -> approximate size of the entry's lines
+    _memory_bytes = 0
+    _stores = 0
+    _lock = threading.RLock()
+    
+    @staticmethod
+    def directory():
+        path = os.path.join(get_user_data_path(), "browser_cache")
+        os.makedirs(path, exist_ok=True)
+        return path
+    
+    @staticmethod
+    def _path(url):
+        return os.path.join(PageCache.directory(), hashlib.sha1(url.encode('utf-8')).hexdigest() + ".json")
+    
+    @staticmethod
+    def get(url):
+        """Cached entry for url (memory first, then disk), fresh or not; None if absent"""
+        with PageCache._lock:
+            entry = PageCache._memory.get(url)
+            if entry is not None:
+                PageCache._memory.move_to_end(url)
+                return entry
+        
+        path = PageCache._path(url)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if entry.get('version') != PageCache.VERSION or entry.get('url') != url:
+                return None
+            os.utime(path)  # Disk eviction is least recently used first
+        except (OSError, ValueError, AttributeError):
+            return None
+        PageCache._remember(entry)
+        return entry
+    
+    @staticmethod
+    def is_fresh(entry):
+        return time.time() < entry['expires']
+    
+    @staticmethod
+    def validators(entry):
+        """Conditional request headers for revalidating entry"""
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    @staticmethod
+    def expiry(headers, now):
+        """When a response stops being fresh, from Cache-Control/Expires or Last-Modified; None if it must not be stored"""
+        directives = {}
+        for part in headers.get('Cache-Control', '').lower().split(','):
+            name, _, value = part.strip().partition('=')
+            if name:
+                directives[name] = value.strip('"')
+        
+        if 'no-store' in directives:
+            return None
+        if 'no-cache' in directives:
+            return now
+        if 'max-age' in directives:
+            try:
+                age = int(headers.get('Age', 0))
+            except ValueError:
+                age = 0
+            try:
+                return now + max(0, int(directives['max-age']) - age)
+            except ValueError:
+                return now
+        if headers.get('Expires'):
+            try:
+                return email.utils.parsedate_to_datetime(headers['Expires']).timestamp()
+            except (TypeError, ValueError, IndexError):
+                return now  # An invalid Expires means already expired
+        if headers.get('Last-Modified'):
+            try:
+                modified = email.utils.parsedate_to_datetime(headers['Last-Modified']).timestamp()
+                return now + min(max(0, now - modified) / 10, PageCache.HEURISTIC_MAX)
+            except (TypeError, ValueError, IndexError):
+                pass
+        return now
+    
+    @staticmethod
+    def store(url, lines, headers):
+        """Cache a rendered 200 response according to its headers"""
+        now = time.time()
+        expires = PageCache.expiry(headers, now)
+        if expires is None:
+            PageCache.discard(url)
+            return
+        PageCache._save({
+            'version': PageCache.VERSION,
+            'url': url,
+            'lines': lines,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'expires': expires,
+        })
+    
+    @staticmethod
+    def revalidated(entry, headers):
+        """A 304 confirmed entry: take the new expiry (and any new validators)"""
+        expires = PageCache.expiry(headers, time.time())
+        if expires is None:
+            PageCache.discard(entry['url'])
+            return
+        entry = dict(entry, expires=expires,
+                     etag=headers.get('ETag', entry.get('etag')),
+                     last_modified=headers.get('Last-Modified', entry.get('last_modified')))
+        PageCache._save(entry)
+    
+    @staticmethod
+    def discard(url):
+        with PageCache._lock:
+            if url in PageCache._memory:
+                del PageCache._memory[url]
+                PageCache._memory_bytes -= PageCache._sizes.pop(url)
+        try:
+            os.remove(PageCache._path(url))
+        except OSError:
+            pass
+    
+    @staticmethod
+    def _remember(entry):
+        """Put entry in the memory LRU, evicting past the page and byte caps"""
+        url = entry['url']
+        size = sum(len(line) + 1 for line in entry['lines'])
+        with PageCache._lock:
+            if url in PageCache._memory:
+                PageCache._memory_bytes -= PageCache._sizes[url]
+            PageCache._memory[url] = entry
+            PageCache._memory.move_to_end(url)
+            PageCache._sizes[url] = size
+            PageCache._memory_bytes += size
+            while len(PageCache._memory) > 1 and (len(PageCache._memory) > PageCache.MEMORY_PAGES or
+                                                   PageCache._memory_bytes > PageCache.MEMORY_BYTES):
+                old_url, _ = PageCache._memory.popitem(last=False)
+                PageCache._memory_bytes -= PageCache._sizes.pop(old_url)
+    
+    @staticmethod
+    def _save(entry):
+        PageCache._remember(entry)
+        path = PageCache._path(entry['url'])
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix=".page.", suffix=".tmp", dir=os.path.dirname(path))
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(temp_path, path)
+        except OSError:
+            return  # Memory tier still has it
+        with PageCache._lock:
+            PageCache._stores += 1
+            prune = PageCache._stores % PageCache.PRUNE_EVERY == 0
+        if prune:
+            PageCache._prune()
+    
+    @staticmethod
+    def _prune():
+        """Delete least recently used files until the disk tier fits DISK_BYTES"""
+        try:
+            files = [(entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                     for entry in os.scandir(PageCache.directory()) if entry.name.endswith(".json")]
+        except OSError:
+            return
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= PageCache.DISK_BYTES:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+class HtmlStream:
+    """
+    Feeds an HTML document to html2text in pieces for WebBrowser.stream_html.
+    html2text has no public streaming API, so this relies on HTML2Text
+    internals (the start flag, outtextlist and the &nbsp; placeholder).
+    supported() checks once that they still convert a sample exactly like
+    handle() does; if not, stream_html renders the whole document instead.
+    """
+    SAMPLE = ('<html><head><title>t</title></head><body><h1>Heading</h1>'
+              '<p>Some&nbsp;text with <b>bold</b>, <em>emphasis</em> and a <a href="/page">link</a>.</p>'
+              '<ul><li>one</li><li>two</li></ul><pre>code\n  block</pre><p>&amp; the end</p></body></html>')
+    _supported = None
+
+    def __init__(self):
+        self.converter = WebBrowser.html_converter()
+        self.converter.start = True  # As HTML2Text.handle() does before feeding
+        self._consumed = 0           # Output pieces already returned by new_text
+        self._pending = ""           # HTML from the last '<' on, held back until the next feed
+
+    def feed(self, html):
+        """Convert html up to its last '<' (html2text treats one text run split across feeds as two)"""
+        html = self._pending + html
+        cut = html.rfind('<')
+        if cut == -1:
+            cut = len(html)
+        self.converter.feed(html[:cut])
+        self._pending = html[cut:]
+
+    def drop_pending(self):
+        """Forget the held-back HTML (a tag cut in half by truncation)"""
+        self._pending = ""
+
+    def new_text(self):
+        """Text converted since the last call; may end in the middle of a line"""
+        pieces = self.converter.outtextlist
+        text = "".join(pieces[self._consumed:]).replace("&nbsp_place_holder;", " ")
+        self._consumed = len(pieces)
+        return text
+
+    def finish(self):
+        """Convert what is left and return the whole document's text"""
+        self.converter.feed(self._pending)
+        self._pending = ""
+        self.converter.feed("")
+        return self.converter.finish()
+
+    @staticmethod
+    def supported():
+        """Whether piecewise conversion matches handle() with the installed html2text (checked once)"""
+        if HtmlStream._supported is None:
+            try:
+                stream = HtmlStream()
+                for i in range(0, len(HtmlStream.SAMPLE), 7):
+                    stream.feed(HtmlStream.SAMPLE[i:i + 7])
+                    if not isinstance(stream.new_text(), str):
+                        raise TypeError("unexpected html2text output")
+                HtmlStream._supported = stream.finish() == WebBrowser.html_converter().handle(HtmlStream.SAMPLE)
+            except Exception:
+                HtmlStream._supported = False
+        return HtmlStream._supported
+
 class WebBrowser:
     """Terminal-based web browser using curses"""
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    POOL_HOSTS = 8        # Hosts with a pool of kept-alive connections
+    POOL_SIZE = 8         # Connections kept per host
+    RETRIES = 2           # Retries for connection errors and 429/5xx on GET
+    RETRY_BACKOFF = 0.3   # Seconds, doubled per retry
     
-    def __init__(self):
+    # Top search results are fetched and rendered in the background while the results are shown
+    PREFETCH_RESULTS = 3
+    PREFETCH_WORKERS = 2
+    PREFETCH_PAGE_BYTES = 1024 * 1024      # Larger pages are left for a normal fetch
+    PREFETCH_QUERY_BYTES = 4 * 1024 * 1024 # Download budget per search
+    PREFETCH_RATE = 1024 * 1024            # Bytes per second across all prefetches
+    PREFETCH_MEMORY = 4 * 1024 * 1024      # Rendered text held for the current results
+    
+    # Pages are converted while they download; the page screen shows what has arrived so far
+    CHUNK_SIZE = 64 * 1024
+    PROGRESS_INTERVAL = 0.1                # Seconds between partial renders
+    MAX_PAGE_BYTES = 8 * 1024 * 1024       # The rest of a larger page is never downloaded
+    
+    # file:// pages are files in the user's home; the URL path is relative to it ("/docs/index.md")
+    LOCAL_TYPES = {'.html': 'html', '.htm': 'html', '.xhtml': 'html',
+                   '.md': 'markdown', '.markdown': 'markdown', '.txt': 'text'}
+    LINK_PATTERN = re.compile(r'\[([^\]\n]*)\]\(([^)\s]+)(?:\s+"[^"\n]*")?\)')  # [text](target "title")
+    _session = None       # Shared by every browser request (and every browser run)
+    _session_lock = threading.Lock()
+    
+    @staticmethod
+    def session():
+        """The shared keep-alive session, created on first use"""
+        with WebBrowser._session_lock:
+            if WebBrowser._session is None:
+                retry = Retry(total=WebBrowser.RETRIES, backoff_factor=WebBrowser.RETRY_BACKOFF,
+                              status_forcelist=(429, 500, 502, 503, 504), allowed_methods=frozenset({'GET', 'HEAD'}),
+                              raise_on_status=False)
+                adapter = HTTPAdapter(pool_connections=WebBrowser.POOL_HOSTS, pool_maxsize=WebBrowser.POOL_SIZE,
+                                      max_retries=retry)
+                session = requests.Session()
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                # requests offers gzip/deflate, plus br when brotli is installed to decode it
+                session.headers['User-Agent'] = WebBrowser.USER_AGENT
+                WebBrowser._session = session
+            return WebBrowser._session
+    
+    def __init__(self, start_url=None):
+        self.start_url = start_url    # Opened instead of asking for a search
+        self.history = []             # (url, scroll offset) of pages left by following a link
+        self.selected_link = None     # (line, start, end, target) highlighted on the page
         self.search_results = []
         self.current_page = 0
         self.results_per_page = 10
@@ -3852,6 +6277,15 @@ class WebBrowser:
         self.scroll_offset = 0
         self.mode = "search"  # "search" or "page"
         self.search_query = ""
+        self.page_loading = False
+        self._page_cancel = None      # Event stopping the page load in progress
+        self._prefetch_pool = None
+        self._prefetch_lock = threading.Lock()
+        self._prefetch_tasks = {}     # url -> (future, cancel event) for the current results
+        self._prefetched = {}         # url -> rendered lines, taken by fetch_page
+        self._prefetched_size = 0
+        self._prefetch_bytes = 0      # Downloaded for the current results
+        self._prefetch_started = 0.0
         
     def google_search(self, query):
         """Perform a Google search and return results"""
@@ -3859,11 +6293,7 @@ class WebBrowser:
             return []
         
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            url = f"https://www.google.com/search?q={query}"
-            response = requests.get(url, headers=headers, timeout=10)
+            response = WebBrowser.session().get("https://www.google.com/search", params={'q': query}, timeout=10)
             soup = BeautifulSoup(response.text, 'html.parser')
             
             results = []
@@ -3891,27 +6321,342 @@ class WebBrowser:
         except Exception as e:
             return [{'title': f'Search Error: {str(e)}', 'url': '', 'description': ''}]
     
-    def fetch_page(self, url):
-        """Fetch and convert webpage to text"""
+    @staticmethod
+    def html_converter():
+        h = html2text.HTML2Text()
+        h.ignore_links = False
+        h.ignore_images = True
+        h.ignore_emphasis = False
+        h.body_width = 0  # No wrapping
+        return h
+    
+    @staticmethod
+    def render_html(html):
+        """Convert HTML to display lines"""
+        text = WebBrowser.html_converter().handle(html)
+        return text.split('\n')
+    
+    @staticmethod
+    def stream_html(response, max_bytes, keep_going=None, progress=None):
+        """
+        Convert a streamed HTML response chunk by chunk. progress(lines) gets
+        the lines finished so far every PROGRESS_INTERVAL. Returns (lines,
+        complete), complete being False when the body was cut at max_bytes,
+        or None as soon as keep_going(chunk_size) returns False. When the
+        installed html2text can't be fed in pieces (see HtmlStream), the
+        body is rendered with render_html once it has arrived.
+        """
+        stream = HtmlStream() if HtmlStream.supported() else None
+        try:
+            decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+        except LookupError:
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        
+        document = []     # Decoded HTML, only kept without a stream
+        lines = []        # Complete lines shown while loading
+        partial = ""      # Text after the last newline
+        size = 0
+        complete = True
+        last_progress = time.monotonic()
+        for chunk in response.iter_content(WebBrowser.CHUNK_SIZE):
+            if keep_going is not None and not keep_going(len(chunk)):
+                return None
+            size += len(chunk)
+            if size > max_bytes:
+                chunk = chunk[:len(chunk) - (size - max_bytes)]
+                complete = False
+            
+            if stream is None:
+                document.append(decoder.decode(chunk))
+            else:
+                stream.feed(decoder.decode(chunk))
+                if progress is not None and time.monotonic() - last_progress >= WebBrowser.PROGRESS_INTERVAL:
+                    new_lines = (partial + stream.new_text()).split('\n')
+                    partial = new_lines.pop()
+                    lines.extend(new_lines)
+                    progress(lines)
+                    last_progress = time.monotonic()
+            
+            if not complete:
+                if stream is not None:
+                    stream.drop_pending()  # Drop the tag cut in half
+                break
+        
+        if stream is None:
+            document.append(decoder.decode(b'', final=True))
+            return WebBrowser.render_html(''.join(document)), complete
+        stream.feed(decoder.decode(b'', final=True))
+        return stream.finish().split('\n'), complete
+    
+    def search(self, query):
+        """Run a search, reset the results view and start prefetching the top results"""
+        self.cancel_prefetch()
+        self.history = []
+        self.search_results = self.google_search(query)
+        self.selected_index = 0
+        self.current_page = 0
+        self.start_prefetch([result['url'] for result in self.search_results[:WebBrowser.PREFETCH_RESULTS] if result['url']])
+    
+    def start_prefetch(self, urls):
+        """Fetch and render urls in the background for fetch_page to pick up"""
+        if self._prefetch_pool is None:
+            self._prefetch_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=WebBrowser.PREFETCH_WORKERS, thread_name_prefix="prefetch")
+        with self._prefetch_lock:
+            self._prefetch_bytes = 0
+            self._prefetch_started = time.monotonic()
+            for url in urls:
+                cached = PageCache.get(url)
+                if url in self._prefetch_tasks or (cached is not None and PageCache.is_fresh(cached)):
+                    continue
+                cancel = threading.Event()
+                self._prefetch_tasks[url] = (self._prefetch_pool.submit(self._prefetch, url, cancel), cancel)
+    
+    def cancel_prefetch(self):
+        """Stop every prefetch (queued ones never start, running ones stop at their next chunk)"""
+        with self._prefetch_lock:
+            for future, cancel in self._prefetch_tasks.values():
+                cancel.set()
+                future.cancel()
+            self._prefetch_tasks = {}
+            self._prefetched = {}
+            self._prefetched_size = 0
+    
+    def close(self):
+        """Cancel page loads and prefetches and release the worker threads"""
+        self.stop_loading()
+        self.cancel_prefetch()
+        if self._prefetch_pool is not None:
+            self._prefetch_pool.shutdown(wait=False)
+            self._prefetch_pool = None
+    
+    def _prefetch_allowance(self, size):
+        """Account for downloaded bytes, sleeping to hold PREFETCH_RATE; False once the budget is spent"""
+        with self._prefetch_lock:
+            self._prefetch_bytes += size
+            within_budget = self._prefetch_bytes <= WebBrowser.PREFETCH_QUERY_BYTES
+            delay = self._prefetch_bytes / WebBrowser.PREFETCH_RATE - (time.monotonic() - self._prefetch_started)
+        if delay > 0:
+            time.sleep(min(delay, 1.0))
+        return within_budget
+    
+    def _prefetch(self, url, cancel):
+        """Worker: download within the caps, render, and keep the lines unless cancelled"""
+        try:
+            with WebBrowser.session().get(url, timeout=15, stream=True) as response:
+                if response.status_code != 200 or 'html' not in response.headers.get('Content-Type', 'text/html'):
+                    return
+                rendered = WebBrowser.stream_html(response, WebBrowser.PREFETCH_PAGE_BYTES,
+                    keep_going=lambda size: not cancel.is_set() and self._prefetch_allowance(size))
+                headers = response.headers
+        except requests.RequestException:
+            return
+        
+        if rendered is None or not rendered[1] or cancel.is_set():
+            return
+        lines = rendered[0]
+        PageCache.store(url, lines, headers)
+        
+        # Also held here, so pages the cache may not keep (no-store, no-cache) still open instantly
+        size = sum(len(line) + 1 for line in lines)
+        with self._prefetch_lock:
+            if not cancel.is_set() and self._prefetched_size + size <= WebBrowser.PREFETCH_MEMORY:
+                self._prefetched[url] = lines
+                self._prefetched_size += size
+    
+    def _take_prefetched(self, url):
+        """Rendered lines prefetched for url, or None (a prefetch still running is cancelled)"""
+        with self._prefetch_lock:
+            task = self._prefetch_tasks.pop(url, None)
+            lines = self._prefetched.pop(url, None)
+            if lines is not None:
+                self._prefetched_size -= sum(len(line) + 1 for line in lines)
+            elif task is not None:
+                task[1].set()
+                task[0].cancel()
+        return lines
+    
+    @staticmethod
+    def local_url(path):
+        """file:// URL of a path inside the user's home, or None if it is outside"""
+        root = os.path.realpath(VariableManager.get_user_root(current_user))
+        path = os.path.realpath(path)
+        if not path.startswith(root + os.sep):
+            return None
+        return "file://" + urllib.parse.quote('/' + os.path.relpath(path, root).replace(os.sep, '/'))
+    
+    @staticmethod
+    def local_path(url):
+        """Absolute path of a file:// URL, or None if it leads outside the user's home"""
+        relative = posixpath.normpath('/' + urllib.parse.unquote(urllib.parse.urlsplit(url).path))
+        root = os.path.realpath(VariableManager.get_user_root(current_user))
+        path = os.path.realpath(os.path.join(root, relative.lstrip('/')))
+        if path != root and not path.startswith(root + os.sep):
+            return None  # A symlink pointing out of the home
+        return path
+    
+    def fetch_local(self, url):
+        """Render a local HTML/Markdown/text file; conversions are cached by mtime and size"""
+        path = WebBrowser.local_path(url)
+        if path is None:
+            return [f"Error: {url} is outside your home directory"]
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            return [f"Error loading page: {str(e)}"]
+        
+        # Keyed by absolute path: the same URL means a different file for another user
+        cache_key = "file://" + urllib.parse.quote(path.replace(os.sep, '/'))
+        validator = f"{stat.st_mtime_ns}-{stat.st_size}"
+        cached = PageCache.get(cache_key)
+        if cached is not None and cached.get('etag') == validator:
+            return cached['lines']
+        
+        kind = WebBrowser.LOCAL_TYPES.get(os.path.splitext(path)[1].lower())
+        if kind is None:
+            return ["Error: only HTML, Markdown and text files can be opened"]
+        if kind == 'html' and not html2text:
+            return ["Error: html2text is required for HTML files (pip install html2text)"]
+        try:
+            with open(path, 'rb') as f:
+                data = f.read(WebBrowser.MAX_PAGE_BYTES + 1)
+        except OSError as e:
+            return [f"Error loading page: {str(e)}"]
+        
+        text = data[:WebBrowser.MAX_PAGE_BYTES].decode('utf-8', errors='replace')
+        lines = WebBrowser.render_html(text) if kind == 'html' else text.split('\n')
+        if len(data) > WebBrowser.MAX_PAGE_BYTES:
+            lines.append(f"[File truncated at {WebBrowser.MAX_PAGE_BYTES / (1024 * 1024):g} MB]")
+        else:
+            # The validator is checked on every open, so the entry never needs to be "fresh"
+            PageCache.store(cache_key, lines, {'ETag': validator, 'Cache-Control': 'no-cache'})
+        return lines
+    
+    def resolve_link(self, target):
+        """Absolute URL for a link on the current page, or None if it can't be opened here"""
+        if self.current_url.startswith("file://") and not urllib.parse.urlsplit(target).scheme:
+            path = urllib.parse.urlsplit(target).path
+            if not path:
+                return None  # Same-page anchor
+            current_dir = posixpath.dirname(urllib.parse.unquote(urllib.parse.urlsplit(self.current_url).path))
+            return "file://" + urllib.parse.quote(posixpath.normpath(posixpath.join(current_dir, urllib.parse.unquote(path))))
+        url = urllib.parse.urldefrag(urllib.parse.urljoin(self.current_url, target))[0]
+        if urllib.parse.urlsplit(url).scheme not in ("http", "https", "file"):
+            return None
+        return url
+    
+    def follow_link(self):
+        """Open the highlighted link, remembering the current page for Backspace"""
+        if self.selected_link is None:
+            return
+        url = self.resolve_link(self.selected_link[3])
+        if url:
+            self.history.append((self.current_url, self.scroll_offset))
+            self.open_page(url)
+    
+    def select_link(self, step, visible_height):
+        """Highlight the next (step 1) or previous (step -1) link, scrolling to it"""
+        if self.selected_link is not None and self.scroll_offset <= self.selected_link[0] < self.scroll_offset + visible_height:
+            line_idx, start, end, _ = self.selected_link
+        else:
+            line_idx, start, end = (self.scroll_offset, -1, -1) if step > 0 else (self.scroll_offset + visible_height - 1, 1 << 30, 1 << 30)
+        
+        lines = self.page_content
+        while 0 <= line_idx < len(lines):
+            matches = [m for m in WebBrowser.LINK_PATTERN.finditer(lines[line_idx])
+                       if (m.start() > start if step > 0 else m.start() < start)]
+            if matches:
+                match = matches[0] if step > 0 else matches[-1]
+                self.selected_link = (line_idx, match.start(), match.end(), match.group(2))
+                if not self.scroll_offset <= line_idx < self.scroll_offset + visible_height:
+                    self.scroll_offset = max(0, line_idx - visible_height // 2)
+                return
+            line_idx += step
+            start = -1 if step > 0 else 1 << 30
+    
+    def go_back(self):
+        """Return to the previous page, or to the search results"""
+        self.stop_loading()
+        if self.history:
+            url, scroll_offset = self.history.pop()
+            self.open_page(url)
+            self.scroll_offset = scroll_offset
+        else:
+            self.mode = "search"
+            self.scroll_offset = 0
+    
+    def open_page(self, url):
+        """Switch to the page screen and load url in the background, showing it as it arrives"""
+        self.stop_loading()
+        self.current_url = url
+        self.scroll_offset = 0
+        self.selected_link = None
+        self.mode = "page"
+        self.page_content = []
+        self.page_loading = True
+        
+        cancel = threading.Event()
+        self._page_cancel = cancel
+        
+        def show(lines):
+            if not cancel.is_set():
+                self.page_content = lines
+        
+        def load():
+            lines = self.fetch_page(url, progress=show, cancel=cancel)
+            if lines is not None and not cancel.is_set():
+                self.page_content = lines
+                self.page_loading = False
+        
+        threading.Thread(target=load, daemon=True).start()
+    
+    def stop_loading(self):
+        """Abandon the page load in progress, if any"""
+        if self._page_cancel is not None:
+            self._page_cancel.set()
+            self._page_cancel = None
+        self.page_loading = False
+    
+    def fetch_page(self, url, progress=None, cancel=None):
+        """
+        Fetch and convert webpage to text; prefetched and fresh cached pages
+        skip the network. Downloads are converted as they stream in (see
+        stream_html) and cut at MAX_PAGE_BYTES. Returns None if cancel is set
+        before the page is complete.
+        """
+        if url.startswith("file://"):
+            return self.fetch_local(url)
         if not requests or not html2text:
             return ["Error: Web browser dependencies not installed"]
         
+        prefetched = self._take_prefetched(url)
+        if prefetched is not None:
+            return prefetched
+        
+        cached = PageCache.get(url)
+        if cached is not None and PageCache.is_fresh(cached):
+            return cached['lines']
+        
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=15)
-            
-            h = html2text.HTML2Text()
-            h.ignore_links = False
-            h.ignore_images = True
-            h.ignore_emphasis = False
-            h.body_width = 0  # No wrapping
-            
-            text = h.handle(response.text)
-            lines = text.split('\n')
-            
-            return lines
+            with WebBrowser.session().get(url, headers=PageCache.validators(cached), timeout=15, stream=True) as response:
+                if response.status_code == 304 and cached is not None:
+                    PageCache.revalidated(cached, response.headers)
+                    return cached['lines']
+                
+                rendered = WebBrowser.stream_html(response, WebBrowser.MAX_PAGE_BYTES,
+                    keep_going=None if cancel is None else lambda size: not cancel.is_set(), progress=progress)
+                if rendered is None:
+                    return None
+                lines, complete = rendered
+                if not complete:
+                    lines.append(f"[Page truncated at {WebBrowser.MAX_PAGE_BYTES / (1024 * 1024):g} MB]")
+                elif response.status_code == 200:
+                    PageCache.store(url, lines, response.headers)
+                return lines
+        except requests.RequestException as e:
+            if cached is not None:
+                return cached['lines']  # Offline: the stored copy beats an error
+            return [f"Error loading page: {str(e)}"]
         except Exception as e:
             return [f"Error loading page: {str(e)}"]
     
@@ -4044,13 +6789,16 @@ class WebBrowser:
                 line = self.page_content[line_idx]
                 try:
                     stdscr.addstr(content_start_y + i, 0, line[:width])
+                    if self.selected_link is not None and self.selected_link[0] == line_idx and self.selected_link[1] < width:
+                        _, start, end, _ = self.selected_link
+                        stdscr.addstr(content_start_y + i, start, line[start:min(end, width)], curses.A_REVERSE)
                 except curses.error:
                     pass
         
         # Help bar
         help_y = height - 1
-        scroll_info = f"[Line {self.scroll_offset + 1}/{len(self.page_content)}] "
-        help_text = f" ↑/↓: Scroll | PgUp/PgDn: Page | Backspace: Back | ^N: New Search | Esc: Exit {scroll_info}"
+        scroll_info = f"[Line {self.scroll_offset + 1}/{len(self.page_content)}{' Loading...' if self.page_loading else ''}] "
+        help_text = f" ↑/↓: Scroll | PgUp/PgDn: Page | Tab: Links | Enter: Open | Backspace: Back | ^N: New Search | Esc: Exit {scroll_info}"
         full_line = help_text[:width].ljust(width)
         try:
             stdscr.addstr(help_y, 0, full_line[:width], curses.color_pair(3))
@@ -4122,17 +6870,25 @@ class WebBrowser:
         stdscr.keypad(True)
         stdscr.timeout(100)
         
-        # Get initial search query
-        self.search_query = self.get_search_input(stdscr)
-        
-        if not self.search_query:
-            return
-        
-        # Perform search
-        self.search_results = self.google_search(self.search_query)
-        self.selected_index = 0
-        self.current_page = 0
+        if self.start_url:
+            self.open_page(self.start_url)
+        else:
+            # Get initial search query
+            self.search_query = self.get_search_input(stdscr)
+            
+            if not self.search_query:
+                return
+            
+            # Perform search
+            self.search(self.search_query)
         
+        try:
+            self._browse(stdscr)
+        finally:
+            self.close()
+    
+    def _browse(self, stdscr):
+        """Search results and page screens until Escape"""
         while True:
             height, width = stdscr.getmaxyx()
             
@@ -4178,17 +6934,12 @@ class WebBrowser:
                     if self.search_results and self.selected_index < len(self.search_results):
                         result = self.search_results[self.selected_index]
                         if result['url']:
-                            self.current_url = result['url']
-                            self.page_content = self.fetch_page(self.current_url)
-                            self.scroll_offset = 0
-                            self.mode = "page"
+                            self.open_page(result['url'])
                 
                 elif ch == 14:  # Ctrl+N
                     self.search_query = self.get_search_input(stdscr)
                     if self.search_query:
-                        self.search_results = self.google_search(self.search_query)
-                        self.selected_index = 0
-                        self.current_page = 0
+                        self.search(self.search_query)
                 
                 elif ch == 27:  # Escape
                     break
@@ -4223,16 +6974,23 @@ class WebBrowser:
                     self.scroll_offset = min(len(self.page_content) - visible_height, 
                                             self.scroll_offset + visible_height)
                 
+                elif ch == 9:  # Tab
+                    self.select_link(1, visible_height)
+                
+                elif ch == curses.KEY_BTAB:
+                    self.select_link(-1, visible_height)
+                
+                elif ch in (ord('\n'), ord('\r'), curses.KEY_ENTER, 10, 13):
+                    self.follow_link()
+                
                 elif ch in (curses.KEY_BACKSPACE, 127, 8):
-                    self.mode = "search"
-                    self.scroll_offset = 0
+                    self.go_back()
                 
                 elif ch == 14:  # Ctrl+N
                     self.search_query = self.get_search_input(stdscr)
                     if self.search_query:
-                        self.search_results = self.google_search(self.search_query)
-                        self.selected_index = 0
-                        self.current_page = 0
+                        self.stop_loading()
+                        self.search(self.search_query)
                         self.mode = "search"
                 
                 elif ch == 27:  # Escape
@@ -4240,6 +6998,7 @@ class WebBrowser:
                 
 class CommandRegistry:
     commands = {}
+    version = 0  # Bumped on every registration; rendered help is only valid for one version
     
     @staticmethod
     def register(name, category="MISC", description="", usage="", examples=None):
@@ -4251,10 +7010,19 @@ class CommandRegistry:
                 'usage': usage,
                 'examples': examples or []
             }
+            CommandRegistry.version += 1
             return func
         return decorator
 
 class Command:
+    MAX_HELP_WIDTH = 100
+    MAX_HELP_MATCHES = 8
+    
+    # Rendered help keyed by (command name, or None for the list, width)
+    _help_cache = {}
+    _help_cache_version = -1
+    _help_words = None  # Description word -> command names, for fuzzy lookup
+    
     @staticmethod
     def valid_commands():
         """Get list of valid commands from registry"""
@@ -4297,14 +7065,42 @@ class Command:
         
         return has_digit and all_allowed
 
-    @staticmethod  
-    def get_command_list():
+    @staticmethod
+    def _sync_help_cache():
+        """Drop rendered help and the lookup index if commands were registered since"""
+        if Command._help_cache_version != CommandRegistry.version:
+            Command._help_cache = {}
+            Command._help_words = None
+            Command._help_cache_version = CommandRegistry.version
+
+    @staticmethod
+    def _cached_help(key, render):
+        """Rendered help for key, rendering it only on a miss"""
+        Command._sync_help_cache()
+        text = Command._help_cache.get(key)
+        if text is None:
+            text = Command._help_cache[key] = render()
+        return text
+
+    @staticmethod
+    def help_width():
+        """Width help text is laid out for"""
+        try:
+            columns = shutil.get_terminal_size().columns
+        except:
+            columns = Command.MAX_HELP_WIDTH
+        return max(40, min(Command.MAX_HELP_WIDTH, columns - 1))
+
+    @staticmethod
+    def get_command_list(width=None):
+        width = width or Command.help_width()
+        return Command._cached_help((None, width), lambda: Command._render_command_list(width))
+
+    @staticmethod
+    def _render_command_list(max_line_width):
         commands = Command.get_commands()
         result_lines = []
         
-        # Define max width for command display
-        max_line_width = 100
-        
         category_count = 0
         total_categories = len(commands)
         
@@ -4332,21 +7128,61 @@ class Command:
             
             # Add visual separation after each category except the last
             if category_count <= total_categories:
-                result_lines.append("\n" + "─" * 85)
+                result_lines.append("\n" + "─" * min(85, max_line_width))
         
         return "\n".join(result_lines)
 
+    @staticmethod
+    def find_commands(partial):
+        """
+        Commands matching a partial name, best first: name prefixes, then
+        names containing it, then near spellings, then description words
+        """
+        partial = partial.lower()
+        Command._sync_help_cache()
+        if Command._help_words is None:
+            words = {}
+            for name, cmd_info in CommandRegistry.commands.items():
+                for word in re.findall(r'[a-z0-9]+', cmd_info['description'].lower()):
+                    words.setdefault(word, []).append(name)
+            Command._help_words = words
+        
+        names = sorted(CommandRegistry.commands, key=lambda name: (len(name), name))
+        matches = [name for name in names if name.startswith(partial)]
+        matches += [name for name in names if partial in name and name not in matches]
+        matches += [name for name in difflib.get_close_matches(partial, names, n=3, cutoff=0.7) if name not in matches]
+        if len(partial) >= 3:
+            for word, word_names in Command._help_words.items():
+                if word.startswith(partial):
+                    matches += [name for name in word_names if name not in matches]
+        return matches[:Command.MAX_HELP_MATCHES]
+
     @staticmethod
     def show_command_help(command_name):
-        """Show detailed help for a specific command"""
+        """Show detailed help for a command, or the closest matches to a partial name"""
+        command_name = command_name.lower()
         if command_name not in CommandRegistry.commands:
-            System.throw_error(f"COMMAND '{command_name}' NOT FOUND")
-            return
+            matches = Command.find_commands(command_name)
+            if not matches:
+                System.throw_error(f"COMMAND '{command_name}' NOT FOUND")
+                return
+            if len(matches) > 1:
+                help_text = f"{Fore.MAGENTA}<_ MATCHES FOR '{command_name.upper()}' _>{Style.RESET_ALL}\n"
+                for name in matches:
+                    help_text += f"\n{Text.INDENT}/> {Fore.MAGENTA}{name.ljust(10)}{Style.RESET_ALL} {CommandRegistry.commands[name]['description']}"
+                Sound.play_and_print("help", help_text)
+                return
+            command_name = matches[0]
         
+        width = Command.help_width()
+        Sound.play_and_print("help", Command._cached_help((command_name, width), lambda: Command._render_command_help(command_name, width)))
+
+    @staticmethod
+    def _render_command_help(command_name, width):
         cmd_info = CommandRegistry.commands[command_name]
-        help_text = f"{Fore.MAGENTA}<_ {command_name.upper()} _>{Style.RESET_ALL}\n"
-        help_text += f"\n{cmd_info['category']} <> "
-        help_text += f"{cmd_info['description']}\n\n"
+        help_text = f"{Fore.MAGENTA}<_ {command_name.upper()} _>{Style.RESET_ALL}\n\n"
+        description = f"{cmd_info['category']} <> {cmd_info['description']}"
+        help_text += "\n".join(textwrap.fill(line, width) for line in description.split("\n")) + "\n\n"
         
         # Format usage with magenta color for command text
         usage_lines = cmd_info['usage'].split('\n')
@@ -4360,8 +7196,8 @@ class Command:
             for example in cmd_info['examples']:
                 # Add "/> " prefix and apply magenta color to the command
                 help_text += f"\n{Text.INDENT}/> {Fore.MAGENTA}{example}{Style.RESET_ALL}"
-
-        Sound.play_and_print("help", help_text)
+        
+        return help_text
 
     @staticmethod
     def resolve_inline_commands(command, user):
@@ -4524,11 +7360,17 @@ class Command:
                 # Now remove spaces for mathematical processing
                 expression = expression.replace(' ', '')
                 
+                # LIST values become parameters _0, _1, ... and the expression is applied element-wise
+                list_values = []
+                
                 # Handle "result" keyword
                 if "result" in expression.lower():
                     if last_command_result and last_command_result[1] == DataType.NUMBER:
                         expression = re.sub(r'\bresult\b', str(last_command_result[0]), 
                                         expression, flags=re.IGNORECASE)
+                    elif last_command_result and last_command_result[1] == DataType.LIST:
+                        expression = re.sub(r'\bresult\b', f"_{len(list_values)}", expression, flags=re.IGNORECASE)
+                        list_values.append(last_command_result[0])
                     else:
                         System.throw_error("NO NUMERIC RESULT AVAILABLE OR RESULT NOT A NUMBER")
                         return
@@ -4536,8 +7378,12 @@ class Command:
                 # Handle variables
                 for var_name in re.findall(r'[\$#]\w+', expression):
                     var = VariableManager.get_variable(var_name)
+                    var_pattern = re.escape(var_name) + r'(?!\w)'
                     if var and var.type == DataType.NUMBER:
-                        expression = expression.replace(var_name, str(var.value))
+                        expression = re.sub(var_pattern, str(var.value), expression)
+                    elif var and var.type == DataType.LIST:
+                        expression = re.sub(var_pattern, f"_{len(list_values)}", expression)
+                        list_values.append(var.value)
                     else:
                         System.throw_error(f"Variable '{var_name}' not found or not a number")
                         return
@@ -4545,11 +7391,23 @@ class Command:
                 # Validate and calc
                 expression = expression.replace('^', '**')
                 allowed_chars = set('0123456789+-*/.%()')
-                if not all(char in allowed_chars for char in expression):
+                if not all(char in allowed_chars for char in re.sub(r'_\d+', '0', expression)):
                     System.throw_error("INVALID CHARACTERS IN EXPRESSION")
                     return
                 
                 try:
+                    if list_values:
+                        if len(set(map(len, list_values))) > 1:
+                            System.throw_error("LISTS IN EXPRESSION HAVE DIFFERENT LENGTHS")
+                            return
+                        params = ", ".join(f"_{i}" for i in range(len(list_values)))
+                        element = eval(f"lambda {params}: {expression}", {"__builtins__": {}})
+                        result = array('d', map(element, *list_values))
+                        last_command_result = (result, DataType.LIST)
+                        if should_print:
+                            System.show_result(result)
+                        return
+                    
                     result = eval(expression)
                     last_command_result = (result, DataType.NUMBER)
                     if should_print:
@@ -4561,9 +7419,23 @@ class Command:
                 return
 
             try:
+                if cmd == "range":
+                    result = Command.number_range([ArgumentResolver.resolve_argument(arg, DataType.NUMBER) for arg in args])
+                    last_command_result = (result, DataType.LIST)
+                    if should_print:
+                        System.show_result(result)
+                    return
+                
                 numbers = []
                 for arg in args:
-                    numbers.append(ArgumentResolver.resolve_argument(arg, DataType.NUMBER))
+                    numbers.append(ArgumentResolver.resolve_numeric(arg))
+                
+                if any(isinstance(number, array) for number in numbers):
+                    result = Command.list_math(cmd, numbers)
+                    last_command_result = (result, DataType.LIST if isinstance(result, array) else DataType.NUMBER)
+                    if should_print:
+                        System.show_result(result)
+                    return
                 
                 min_args = 2 if cmd not in ["sqrt", "factorial"] else 1
                 if len(numbers) < min_args:
@@ -4623,6 +7495,79 @@ class Command:
         except Exception as e:
             System.throw_error(f"ERROR: {str(e).upper()}")
         
+    # Element-wise forms of the binary MATH commands
+    LIST_OPERATORS = {
+        "add": lambda a, b: a + b,
+        "subtract": lambda a, b: a - b,
+        "multiply": lambda a, b: a * b,
+        "divide": lambda a, b: a / b,
+        "exponent": lambda a, b: a ** b,
+    }
+    MAX_LIST_LENGTH = 10_000_000
+
+    @staticmethod
+    def number_range(bounds):
+        """range <stop> | <start> <stop> [step] as an array('d')"""
+        if not 1 <= len(bounds) <= 3:
+            raise ValueError("range takes 1 to 3 numbers")
+        start, stop, step = (0.0, bounds[0], 1.0) if len(bounds) == 1 else (bounds[0], bounds[1], bounds[2] if len(bounds) == 3 else 1.0)
+        if step == 0:
+            raise ValueError("range step cannot be zero")
+        # Rounding can leave (stop - start) / step a hair above a whole number (2.1 / 0.3 -> 7.000000000000001),
+        # which would add an item equal to the exclusive stop; anything within a billionth of a step counts as reached
+        count = max(0, math.ceil((stop - start) / step - 1e-9))
+        if count > Command.MAX_LIST_LENGTH:
+            raise ValueError(f"range would have {count} items, the limit is {Command.MAX_LIST_LENGTH}")
+        return array('d', (start + i * step for i in range(count)))
+
+    @staticmethod
+    def list_math(cmd, numbers):
+        """
+        MATH command over arguments where at least one is a LIST: average
+        reduces everything to one number, sqrt/factorial map over the list, and
+        the binary commands combine lists element-wise (numbers broadcast)
+        """
+        lists = [number for number in numbers if isinstance(number, array)]
+        
+        if cmd == "average":
+            count = sum(len(number) if isinstance(number, array) else 1 for number in numbers)
+            if count == 0:
+                raise ValueError("cannot average an empty list")
+            return math.fsum(math.fsum(number) if isinstance(number, array) else number for number in numbers) / count
+        
+        if cmd in ("sqrt", "factorial"):
+            if len(numbers) != 1:
+                raise ValueError(f"{cmd} requires exactly 1 list")
+            values = numbers[0]
+            if values and min(values) < 0:
+                raise ValueError("cannot take square root of negative number" if cmd == "sqrt" else "factorial requires non-negative numbers")
+            if cmd == "sqrt":
+                return array('d', map(math.sqrt, values))
+            if any(value != int(value) for value in values):
+                raise ValueError("factorial requires integers")
+            return array('d', (float(math.factorial(int(value))) if value <= 170 else math.inf for value in values))
+        
+        if len(numbers) < 2:
+            raise ValueError(f"at least 2 values required for '{cmd}'")
+        if len(set(map(len, lists))) > 1:
+            raise ValueError(f"lists have different lengths ({', '.join(str(len(values)) for values in lists)})")
+        
+        operator = Command.LIST_OPERATORS[cmd]
+        result = numbers[0]
+        try:
+            for number in numbers[1:]:
+                if isinstance(result, array) and isinstance(number, array):
+                    result = array('d', map(operator, result, number))
+                elif isinstance(result, array):
+                    result = array('d', [operator(value, number) for value in result])
+                else:
+                    result = array('d', [operator(result, value) for value in number])
+        except ZeroDivisionError:
+            raise ValueError("division by zero not allowed")
+        except (TypeError, OverflowError):
+            raise ValueError("result is not a real number")
+        return result
+
     @staticmethod
     def process_io_command(cmd, args):
         """Process I/O file commands - always displays visual output"""
@@ -5289,16 +8234,13 @@ class Command:
                         continue
                     
                     if var_name.startswith('$'):
-                        if var_name in persistent_variables:
-                            del persistent_variables[var_name]
-                            VariableManager.save_persistent_variables(current_user)
+                        if VariableManager.forget_variable(var_name):
                             System.print_instant(f"DELETED PERSISTENT VARIABLE: {var_name}")
                             deleted_count += 1
                         else:
                             System.print_instant(f"PERSISTENT VARIABLE NOT FOUND: {var_name}", is_error=True)
                     else:  # var_name.startswith('#')
-                        if var_name in session_variables:
-                            del session_variables[var_name]
+                        if VariableManager.forget_variable(var_name):
                             System.print_instant(f"DELETED SESSION VARIABLE: {var_name}")
                             deleted_count += 1
                         else:
@@ -5315,7 +8257,7 @@ class Command:
                     output += "PERSISTENT ($):\n"
                     for name, var in sorted(persistent_variables.items()):
                         type_str = var.type.value.upper()
-                        output += f"{Text.INDENT}{Fore.MAGENTA}{name:<15}{Style.RESET_ALL} {Fore.MAGENTA}[{type_str:<9}]{Style.RESET_ALL} = {var.value}\n"
+                        output += f"{Text.INDENT}{Fore.MAGENTA}{name:<15}{Style.RESET_ALL} {Fore.MAGENTA}[{type_str:<9}]{Style.RESET_ALL} = {NumberFormatter.format_value(var.value)}\n"
                 else:
                     output += "PERSISTENT ($): None\n"
                 
@@ -5326,7 +8268,7 @@ class Command:
                     output += "SESSION (#):\n"
                     for name, var in sorted(session_variables.items()):
                         type_str = var.type.value.upper()
-                        output += f"{Text.INDENT}{Fore.MAGENTA}{name:<15}{Style.RESET_ALL} {Fore.MAGENTA}[{type_str:<9}]{Style.RESET_ALL} = {var.value}\n"
+                        output += f"{Text.INDENT}{Fore.MAGENTA}{name:<15}{Style.RESET_ALL} {Fore.MAGENTA}[{type_str:<9}]{Style.RESET_ALL} = {NumberFormatter.format_value(var.value)}\n"
                 else:
                     output += "SESSION (#): None\n"
                 
@@ -5382,8 +8324,8 @@ class Command:
                 if not Command.is_valid_command(left_part) and not left_part.startswith('/'):
                     # Check if it's NOT a variable reference or "result"
                     if not (left_part.startswith('$') or left_part.startswith('#') or left_part.lower() == "result"):
-                        # Check if it's NOT a single quoted string
-                        if not (left_part.startswith('"') and left_part.endswith('"')):
+                        # Check if it's NOT a single quoted string or list literal
+                        if not (left_part.startswith('"') and left_part.endswith('"')) and not (left_part.startswith('[') and left_part.endswith(']')):
                             # Check if it's NOT a single number
                             if not re.match(r'^-?\d+\.?\d*$', left_part):
                                 # Split and check for multiple tokens (excluding operators in expressions)
@@ -5439,6 +8381,11 @@ class Command:
                     value = left_part[1:-1]
                     var_type = DataType.STRING
                 
+                # Try to parse as list literal
+                elif left_part.startswith('[') and left_part.endswith(']'):
+                    value = ArgumentResolver.parse_list(left_part)
+                    var_type = DataType.LIST
+                
                 # Try to parse as directory path
                 elif left_part.startswith('/'):
                     user_root = VariableManager.get_user_root(current_user)
@@ -5535,10 +8482,10 @@ class Command:
             
             # Show the assignment message (NOT the value itself)
             if len(var_names) == 1:
-                System.show_result(f"VARIABLE '{var_names[0]}' SET TO {value}")
+                System.show_result(f"VARIABLE '{var_names[0]}' SET TO {NumberFormatter.format_value(value)}")
             else:
                 var_list = ", ".join(var_names)
-                System.show_result(f"VARIABLES {var_list} SET TO {value}")
+                System.show_result(f"VARIABLES {var_list} SET TO {NumberFormatter.format_value(value)}")
             
             # Set last_command_result to the assigned value for potential chaining
             last_command_result = (value, var_type)
@@ -5632,6 +8579,8 @@ class Command:
                                 replacement = ""
                             elif result_type in [DataType.FILE, DataType.DIRECTORY]:
                                 replacement = f'"{result_value}"'
+                            elif result_type == DataType.LIST:
+                                replacement = "result"  # Lists are passed on through the last result
                             else:
                                 replacement = str(result_value)
                         else:
@@ -5665,6 +8614,8 @@ class Command:
                                 replacement = f'"{result_value}"'
                             elif result_type in [DataType.FILE, DataType.DIRECTORY]:
                                 replacement = f'"{result_value}"'
+                            elif result_type == DataType.LIST:
+                                replacement = "result"  # Lists are passed on through the last result
                             else:
                                 replacement = str(result_value)
                         else:
@@ -5764,7 +8715,7 @@ class Command:
         # Define commands that should print their result when in parentheses
         do_print_result = [
             "add", "subtract", "multiply", "divide", "exponent", 
-            "calc", "sqrt", "average", "factorial", "date", "time"
+            "calc", "sqrt", "average", "factorial", "range", "date", "time"
         ]
         
         # Track last command executed in parentheses
@@ -5875,6 +8826,8 @@ class Command:
     ["exit"])
 def cmd_exit(args):
     global last_command_result
+    EditorBuffers.clear()
+    VariableManager.save_persistent_variables()
     System.print_instant(Message.SHUTDOWN)
     System.show_loading_bar("shutdown", Fore.RED)
     System.clear_screen()
@@ -5887,16 +8840,17 @@ def cmd_exit(args):
     ["reboot"])
 def cmd_reboot(args):
     global last_command_result
-    # Reset the terminal state buffer on reboot
+    # Reset the terminal state buffer and open editor buffers on reboot
     TerminalState.reset()
+    EditorBuffers.clear()
     System.welcome(current_user)
     last_command_result = ("NULL", DataType.NULL)
     return True
 
 @CommandRegistry.register("help", "SYSTEM",
-    "Shows command list or detailed help for specific commands.",
+    "Shows command list or detailed help for specific commands. Partial names show the closest matches.",
     "help [command_name]",
-    ["help", "help copy", "help calc"])
+    ["help", "help copy", "help calc", "help del"])
 def cmd_help(args):
     global last_command_result
     if args:
@@ -5980,6 +8934,15 @@ def cmd_average(args):
     Command.process_math_command("average", args, should_print=True)
     return True
 
+@CommandRegistry.register("range", "MATH",
+    "Creates a list of numbers from start up to (not including) stop.\n"
+    "   MATH commands and calc work element-wise on lists; average averages every item.",
+    "range <stop>\nrange <start> <stop> [step]",
+    ["range 10", "range 0 1 0.25", "range 0 1000000 -> $series", "average $series", "calc $series * 2"])
+def cmd_range(args):
+    Command.process_math_command("range", args, should_print=True)
+    return True
+
 @CommandRegistry.register("factorial", "MATH",
     "Calculates the factorial of a non-negative integer.",
     "factorial <number>",
@@ -6066,17 +9029,17 @@ def cmd_edit(args):
     else:
         full_path = os.path.join(current_directory, filename)
     
-    display_name = os.path.basename(full_path)
-    file_existed_before = os.path.exists(full_path)
-    
     try:
         AsciiArt.stop_animation()
-        time.sleep(0.1)
         System.clear_screen()
         
-        editor = CursesEditor(full_path)
-        Curses.wrapper(editor.run)
+        # Reuses the open buffer (cursor, scroll, undo) if the file was edited recently
+        editor = EditorBuffers.open(full_path)
+        editor = Curses.wrapper(lambda stdscr: EditorBuffers.run(stdscr, editor))
         
+        # Ctrl+B may have ended the session in a different buffer
+        display_name = os.path.basename(editor.session_path)
+        file_existed_before = editor.file_existed
         new_path = editor.filepath
         final_name = os.path.basename(new_path)
         
@@ -6250,9 +9213,10 @@ def cmd_time(args):
     return True
 
 @CommandRegistry.register("print", "SYSTEM",
-    "Prints text, variables, or command results to the screen.",
+    "Prints text, variables, or command results to the screen.\n"
+    "   Variables inside quoted text are filled in (write \\$ for a literal $).",
     "print <text/variables...>",
-    ["print \"Hello World\"", "print $myvar", "print result", "print \"Value:\" $number"])
+    ["print \"Hello World\"", "print $myvar", "print result", "print \"Value:\" $number", "print \"Total: $total\""])
 def cmd_print(args):
     global last_command_result
     # Reconstruct the full command line after "print"
@@ -6272,9 +9236,9 @@ def cmd_print(args):
                 words = [w.strip() for w in part.split() if w.strip()]
                 parsed_args.extend(words)
             else:
-                # Inside quotes - unescape the string and keep as single argument
+                # Inside quotes - unescape, interpolate variables and keep as single argument
                 unescaped = part.replace('\\n', '\n').replace('\\\\', '\\').replace('\\"', '"')
-                parsed_args.append(unescaped)
+                parsed_args.append(ArgumentResolver.render_template(unescaped))
     else:
         parsed_args = [arg for arg in full_command.split() if arg.strip()]
     
@@ -6303,7 +9267,7 @@ def cmd_print(args):
                         System.throw_error(f"ERROR READING FILE: {str(e).upper()}")
                         return True
                 else:
-                    output_parts.append(str(var.value))
+                    output_parts.append(ArgumentResolver.render_template(arg))
             else:
                 System.throw_error(f"VARIABLE '{arg}' NOT FOUND")
                 return True
@@ -6388,11 +9352,19 @@ def cmd_nav(args):
     
     try:
         AsciiArt.stop_animation()
-        time.sleep(0.1)
         System.clear_screen()
         
         navigator = InteractiveNavigator(base_user_dir, current_directory)
-        result = Curses.wrapper(navigator.run)
+        
+        def navigate(stdscr):
+            """Run the navigator and, if a file was picked, the editor in the same curses session"""
+            result = navigator.run(stdscr)
+            if result is not None and result[0] == 'edit' and result[1]:
+                editor = EditorBuffers.open(result[1])
+                return result, EditorBuffers.run(stdscr, editor)
+            return result, None
+        
+        result, editor = Curses.wrapper(navigate)
         
         if result is None:
             action, path = 'exit', None
@@ -6402,31 +9374,15 @@ def cmd_nav(args):
         TerminalState.restore()
         
         if action == 'edit' and path:
-            display_name = os.path.basename(path)
+            new_path = editor.filepath
+            final_name = os.path.basename(new_path)
             
-            try:
-                AsciiArt.stop_animation()
-                time.sleep(0.1)
-                System.clear_screen()
-                
-                editor = CursesEditor(path)
-                Curses.wrapper(editor.run)
-                
-                new_path = editor.filepath
-                final_name = os.path.basename(new_path)
-                
-                TerminalState.restore()
-                
-                last_command_result = (VariableManager.get_relative_path(new_path), DataType.FILE)
-                
-                if editor.was_saved:
-                    System.show_result(f"FILE '{final_name}' EDIT COMPLETE")
-                else:
-                    System.show_result(f"EDIT CANCELLED")
-                
-            except Exception as e:
-                TerminalState.restore()
-                System.throw_error(f"EDITOR ERROR: {str(e).upper()}")
+            last_command_result = (VariableManager.get_relative_path(new_path), DataType.FILE)
+            
+            if editor.was_saved:
+                System.show_result(f"FILE '{final_name}' EDIT COMPLETE")
+            else:
+                System.show_result(f"EDIT CANCELLED")
         
         elif action == 'exit':
             current_directory = navigator.current_dir
@@ -6448,23 +9404,45 @@ def cmd_nav(args):
 @CommandRegistry.register("browser", "WEB",
     "Opens an interactive terminal-based web browser powered by Google.\n" +
     Text.INDENT + "Search for content, navigate results with arrow keys, and visit pages.\n" +
+    Text.INDENT + "With a file, shows a local HTML, Markdown or text file from your home instead;\n" +
+    Text.INDENT + "Tab selects links on a page and Enter follows them, also between local files.\n" +
     Text.INDENT + "Requires: pip install requests beautifulsoup4 html2text",
-    "browser",
-    ["browser"])
+    "browser [file | file:///path]",
+    ["browser", "browser docs/index.html", "browser file:///notes/README.md", "browser $page"])
 def cmd_browser(args):
     global last_command_result
     
-    if not requests or not BeautifulSoup or not html2text:
+    start_url = None
+    parsed_args = ArgumentParser.parse_args_with_quotes(args) if args else []
+    if parsed_args:
+        target = parsed_args[0]
+        if target.lower().startswith("file://"):
+            start_url = target
+            full_path = WebBrowser.local_path(target)
+        else:
+            full_path = PathResolver.resolve_file_argument(target, last_command_result, current_directory)
+            start_url = WebBrowser.local_url(full_path) if full_path else None
+        if not full_path or not start_url or not os.path.isfile(full_path):
+            System.throw_error(f"FILE '{target}' NOT FOUND OR CANNOT BE ACCESSED")
+            return True
+        if os.path.splitext(full_path)[1].lower() not in WebBrowser.LOCAL_TYPES:
+            System.throw_error("ONLY HTML, MARKDOWN AND TEXT FILES CAN BE OPENED IN THE BROWSER")
+            return True
+    
+    # Local files need no network dependencies; only HTML needs html2text
+    if start_url is None and (not requests or not BeautifulSoup or not html2text):
         System.throw_error("WEB BROWSER DEPENDENCIES NOT INSTALLED\n" +
                           "INSTALL WITH: pip install requests beautifulsoup4 html2text")
         return True
+    if start_url is not None and WebBrowser.LOCAL_TYPES[os.path.splitext(full_path)[1].lower()] == 'html' and not html2text:
+        System.throw_error("HTML FILES NEED HTML2TEXT\nINSTALL WITH: pip install html2text")
+        return True
     
     try:
         AsciiArt.stop_animation()
-        time.sleep(0.1)
         System.clear_screen()
         
-        browser = WebBrowser()
+        browser = WebBrowser(start_url)
         Curses.wrapper(browser.run)
         
         TerminalState.restore()
@@ -6485,8 +9463,9 @@ def cmd_browser(args):
 def main():
     global current_directory, last_command_result, session_variables, persistent_variables, current_user
     init()
+    atexit.register(VariableManager.save_persistent_variables)  # Commit journaled variables on any exit
 
-    SplashScreen.show()
+    SplashScreen.show(show_fps="--fps" in sys.argv[1:])
     
     # User data lives in platform-specific location (e.g., %APPDATA%/Kairo on Windows)
     user_data_dir = get_user_data_path()
@@ -6528,26 +9507,32 @@ def main():
             
             elif action == "create":
                 username, password = data
-                users.append(User(username, password))
-                UserManager.save_users(users, users_file)
-                System.create_user_directory(username)
+                created = UserManager.add_user(users, username, password)
                 
-                # Show success message for 2 seconds
+                # Show the outcome for 2 seconds
                 System.clear_screen()
-                print(f"\n{Fore.GREEN}✓ User '{username}' created successfully!{Style.RESET_ALL}")
+                if created:
+                    System.create_user_directory(username)
+                    print(f"\n{Fore.GREEN}✓ User '{username}' created successfully!{Style.RESET_ALL}")
+                else:
+                    # Another session created the same name after the login screen checked it
+                    print(f"\n{Fore.RED}✗ User '{username}' already exists{Style.RESET_ALL}")
                 time.sleep(2)
                 
-                # Reload users and continue loop (return to menu)
-                users = UserManager.load_users(users_file)
+                # Continue loop (return to menu)
                 continue
             
             elif action == "remove":
                 username = data
-                users = [u for u in users if u.username.lower() != username.lower()]
-                UserManager.save_users(users, users_file)
-                
-                # Show success message for 2 seconds
+                removed = UserManager.remove_user(users, username)
+
                 System.clear_screen()
+                if not removed:
+                    # Another session removed the account after the login screen matched it
+                    print(f"Login error: no such user '{username}'")
+                    sys.exit(1)
+
+                # Show success message for 2 seconds
                 print(f"\n{Fore.GREEN}✓ User '{username}' removed successfully!{Style.RESET_ALL}")
                 time.sleep(2)
                 
@@ -6565,18 +9550,11 @@ def main():
     session_variables = {}
     last_command_result = None
     
-    # Track terminal size for resize detection
-    prev_terminal_size = shutil.get_terminal_size()
-    
+    # Terminal resizes are handled by the AsciiArt scheduler (SIGWINCH)
     while True:
         try:
-            # Check for terminal resize
-            current_terminal_size = shutil.get_terminal_size()
-            if current_terminal_size != prev_terminal_size:
-                prev_terminal_size = current_terminal_size
-                AsciiArt.handle_terminal_resize()
-            
             command = System.colored_input("\n_> ")
+            VariableManager.refresh_persistent_variables()
             if not Command.process_command(command):
                 break
         except KeyboardInterrupt:
@@ -9,6 +9,7 @@ class DataType(Enum):
     DIRECTORY = "directory"
     FILE = "file"
     NULL = "null"
+    LIST = "list"  # Numeric series, stored as array('d')
 
 
 class Variable:
@@ -0,0 +1,118 @@
+"""
+Browser file:// mode: sandboxing, link resolution and the page cache, all offline.
+Run with: python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+
+
+class LocalBrowserTest(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.data_dir.cleanup)
+        for patcher in (mock.patch.object(app, "get_user_data_path", return_value=self.data_dir.name),
+                        mock.patch.object(app, "current_user", "tester")):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.root = os.path.realpath(app.VariableManager.get_user_root("tester"))
+        os.makedirs(os.path.join(self.root, "docs", "guide"))
+        self.outside = os.path.join(self.data_dir.name, "outside")
+        os.makedirs(self.outside)
+        self.write(os.path.join(self.outside, "secret.txt"), "secret")
+        self.browser = app.WebBrowser()
+
+    def write(self, path, text):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def test_dot_dot_stays_inside_home(self):
+        for url in ("file:///../../outside/secret.txt", "file:///docs/../../../outside/secret.txt",
+                    "file:///%2e%2e/%2e%2e/outside/secret.txt"):
+            path = app.WebBrowser.local_path(url)
+            self.assertTrue(path.startswith(self.root + os.sep), url)
+        self.assertIsNone(app.WebBrowser.local_url(os.path.join(self.outside, "secret.txt")))
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "symlinks not supported")
+    def test_symlink_out_of_home_is_refused(self):
+        try:
+            os.symlink(self.outside, os.path.join(self.root, "escape"))
+            os.symlink(os.path.join(self.outside, "secret.txt"), os.path.join(self.root, "secret.txt"))
+        except OSError:
+            self.skipTest("cannot create symlinks")
+
+        for url in ("file:///escape/secret.txt", "file:///secret.txt"):
+            self.assertIsNone(app.WebBrowser.local_path(url))
+            lines = self.browser.fetch_page(url)
+            self.assertEqual(len(lines), 1)
+            self.assertTrue(lines[0].startswith("Error:"))
+            self.assertNotIn("secret", "".join(lines[1:]))
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "symlinks not supported")
+    def test_symlink_inside_home_is_followed(self):
+        self.write(os.path.join(self.root, "docs", "real.md"), "# Real")
+        try:
+            os.symlink(os.path.join(self.root, "docs", "real.md"), os.path.join(self.root, "alias.md"))
+        except OSError:
+            self.skipTest("cannot create symlinks")
+
+        self.assertEqual(self.browser.fetch_page("file:///alias.md"), ["# Real"])
+
+    def test_relative_links_resolve_from_nested_page(self):
+        self.browser.current_url = "file:///docs/guide/index.md"
+        self.assertEqual(self.browser.resolve_link("intro.md"), "file:///docs/guide/intro.md")
+        self.assertEqual(self.browser.resolve_link("../api/calls.md#section"), "file:///docs/api/calls.md")
+        self.assertEqual(self.browser.resolve_link("/top.md"), "file:///top.md")
+        self.assertEqual(self.browser.resolve_link("my%20notes.md"), "file:///docs/guide/my%20notes.md")
+        self.assertEqual(self.browser.resolve_link("../../../../etc/passwd"), "file:///etc/passwd")
+        self.assertIsNone(self.browser.resolve_link("#anchor"))
+        self.assertEqual(self.browser.resolve_link("https://example.com/a#b"), "https://example.com/a")
+        self.assertIsNone(self.browser.resolve_link("mailto:someone@example.com"))
+
+    def test_cache_follows_mtime_and_size(self):
+        path = os.path.join(self.root, "docs", "page.md")
+        self.write(path, "first")
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+        self.assertEqual(self.browser.fetch_page("file:///docs/page.md"), ["first"])
+
+        # Unchanged file: served from the cache without reading it
+        with mock.patch("builtins.open", side_effect=AssertionError("file was read")):
+            self.assertEqual(self.browser.fetch_page("file:///docs/page.md"), ["first"])
+
+        # Same size, new mtime
+        self.write(path, "again")
+        os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+        self.assertEqual(self.browser.fetch_page("file:///docs/page.md"), ["again"])
+
+        # Same mtime, new size
+        self.write(path, "longer text")
+        os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+        self.assertEqual(self.browser.fetch_page("file:///docs/page.md"), ["longer text"])
+
+    @unittest.skipIf(app.html2text is None, "html2text not installed")
+    def test_html_is_converted(self):
+        self.write(os.path.join(self.root, "docs", "index.html"), '<h1>Title</h1><p>See <a href="guide/a.md">a</a></p>')
+        lines = self.browser.fetch_page("file:///docs/index.html")
+        self.assertIn("# Title", lines)
+        self.assertIn("See [a](guide/a.md)", lines)
+
+    def test_missing_file_is_an_error_page(self):
+        lines = self.browser.fetch_page("file:///docs/missing.md")
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(lines[0].startswith("Error loading page:"))
+
+    def test_unsupported_type_is_an_error_page(self):
+        self.write(os.path.join(self.root, "data.bin"), "x")
+        self.assertEqual(self.browser.fetch_page("file:///data.bin"),
+                         ["Error: only HTML, Markdown and text files can be opened"])
+
+
+if __name__ == "__main__":
+    unittest.main()
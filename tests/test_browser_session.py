@@ -0,0 +1,80 @@
+"""
+Browser connection reuse against a local stand-in HTTP server.
+Run with: python -m unittest discover tests
+"""
+import gzip
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so a reused connection shows up as one client port
+
+    def do_GET(self):
+        self.server.client_ports.append(self.client_address[1])
+        body = f"<html><body><h1>Page {self.path}</h1></body></html>".encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Cache-Control", "no-store")
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@unittest.skipIf(app.requests is None or app.html2text is None, "browser dependencies not installed")
+class SessionReuseTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+        self.server.client_ports = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+        # Page cache files go to a scratch directory instead of the real user data
+        self.data_dir = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(app, "get_user_data_path", return_value=self.data_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        app.WebBrowser._session = None
+
+    def tearDown(self):
+        if app.WebBrowser._session is not None:
+            app.WebBrowser._session.close()
+            app.WebBrowser._session = None
+        self.server.shutdown()
+        self.server.server_close()
+        self.data_dir.cleanup()
+
+    def test_page_loads_share_one_connection(self):
+        browser = app.WebBrowser()
+        for i in range(5):
+            lines = browser.fetch_page(f"{self.base_url}/page/{i}")
+            self.assertIn(f"# Page /page/{i}", lines)
+
+        self.assertEqual(len(self.server.client_ports), 5)
+        self.assertEqual(len(set(self.server.client_ports)), 1)
+
+    def test_browsers_share_the_session(self):
+        app.WebBrowser().fetch_page(f"{self.base_url}/first")
+        app.WebBrowser().fetch_page(f"{self.base_url}/second")
+
+        self.assertIs(app.WebBrowser.session(), app.WebBrowser.session())
+        self.assertEqual(len(set(self.server.client_ports)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Editor buffer cache and the swap journal of buffers it releases.
+Run with: python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+
+
+class DroppedBufferSwapTest(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.data_dir.cleanup)
+        patcher = mock.patch.object(app, "get_user_data_path", return_value=self.data_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(app.EditorBuffers.clear)
+
+        self.path = os.path.join(self.data_dir.name, "notes.txt")
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("one\ntwo\nthree")
+
+    def session(self, *edits):
+        """Stand-in for CursesEditor.run: edits, checkpointed except the last, then quit without saving"""
+        def run(stdscr):
+            for y, text in edits[:-1]:
+                editor.lines[y] = text
+                editor.modified = True
+                editor._checkpoint_swap(force=True)
+            self.journaled = os.path.exists(editor._swap.path)
+            y, text = edits[-1]
+            editor.lines[y] = text  # Typed within SWAP_INTERVAL of quitting
+            editor._close_session(keep_swap=editor.switch_to is not None)
+        editor = app.EditorBuffers.open(self.path)
+        editor.run = run
+        return editor
+
+    def test_close_without_saving_leaves_no_swap_file(self):
+        editor = self.session((0, "edited"), (1, "again"))
+        swap_path = editor._swap.path
+
+        app.EditorBuffers.run(None, editor)
+
+        self.assertTrue(self.journaled)
+        self.assertNotIn(os.path.abspath(self.path), app.EditorBuffers.buffers)
+        self.assertFalse(os.path.exists(swap_path))
+        self.assertIsNone(app.CursesEditor(self.path)._pending_recovery)
+
+    def test_discarded_journal_is_not_checkpointed_again(self):
+        editor = self.session((0, "first"), (1, "second"), (2, "third"))
+        app.EditorBuffers.run(None, editor)
+
+        editor._checkpoint_swap(force=True)
+        self.assertFalse(os.path.exists(editor._swap.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
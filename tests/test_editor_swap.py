@@ -0,0 +1,106 @@
+"""
+Editor crash-recovery journal: checkpoint, crash, recovery offer and replay.
+Run with: python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+
+
+class EditorSwapFileTest(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.data_dir.cleanup)
+        patcher = mock.patch.object(app, "get_user_data_path", return_value=self.data_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.path = os.path.join(self.data_dir.name, "notes.txt")
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("alpha\nbeta\ngamma\ndelta")
+        self.original = ["alpha", "beta", "gamma", "delta"]
+
+    def edit(self, editor, y, text):
+        editor.lines[y] = text
+        editor.modified = True
+
+    def crashed_session(self):
+        """Edits with several checkpoints, then a crash: the journal is closed but never discarded"""
+        editor = app.CursesEditor(self.path)
+        self.edit(editor, 1, "BETA")
+        editor._checkpoint_swap(force=True)
+        editor.lines.insert(2, "inserted")
+        del editor.lines[4]
+        editor._checkpoint_swap(force=True)
+        checkpointed = list(editor.lines)
+        self.edit(editor, 0, "typed after the last checkpoint")
+        editor._swap.close()
+        return editor, checkpointed
+
+    def test_crash_is_recovered_to_last_checkpoint(self):
+        editor, checkpointed = self.crashed_session()
+        self.assertTrue(os.path.exists(editor._swap.path))
+
+        reopened = app.CursesEditor(self.path)
+        self.assertEqual(reopened.lines, self.original)
+        self.assertEqual(reopened._pending_recovery, checkpointed)
+
+    def test_torn_final_record_is_ignored(self):
+        editor, checkpointed = self.crashed_session()
+        with open(editor._swap.path, 'a', encoding='utf-8') as f:
+            f.write('{"start": 0, "end": 1, "lin')
+
+        self.assertEqual(app.CursesEditor(self.path)._pending_recovery, checkpointed)
+
+    def test_journal_for_a_changed_file_is_not_offered(self):
+        self.crashed_session()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write("\nchanged elsewhere")
+
+        self.assertIsNone(app.CursesEditor(self.path)._pending_recovery)
+
+    def test_recovered_edits_keep_journaling(self):
+        _, checkpointed = self.crashed_session()
+        editor = app.CursesEditor(self.path)
+        editor.lines = editor._pending_recovery  # Accepting the offer, as _offer_recovery does
+        editor.modified = True
+        editor._checkpoint_swap(force=True)
+        self.edit(editor, 3, "after recovery")
+        editor._checkpoint_swap(force=True)
+        editor._swap.close()
+
+        self.assertEqual(app.CursesEditor(self.path)._pending_recovery,
+                         checkpointed[:3] + ["after recovery"] + checkpointed[4:])
+
+    def test_clean_save_leaves_no_journal(self):
+        editor = app.CursesEditor(self.path)
+        self.edit(editor, 0, "saved")
+        editor._checkpoint_swap(force=True)
+        self.assertTrue(os.path.exists(editor._swap.path))
+
+        self.assertTrue(editor._save_file(wait=True))
+        editor.close()
+
+        self.assertFalse(os.path.exists(editor._swap.path))
+        reopened = app.CursesEditor(self.path)
+        self.assertEqual(reopened.lines[0], "saved")
+        self.assertIsNone(reopened._pending_recovery)
+
+    def test_discard_leaves_no_journal(self):
+        editor = app.CursesEditor(self.path)
+        self.edit(editor, 0, "thrown away")
+        editor._checkpoint_swap(force=True)
+        editor.close(keep_swap=False)
+
+        self.assertFalse(os.path.exists(editor._swap.path))
+        self.assertIsNone(app.CursesEditor(self.path)._pending_recovery)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""
+LIST helpers behind the range and MATH commands.
+Run with: python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+
+
+class NumberRangeTest(unittest.TestCase):
+    def assertRange(self, bounds, expected):
+        values = app.Command.number_range(bounds)
+        self.assertEqual(len(values), len(expected), list(values))
+        for value, want in zip(values, expected):
+            self.assertAlmostEqual(value, want)
+
+    def test_integer_ranges(self):
+        self.assertRange([5], [0, 1, 2, 3, 4])
+        self.assertRange([2, 6], [2, 3, 4, 5])
+        self.assertRange([0, 10, 3], [0, 3, 6, 9])
+        self.assertRange([3, 3], [])
+        self.assertRange([5, 1], [])
+
+    def test_fractional_step_excludes_stop(self):
+        self.assertRange([0, 2.1, 0.3], [0, 0.3, 0.6, 0.9, 1.2, 1.5, 1.8])
+        self.assertRange([0, 2.1, 0.7], [0, 0.7, 1.4])
+        self.assertRange([0, 0.07, 0.01], [0, 0.01, 0.02, 0.03, 0.04, 0.05, 0.06])
+        self.assertRange([0, 1, 0.1], [i / 10 for i in range(10)])
+
+    def test_fractional_step_keeps_last_item_below_stop(self):
+        self.assertRange([0, 1, 0.3], [0, 0.3, 0.6, 0.9])
+        self.assertRange([0, 2.2, 0.3], [0, 0.3, 0.6, 0.9, 1.2, 1.5, 1.8, 2.1])
+
+    def test_negative_step(self):
+        self.assertRange([5, 0, -1], [5, 4, 3, 2, 1])
+        self.assertRange([2.1, 0, -0.3], [2.1, 1.8, 1.5, 1.2, 0.9, 0.6, 0.3])
+        self.assertRange([0, -0.07, -0.01], [0, -0.01, -0.02, -0.03, -0.04, -0.05, -0.06])
+        self.assertRange([0, 5, -1], [])
+
+    def test_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            app.Command.number_range([0, 1, 0])
+        with self.assertRaises(ValueError):
+            app.Command.number_range([])
+        with self.assertRaises(ValueError):
+            app.Command.number_range([0, app.Command.MAX_LIST_LENGTH + 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
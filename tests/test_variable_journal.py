@@ -0,0 +1,51 @@
+"""
+Persistent variable loading when the variables file can't be used.
+Run with: python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+from kairo.models.variable import DataType
+
+
+class VariableLoadFailureTest(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.data_dir.cleanup)
+        self.warnings = []
+        for patcher in (mock.patch.object(app, "get_user_data_path", return_value=self.data_dir.name),
+                        mock.patch.object(app.System, "print_instant",
+                                          side_effect=lambda text, **kwargs: self.warnings.append(text))):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(app.VariableManager.save_persistent_variables)
+
+    def test_unreadable_file_falls_back_to_memory_with_a_warning(self):
+        os.makedirs(app.VariableManager.get_variables_file("tester"))  # A directory where the file should be
+
+        app.VariableManager.load_persistent_variables("tester")
+        app.VariableManager.set_variable("$count", 1.0, DataType.NUMBER)
+
+        self.assertIsNone(app.VariableManager._journal)
+        self.assertEqual(app.VariableManager.get_variable("$count").value, 1.0)
+        self.assertEqual(len(self.warnings), 1)
+        self.assertIn("will not be saved", self.warnings[0])
+
+    def test_previous_users_variables_are_not_carried_over(self):
+        app.VariableManager.load_persistent_variables("alice")
+        app.VariableManager.set_variable("$secret", 1.0, DataType.NUMBER)
+        os.makedirs(app.VariableManager.get_variables_file("bob"))
+
+        app.VariableManager.load_persistent_variables("bob")
+
+        self.assertIsNone(app.VariableManager.get_variable("$secret"))
+
+
+if __name__ == "__main__":
+    unittest.main()